@@ -1,27 +1,121 @@
+from functools import lru_cache
+
 from fastapi import Depends
 
+from backtester.app.config import Settings, get_settings
+
 from backtester.application.backtester import Backtester
+from backtester.application.indicator_cache import IndicatorCache
 from backtester.application.indicator_service import IndicatorService
 from backtester.application.indicator_validator_service import IndicatorValidatorService
+from backtester.application.parameter_sweeper import ParameterSweeper
+from backtester.application.signal_cache import SignalCache
 from backtester.application.signal_service import SignalService
+from backtester.application.single_flight import SingleFlight
 from backtester.application.strategy_service import StrategyService
+from backtester.application.sweep_executor import SweepExecutor
+from backtester.application.ticker_data_cache import TickerDataCache
+from backtester.application.ticker_history_cache import TickerHistoryCache
 from backtester.application.ticker_service import TickerService
 from backtester.application.trade_service import TradeService
+from backtester.application.vectorized_trade_engine import VectorizedTradeEngine
 from backtester.domain.indicators.indicator import Indicator
 from backtester.domain.signals.indicator_registry import IndicatorRegistry
+from backtester.domain.enums.ticker_provider_type import TickerProviderType
+from backtester.infrastructure.bar_store import BarStore
+from backtester.infrastructure.base_ticker_provider import BaseTickerProvider
+from backtester.infrastructure.bulk_ticker_fetcher import BulkTickerFetcher
+from backtester.infrastructure.cached_ticker_provider import CachedTickerProvider
+from backtester.infrastructure.directory_ticker_provider import DirectoryTickerProvider
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+from backtester.infrastructure.ticker_cache import TickerCache
 from backtester.infrastructure.ticker_provider import TickerProvider
 
 
+@lru_cache()
 def init_ticker_provider(
-):
-    return TickerProvider()
+) -> BaseTickerProvider:
+    """
+    Initializes the ticker provider once per process, as configured,
+     behind the on-disk cache when a cache directory is configured,
+     memory-mapped unless the cache is compressed.
+    """
+    settings = get_settings()
+    if settings.ticker_provider == TickerProviderType.SYNTHETIC:
+        ticker_provider = SyntheticTickerProvider()
+    elif settings.ticker_provider == TickerProviderType.DIRECTORY:
+        ticker_provider = DirectoryTickerProvider(directory=settings.ticker_directory)
+    else:
+        ticker_provider = TickerProvider()
+    if settings.ticker_cache_directory is None:
+        return ticker_provider
+    if settings.ticker_cache_compression:
+        ticker_cache = TickerCache(directory=settings.ticker_cache_directory)
+    else:
+        ticker_cache = BarStore(directory=settings.ticker_cache_directory)
+    return CachedTickerProvider(
+        ticker_provider=ticker_provider,
+        ticker_cache=ticker_cache,
+        revision_bars=settings.ticker_revision_bars
+    )
+
+
+@lru_cache()
+def init_bulk_ticker_fetcher() -> BulkTickerFetcher:
+    """
+    Initializes the BulkTickerFetcher once per process, so its threads are reused across requests.
+    """
+    settings = get_settings()
+    return BulkTickerFetcher(
+        ticker_provider=init_ticker_provider(),
+        max_workers=settings.ticker_fetch_workers,
+        batch_size=settings.ticker_fetch_batch_size
+    )
+
+
+@lru_cache()
+def init_ticker_history_cache() -> TickerHistoryCache:
+    """
+    Initializes the TickerHistoryCache once per process, so processed series are shared across requests.
+    """
+    return TickerHistoryCache(
+        max_bytes=get_settings().ticker_history_max_bytes
+    )
+
+
+@lru_cache()
+def init_ticker_data_cache() -> TickerDataCache:
+    """
+    Initializes the TickerDataCache once per process, so repeated requests share their processed ticker data.
+    """
+    return TickerDataCache(
+        max_bytes=get_settings().ticker_data_cache_max_bytes
+    )
+
+
+@lru_cache()
+def init_ticker_single_flight() -> SingleFlight:
+    """
+    Initializes the SingleFlight of ticker fetches once per process, so concurrent requests share their fetches.
+    """
+    return SingleFlight()
 
 
 def init_ticker_service(
-        ticker_provider: TickerProvider = Depends(init_ticker_provider)
+        ticker_provider: BaseTickerProvider = Depends(init_ticker_provider),
+        ticker_history_cache: TickerHistoryCache = Depends(init_ticker_history_cache),
+        single_flight: SingleFlight = Depends(init_ticker_single_flight),
+        ticker_data_cache: TickerDataCache = Depends(init_ticker_data_cache),
+        bulk_ticker_fetcher: BulkTickerFetcher = Depends(init_bulk_ticker_fetcher),
+        settings: Settings = Depends(get_settings)
 ):
     return TickerService(
-        ticker_provider=ticker_provider
+        ticker_provider=ticker_provider,
+        ticker_history_cache=ticker_history_cache,
+        revision_bars=settings.ticker_revision_bars,
+        single_flight=single_flight,
+        ticker_data_cache=ticker_data_cache,
+        bulk_ticker_fetcher=bulk_ticker_fetcher
     )
 
 
@@ -33,13 +127,28 @@ def init_trade_service() -> TradeService:
     return TradeService()
 
 
+def init_vectorized_trade_engine() -> VectorizedTradeEngine:
+    return VectorizedTradeEngine()
+
+
 def init_indicator_validator_service(
 ) -> IndicatorValidatorService:
     return IndicatorValidatorService()
 
 
+@lru_cache()
+def init_indicator_cache() -> IndicatorCache:
+    """
+    Initializes the IndicatorCache once per process, so masks are shared across requests.
+    """
+    return IndicatorCache(
+        max_bytes=get_settings().indicator_cache_max_bytes
+    )
+
+
 def init_indicator_service(
-        indicator_validator_service: IndicatorValidatorService = Depends(init_indicator_validator_service)
+        indicator_validator_service: IndicatorValidatorService = Depends(init_indicator_validator_service),
+        indicator_cache: IndicatorCache = Depends(init_indicator_cache)
 ) -> IndicatorService:
     """
     Initialize the IndicatorService with the given registry.
@@ -47,7 +156,8 @@ def init_indicator_service(
     """
     return IndicatorService(
         indicator_validator_service=indicator_validator_service,
-        registry=Indicator.registry
+        registry=Indicator.registry,
+        indicator_cache=indicator_cache
     )
 
 
@@ -58,13 +168,25 @@ def init_indicator_registry() -> IndicatorRegistry:
     return IndicatorRegistry()
 
 
+@lru_cache()
+def init_signal_cache() -> SignalCache:
+    """
+    Initializes the SignalCache once per process, so rule signals are shared across requests.
+    """
+    return SignalCache(
+        max_bytes=get_settings().signal_cache_max_bytes
+    )
+
+
 def init_signal_service(
         indicator_registry: IndicatorRegistry = Depends(init_indicator_registry),
-        indicator_service: IndicatorService = Depends(init_indicator_service)
+        indicator_service: IndicatorService = Depends(init_indicator_service),
+        signal_cache: SignalCache = Depends(init_signal_cache)
 ) -> SignalService:
     return SignalService(
         indicator_registry=indicator_registry,
-        indicator_service=indicator_service
+        indicator_service=indicator_service,
+        signal_cache=signal_cache
     )
 
 
@@ -72,11 +194,37 @@ def init_backtester(
         ticker_service: TickerService = Depends(init_ticker_service),
         signal_service: SignalService = Depends(init_signal_service),
         strategy_service: StrategyService = Depends(init_strategy_service),
-        trade_service: TradeService = Depends(init_trade_service)
+        trade_service: TradeService = Depends(init_trade_service),
+        vectorized_trade_engine: VectorizedTradeEngine = Depends(init_vectorized_trade_engine)
 ) -> Backtester:
     return Backtester(
         ticker_service=ticker_service,
         signal_service=signal_service,
         strategy_service=strategy_service,
-        trade_service=trade_service
+        trade_service=trade_service,
+        vectorized_trade_engine=vectorized_trade_engine
+    )
+
+
+@lru_cache()
+def init_sweep_executor() -> SweepExecutor:
+    """
+    Initializes the SweepExecutor once per process, so its pool stays warm across requests.
+    """
+    settings = get_settings()
+    return SweepExecutor(
+        workers=settings.sweep_workers,
+        start_method=settings.sweep_start_method
+    )
+
+
+def init_parameter_sweeper(
+        ticker_service: TickerService = Depends(init_ticker_service),
+        sweep_executor: SweepExecutor = Depends(init_sweep_executor),
+        settings: Settings = Depends(get_settings)
+) -> ParameterSweeper:
+    return ParameterSweeper(
+        ticker_service=ticker_service,
+        sweep_executor=sweep_executor,
+        settings=settings
     )
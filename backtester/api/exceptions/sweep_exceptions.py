@@ -0,0 +1,64 @@
+"""
+Exceptions related to invalid parameter sweep requests.
+"""
+from fastapi import HTTPException, status
+
+
+class InvalidSweepRequest(HTTPException):
+    """
+    Base class for parameter sweep validation errors.
+    """
+
+    def __init__(self, error: str, message: str):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "error": error,
+                "message": message
+            }
+        )
+
+
+class SweepRuleNotFoundError(InvalidSweepRequest):
+    """
+    Raised when a parameter range targets a rule missing from the trading system.
+    """
+
+    def __init__(self, rule_id: str):
+        super().__init__(
+            error=f"Rule {rule_id} is not part of the trading system.",
+            message=(
+                f"Rule {rule_id} is not part of the trading system. "
+                "Please sweep over the parameters of an existing rule."
+            )
+        )
+
+
+class SweepTooLargeError(InvalidSweepRequest):
+    """
+    Raised when a parameter grid expands to more combinations than allowed.
+    """
+
+    def __init__(self, combinations: int, max_combinations: int):
+        super().__init__(
+            error=f"Parameter grid expands to {combinations} combinations, above the maximum of {max_combinations}.",
+            message=(
+                f"Parameter grid expands to {combinations} combinations, above the maximum of {max_combinations}. "
+                "Please narrow the parameter ranges requested."
+            )
+        )
+
+
+class SweepCombinationError(HTTPException):
+    """
+    Raised when a combination of a parameter sweep fails with an unexpected error.
+    """
+
+    def __init__(self, combination: int):
+        super().__init__(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": f"Encountered unexpected error while backtesting combination {combination}",
+                "message": 'Encountered unexpected error... Please contact us for more information!'
+            }
+        )
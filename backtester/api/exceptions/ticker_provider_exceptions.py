@@ -14,3 +14,18 @@ class TickerDataNotFound(HTTPException):
                 "message": "Encountered unexpected error... Please contact us for more information!"
             }
         )
+
+
+class TickerProviderError(HTTPException):
+    """
+    Exception for when the provider fails to return data for the ticker
+    """
+
+    def __init__(self, ticker: str, reason: str):
+        super().__init__(
+            status_code=502,
+            detail={
+                "error": f"Provider failed to return data for {ticker}: {reason}",
+                "message": "The provider of the price data is unavailable. Please try again later."
+            }
+        )
@@ -3,6 +3,8 @@ Trading System Request Model
 """
 from pydantic import BaseModel, Field
 
+from backtester.domain.enums.backtest_engine import BacktestEngine
+from backtester.domain.enums.trade_detail import TradeDetail
 from .portfolio_management import PortfolioManagement
 from .ticker_request import TickerRequest
 from .trading_system import TradingSystemRules
@@ -15,3 +17,13 @@ class BacktestingRequest(BaseModel):
     ticker_request: TickerRequest
     portfolio_management: PortfolioManagement
     trading_system_rules: TradingSystemRules
+    engine: BacktestEngine = Field(
+        BacktestEngine.ITERATIVE,
+        description="Engine used to simulate the trades of the trading system",
+        examples=["ITERATIVE", "VECTORIZED"]
+    )
+    trade_detail: TradeDetail = Field(
+        TradeDetail.TRADES,
+        description="Level of trade detail kept during the backtest and returned in its results",
+        examples=["SUMMARY", "TRADES", "BARS"]
+    )
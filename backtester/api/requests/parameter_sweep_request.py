@@ -0,0 +1,139 @@
+"""
+Parameter Sweep Request Model
+"""
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, root_validator
+
+from backtester.api.exceptions.sweep_exceptions import SweepRuleNotFoundError
+from backtester.app.config import get_settings
+from .backtesting_request import BacktestingRequest
+from .trading_system import RuleProperties
+
+
+class ParameterRange(BaseModel):
+    """
+    Request model for the values swept over by a parameter of a rule property.
+    Values are either listed, or spaced by a step from start to stop, inclusive.
+    """
+    rule_id: str = Field(
+        ...,
+        description="ID of the rule holding the swept parameter"
+    )
+    rule_property: str = Field(
+        ...,
+        description="Property of the rule holding the swept parameter",
+        regex="^(first_property|second_property)$",
+        examples=["first_property", "second_property"]
+    )
+    parameter: str = Field(
+        ...,
+        description="Swept parameter of the property",
+        regex="^(timeperiod|value)$",
+        examples=["timeperiod", "value"]
+    )
+    values: Optional[List[int]] = Field(
+        None,
+        description="Values of the parameter",
+        examples=[[20, 30, 40]]
+    )
+    start: Optional[int] = Field(
+        None,
+        description="First value of the parameter"
+    )
+    stop: Optional[int] = Field(
+        None,
+        description="Last value of the parameter, inclusive"
+    )
+    step: int = Field(
+        1,
+        description="Step between two values of the parameter",
+        ge=1
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_values(cls, values):  # pylint: disable=no-self-argument
+        """
+        Validate that the values are either listed or given as a range,
+         counting the values of a range before expanding them.
+        """
+        if values.get('values'):
+            return values
+        if values.get('start') is None or values.get('stop') is None or values['start'] > values['stop']:
+            raise ValueError('Either values, or a start lower than or equal to stop, must be provided')
+        parameter_values = range(values['start'], values['stop'] + 1, values['step'])
+        max_combinations = get_settings().sweep_max_combinations
+        if len(parameter_values) > max_combinations:
+            raise ValueError(
+                f'Range expands to {len(parameter_values)} values, above the maximum of {max_combinations}'
+            )
+        values['values'] = list(parameter_values)
+        return values
+
+    @property
+    def label(self) -> str:
+        """
+        Gets the label of the swept parameter in the sweep results.
+        """
+        return f"{self.rule_id}.{self.rule_property}.{self.parameter}"
+
+
+class ParameterSweepRequest(BaseModel):
+    """
+    Request model for sweeping the parameters of a trading system.
+    Every combination of the grid is backtested as a variant of the template request.
+    """
+    backtesting_request: BacktestingRequest
+    parameter_grid: List[ParameterRange] = Field(
+        ...,
+        description="Parameters swept over, the grid being their cartesian product",
+        min_items=1
+    )
+
+    @property
+    def combinations(self) -> int:
+        """
+        Gets the number of combinations of the grid.
+        """
+        combinations = 1
+        for parameter_range in self.parameter_grid:
+            combinations *= len(parameter_range.values)
+        return combinations
+
+    def expand(self) -> Iterator[Tuple[Dict[str, int], BacktestingRequest]]:
+        """
+        Expands the grid to the backtesting request of every combination,
+         the last parameter of the grid varying fastest.
+        :return: iterator over the parameters and backtesting request of each combination.
+        """
+        rules = self._get_rules(self.backtesting_request)
+        for parameter_range in self.parameter_grid:
+            if parameter_range.rule_id not in rules:
+                raise SweepRuleNotFoundError(rule_id=parameter_range.rule_id)
+
+        for values in product(*(parameter_range.values for parameter_range in self.parameter_grid)):
+            backtesting_request = self.backtesting_request.copy(deep=True)
+            rules = self._get_rules(backtesting_request)
+            for parameter_range, value in zip(self.parameter_grid, values):
+                rule_property = getattr(rules[parameter_range.rule_id], parameter_range.rule_property)
+                setattr(rule_property.parameters, parameter_range.parameter, value)
+            parameters = {
+                parameter_range.label: value
+                for parameter_range, value in zip(self.parameter_grid, values)
+            }
+            yield parameters, backtesting_request
+
+    @staticmethod
+    def _get_rules(backtesting_request: BacktestingRequest) -> Dict[str, RuleProperties]:
+        """
+        Gets the rules of the trading system of a backtesting request by their ID.
+        :param backtesting_request: the backtesting request.
+        :return: the rules of the trading system.
+        """
+        return {
+            rule.rule_id: rule
+            for order_type_rules in backtesting_request.trading_system_rules.__root__.values()
+            for group_rules in order_type_rules.group_rules.values()
+            for rule in group_rules.rules.values()
+        }
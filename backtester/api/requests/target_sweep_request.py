@@ -0,0 +1,70 @@
+"""
+Target Sweep Request Model
+"""
+from itertools import product
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .portfolio_management import PortfolioManagement, TradeSize, TradeTargets
+from .ticker_request import TickerRequest
+from .trading_system import TradingSystemRules
+
+
+class TargetGrid(BaseModel):
+    """
+    Request model for the grid of trade targets and trade sizes swept over.
+    """
+    take_profit: List[float] = Field(
+        ...,
+        description="Take profit percentages to sweep over",
+        examples=[[0.05, 0.10, 0.15]],
+        min_items=1
+    )
+    stop_loss: List[float] = Field(
+        ...,
+        description="Stop loss percentages to sweep over",
+        examples=[[-0.02, -0.05]],
+        min_items=1
+    )
+    trade_size: Optional[List[TradeSize]] = Field(
+        None,
+        description="Trade sizes to sweep over, defaults to the trade size of the portfolio management",
+        min_items=1
+    )
+
+
+class TargetSweepRequest(BaseModel):
+    """
+    Request model for sweeping the trade targets of a trading system.
+    The signals of the trading system are computed once and shared by every combination of the grid.
+    """
+    ticker_request: TickerRequest
+    portfolio_management: PortfolioManagement
+    trading_system_rules: TradingSystemRules
+    target_grid: TargetGrid
+
+    @property
+    def trade_sizes(self) -> List[TradeSize]:
+        """
+        Gets the trade sizes swept over.
+        """
+        return self.target_grid.trade_size or [self.portfolio_management.trade_size]
+
+    def expand_portfolio_management(self) -> List[PortfolioManagement]:
+        """
+        Expands the grid to the portfolio management of every combination,
+         ordered by trade size, then take profit, then stop loss.
+        """
+        return [
+            PortfolioManagement(
+                starting_amount=self.portfolio_management.starting_amount,
+                trade_size=trade_size,
+                trade_targets=TradeTargets(take_profit=take_profit, stop_loss=stop_loss)
+            )
+            for trade_size, take_profit, stop_loss in product(
+                self.trade_sizes,
+                self.target_grid.take_profit,
+                self.target_grid.stop_loss
+            )
+        ]
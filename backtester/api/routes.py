@@ -1,16 +1,22 @@
+import json
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
-from backtester.api.dependencies import init_backtester
+from backtester.api.dependencies import init_backtester, init_indicator_cache, init_parameter_sweeper, \
+    init_signal_cache, init_ticker_data_cache, init_ticker_history_cache, init_ticker_single_flight
 from backtester.api.requests.backtesting_request import BacktestingRequest
+from backtester.api.requests.parameter_sweep_request import ParameterSweepRequest
+from backtester.api.requests.target_sweep_request import TargetSweepRequest
 from backtester.api.responses.error_responses import error_responses
 from backtester.api.responses.metadata import Metadata
 from backtester.api.responses.success_response import SuccessResponse, SuccessResponseModel
-from backtester.domain.strategy.presenters import StrategyGroupedStats
+from backtester.domain.strategy.presenters import StrategyGroupedStats, TargetSweepStats
 from fastapi import status
 
 trading_system_router = APIRouter()
+metrics_router = APIRouter()
 
 
 @trading_system_router.post(
@@ -35,3 +41,79 @@ def create_trading_system(
         response_data=results,
         metadata=Metadata.from_start_time(start_time)
     )
+
+
+@trading_system_router.post(
+    "/sweep-targets",
+    response_model=SuccessResponseModel[TargetSweepStats],
+    status_code=status.HTTP_200_OK,
+    summary="Sweep Trade Targets of Trading System",
+    responses=error_responses
+)
+def sweep_trading_system_targets(
+        target_sweep_request: TargetSweepRequest,
+        backtester=Depends(init_backtester),
+):
+    """
+    Evaluate the performance of a trading system for every combination of a grid of trade targets.
+    """
+    start_time = datetime.now(timezone.utc)
+    results = backtester.sweep_targets(
+        target_sweep_request=target_sweep_request
+    )
+    return SuccessResponse(
+        response_data=results,
+        metadata=Metadata.from_start_time(start_time)
+    )
+
+
+@trading_system_router.post(
+    "/sweep",
+    status_code=status.HTTP_200_OK,
+    summary="Sweep Parameters of Trading System",
+    responses=error_responses,
+    response_class=StreamingResponse
+)
+def sweep_trading_system_parameters(
+        parameter_sweep_request: ParameterSweepRequest,
+        parameter_sweeper=Depends(init_parameter_sweeper),
+):
+    """
+    Evaluate the performance of a trading system for every combination of a parameter grid.
+    Results are streamed as newline-delimited JSON, one line per combination, as combinations finish.
+    """
+    results = parameter_sweeper.sweep(
+        parameter_sweep_request=parameter_sweep_request
+    )
+    return StreamingResponse(
+        (json.dumps(result, default=str) + "\n" for result in results),
+        media_type="application/x-ndjson"
+    )
+
+
+@metrics_router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Get Service Metrics"
+)
+def get_metrics(
+        indicator_cache=Depends(init_indicator_cache),
+        signal_cache=Depends(init_signal_cache),
+        ticker_history_cache=Depends(init_ticker_history_cache),
+        ticker_data_cache=Depends(init_ticker_data_cache),
+        ticker_single_flight=Depends(init_ticker_single_flight),
+):
+    """
+    Get the counters of the caches of the service.
+    """
+    start_time = datetime.now(timezone.utc)
+    return SuccessResponse(
+        response_data={
+            "indicator_cache": indicator_cache.stats,
+            "signal_cache": signal_cache.stats,
+            "ticker_history_cache": ticker_history_cache.stats,
+            "ticker_data_cache": ticker_data_cache.stats,
+            "ticker_fetches": ticker_single_flight.stats
+        },
+        metadata=Metadata.from_start_time(start_time)
+    )
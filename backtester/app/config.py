@@ -0,0 +1,113 @@
+"""
+Configuration of the application, read from environment variables.
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseSettings, Field, root_validator
+
+from backtester.domain.enums.ticker_provider_type import TickerProviderType
+
+
+class Settings(BaseSettings):
+    """
+    Settings of the application.
+    Each setting can be overridden by an environment variable prefixed with BACKTESTER_.
+    """
+    ticker_provider: TickerProviderType = Field(
+        TickerProviderType.YFINANCE,
+        description="Provider the price data of tickers is fetched from"
+    )
+    ticker_directory: Optional[str] = Field(
+        None,
+        description="Directory of the CSV or Parquet price data files read by the directory ticker provider"
+    )
+    ticker_fetch_workers: int = Field(
+        8,
+        description="Maximum number of concurrent calls to the ticker provider when fetching many tickers",
+        ge=1
+    )
+    ticker_fetch_batch_size: int = Field(
+        20,
+        description="Maximum number of tickers fetched by a single call to a ticker provider fetching several at once",
+        ge=1
+    )
+    ticker_cache_directory: Optional[str] = Field(
+        None,
+        description="Directory of the on-disk cache of the price data of tickers, None disabling the cache"
+    )
+    ticker_cache_compression: bool = Field(
+        False,
+        description="Whether the on-disk cache compresses the price data of tickers, "
+                    "reading whole series instead of memory-mapping them"
+    )
+    ticker_history_max_bytes: int = Field(
+        256 * 1024 * 1024,
+        description="Maximum number of bytes of processed ticker series kept across requests, "
+                    "refreshed with new bars only, 0 disabling them",
+        ge=0
+    )
+    ticker_revision_bars: int = Field(
+        5,
+        description="Number of most recent bars of a ticker series fetched again when it is refreshed, "
+                    "replacing them and the bars after them if the provider revised them",
+        ge=0
+    )
+    ticker_data_cache_max_bytes: int = Field(
+        256 * 1024 * 1024,
+        description="Maximum number of bytes of processed ticker data shared by repeated requests "
+                    "for the same ticker, interval and range, 0 disabling the cache",
+        ge=0
+    )
+    indicator_cache_max_bytes: int = Field(
+        256 * 1024 * 1024,
+        description="Maximum number of bytes of indicator masks cached across requests, 0 disabling the cache",
+        ge=0
+    )
+    signal_cache_max_bytes: int = Field(
+        64 * 1024 * 1024,
+        description="Maximum number of bytes of rule signals cached across requests, 0 disabling the cache",
+        ge=0
+    )
+    sweep_workers: int = Field(
+        os.cpu_count() or 1,
+        description="Number of worker processes of the parameter sweep pool, "
+                    "each worker caching indicators and signals within its share of the cache budgets",
+        ge=1
+    )
+    sweep_chunk_size: int = Field(
+        8,
+        description="Number of combinations sent to a sweep worker at once",
+        ge=1
+    )
+    sweep_max_combinations: int = Field(
+        10000,
+        description="Maximum number of combinations a parameter sweep can expand to",
+        ge=1
+    )
+    sweep_start_method: str = Field(
+        "spawn",
+        description="Start method of the sweep worker processes"
+    )
+
+    class Config:
+        env_prefix = "BACKTESTER_"
+
+    @root_validator(skip_on_failure=True)
+    def validate_ticker_directory(cls, values):
+        """
+        Ensures the directory ticker provider has a directory to read from.
+        """
+        if values.get("ticker_provider") == TickerProviderType.DIRECTORY and not values.get("ticker_directory"):
+            raise ValueError("The directory ticker provider requires BACKTESTER_TICKER_DIRECTORY")
+        return values
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Gets the settings of the application, read once per process.
+    :return: Settings instance
+    """
+    return Settings()
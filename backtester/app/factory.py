@@ -4,6 +4,7 @@ Factory for creating the FastAPI application instance.
 from fastapi import FastAPI, HTTPException
 from starlette.middleware.cors import CORSMiddleware
 
+from backtester.api.dependencies import init_bulk_ticker_fetcher, init_sweep_executor
 from backtester.app.exceptions import http_exception_handler
 from backtester.app.routers import include_routers
 
@@ -25,5 +26,7 @@ def create_app() -> FastAPI:
 
     include_routers(app)
     app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_event_handler("shutdown", init_sweep_executor().shutdown)
+    app.add_event_handler("shutdown", init_bulk_ticker_fetcher().shutdown)
 
     return app
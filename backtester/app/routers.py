@@ -3,7 +3,7 @@ Define the routers for the FastAPI application.
 """
 from fastapi import FastAPI
 
-from backtester.api.routes import trading_system_router
+from backtester.api.routes import metrics_router, trading_system_router
 
 
 def include_routers(app: FastAPI):
@@ -15,3 +15,8 @@ def include_routers(app: FastAPI):
         prefix="/api/v1/trading-systems",
         tags=["trading-systems"]
     )
+    app.include_router(
+        metrics_router,
+        prefix="/api/v1/metrics",
+        tags=["metrics"]
+    )
@@ -1,16 +1,25 @@
 import logging
-from typing import Set
+from itertools import product
+from typing import Dict, Optional, Set, Tuple
 
-import pandas as pd
+import numpy as np
 
 from backtester.api.requests.backtesting_request import BacktestingRequest
 from backtester.api.requests.portfolio_management import PortfolioManagement
+from backtester.api.requests.target_sweep_request import TargetSweepRequest
+from backtester.api.requests.trading_system import TradingSystemRules
 from backtester.application.signal_service import SignalService
 from backtester.application.strategy_service import StrategyService
+from backtester.application.ticker_data_processor import TickerDataProcessor
 from backtester.application.ticker_service import TickerService
 from backtester.application.trade_service import TradeService
+from backtester.application.vectorized_trade_engine import VectorizedTradeEngine
+from backtester.domain.enums.backtest_engine import BacktestEngine
 from backtester.domain.enums.order_type import OrderType
-from backtester.domain.strategy.presenters import StrategyGroupedStats, StrategyStats
+from backtester.domain.enums.trade_detail import TradeDetail
+from backtester.domain.signals.signal_events import SignalEvents
+from backtester.domain.strategy.presenters import StrategyGroupedStats, StrategyStats, TargetSweepStats
+from backtester.domain.ticker.bar_array import BarArray
 
 logger = logging.getLogger(__name__)
 
@@ -18,73 +27,174 @@ logger = logging.getLogger(__name__)
 class Backtester:
     def __init__(
             self,
-            ticker_service: TickerService,
+            ticker_service: Optional[TickerService],
             signal_service: SignalService,
             strategy_service: StrategyService,
-            trade_service: TradeService
+            trade_service: TradeService,
+            vectorized_trade_engine: VectorizedTradeEngine
     ):
         self.ticker_service = ticker_service
         self.signal_service = signal_service
         self.strategy_service = strategy_service
         self.trade_service = trade_service
+        self.vectorized_trade_engine = vectorized_trade_engine
 
     def backtest(
             self,
             backtesting_request: BacktestingRequest
     ) -> StrategyGroupedStats:
         ticker_data = self.ticker_service.fetch_ticker_data(backtesting_request.ticker_request)
+        return self.backtest_ticker_data(
+            ticker_data=ticker_data,
+            backtesting_request=backtesting_request
+        )
 
-        trading_system_rules = self.signal_service.process_trading_system_rules(
+    def backtest_ticker_data(
+            self,
+            ticker_data: BarArray,
+            backtesting_request: BacktestingRequest
+    ) -> StrategyGroupedStats:
+        """
+        Backtests a trading system on already fetched ticker data,
+         ignoring the ticker request of the backtesting request.
+        :param ticker_data: The BarArray containing processed ticker data.
+        :param backtesting_request: the trading system and its portfolio management.
+        :return: The results of the backtest, grouped by strategy.
+        """
+        ticker_data, signal_events = self._calculate_signals(
             ticker_data=ticker_data,
-            trading_system_rules=backtesting_request.trading_system_rules,
+            trading_system_rules=backtesting_request.trading_system_rules
         )
-        self.signal_service.calculate_indicators(
+        if backtesting_request.engine == BacktestEngine.VECTORIZED:
+            return self._run_vectorized_backtest(
+                ticker_data=ticker_data,
+                signal_events=signal_events,
+                portfolio_management=backtesting_request.portfolio_management,
+                trade_detail=backtesting_request.trade_detail,
+            )
+        return self._run_backtest(
             ticker_data=ticker_data,
+            signal_events=signal_events,
+            portfolio_management=backtesting_request.portfolio_management,
+            trade_detail=backtesting_request.trade_detail,
         )
 
-        ticker_data = self.signal_service.calculate_rules_mask(
-            ticker_data=ticker_data.copy(),
-            trading_system_rule=trading_system_rules
+    def sweep_targets(
+            self,
+            target_sweep_request: TargetSweepRequest
+    ) -> TargetSweepStats:
+        """
+        Backtests a trading system for every combination of a grid of trade targets and trade sizes.
+        The signals are computed once, and the trades of all combinations are simulated in a batch.
+        :param target_sweep_request: the trading system and the grid of trade targets.
+        :return: The statistics of every combination, as a table.
+        """
+        ticker_data = self.ticker_service.fetch_ticker_data(target_sweep_request.ticker_request)
+        ticker_data, signal_events = self._calculate_signals(
+            ticker_data=ticker_data,
+            trading_system_rules=target_sweep_request.trading_system_rules
         )
-        self.signal_service.process_trading_system_rules(
+        breach_index = TickerDataProcessor.build_breach_index(ticker_data)
+        target_pairs = list(product(
+            target_sweep_request.target_grid.take_profit,
+            target_sweep_request.target_grid.stop_loss
+        ))
+        swept_trades = self.vectorized_trade_engine.sweep(
             ticker_data=ticker_data,
-            trading_system_rules=backtesting_request.trading_system_rules,
+            take_profit=np.array([take_profit for take_profit, _ in target_pairs], dtype=np.float64),
+            stop_loss=np.array([stop_loss for _, stop_loss in target_pairs], dtype=np.float64),
+            breach_index=breach_index,
+            signal_events=signal_events
         )
-        return self._run_backtest(
+        swept_portfolios = self.vectorized_trade_engine.compound_sweep(
+            swept_trades=swept_trades,
+            trade_sizes=target_sweep_request.trade_sizes,
+            starting_amount=target_sweep_request.portfolio_management.starting_amount
+        )
+
+        bar_dates = ticker_data.dates
+        strategies = []
+        for combination, portfolio_management in enumerate(target_sweep_request.expand_portfolio_management()):
+            trade_size_index, target_pair_index = divmod(combination, len(target_pairs))
+            strategy = self.strategy_service.init_strategy(
+                portfolio_management=portfolio_management,
+                bar_dates=bar_dates,
+                trade_detail=TradeDetail.SUMMARY
+            )
+            strategy.add_trade_results(
+                wins=int(swept_portfolios.wins[trade_size_index, target_pair_index]),
+                losses=int(swept_portfolios.losses[trade_size_index, target_pair_index])
+            )
+            strategy.set_current_amount(float(swept_portfolios.current_amount[trade_size_index, target_pair_index]))
+            strategies.append(strategy)
+        logger.debug("Swept %s combinations of trade targets", len(strategies))
+        return TargetSweepStats.from_strategies(strategies)
+
+    def _calculate_signals(
+            self,
+            ticker_data: BarArray,
+            trading_system_rules: TradingSystemRules
+    ) -> Tuple[BarArray, Dict[OrderType, SignalEvents]]:
+        """
+        Calculates the signals of the trading system on the ticker data.
+        :param ticker_data: The BarArray containing processed ticker data.
+        :param trading_system_rules: the rules of the trading system.
+        :return: The bars with signals, sharing the other columns, and the signal events of each order type.
+        """
+        processed_trading_system_rules = self.signal_service.process_trading_system_rules(
+            trading_system_rules=trading_system_rules,
+        )
+        signal_events = self.signal_service.get_signal_events(
             ticker_data=ticker_data,
-            portfolio_management=backtesting_request.portfolio_management,
+            trading_system_rule=processed_trading_system_rules
+        )
+        ticker_data = self.signal_service.assign_signals(
+            ticker_data=ticker_data,
+            signal_events=signal_events
         )
+        return ticker_data, signal_events
 
     def _run_backtest(
             self,
-            ticker_data: pd.DataFrame,
+            ticker_data: BarArray,
+            signal_events: Dict[OrderType, SignalEvents],
             portfolio_management: PortfolioManagement,
+            trade_detail: TradeDetail,
     ) -> StrategyGroupedStats:
         """
         Runs a backtest on the provided ticker data
          using the specified portfolio management settings.
-        :param ticker_data: The DataFrame containing ticker data with signals.
+        :param ticker_data: The BarArray containing ticker data with signals.
+        :param signal_events: the signal events of each order type.
         :param portfolio_management: portfolio management settings for the backtest.
+        :param trade_detail: level of trade detail kept during the backtest.
         :return: The results of the backtest, grouped by strategy.
         """
-        signals = ticker_data[ticker_data['signal'] != OrderType.NO_ACTION].index
+        signals = set().union(*signal_events.values())
         processed_signals: Set[int] = set()
 
         strategy = self.strategy_service.init_strategy(
             portfolio_management=portfolio_management,
+            bar_dates=ticker_data.dates,
+            trade_detail=trade_detail
         )
         logger.debug("Starting backtest for strategy %s", strategy)
-        for signal in signals:
+        for signal in sorted(signals):
             if signal in processed_signals:
                 continue
             processed_signals.add(signal)
-            order_type = ticker_data.at[signal, 'signal']
+            if signal + 1 >= len(ticker_data):
+                # A signal on the last bar has no bar left to trade on
+                logger.debug("Skipping signal on the last bar %s", signal)
+                break
+            order_type = OrderType.from_code(int(ticker_data['signal'][signal]))
             trade = self.trade_service.init_trade(strategy=strategy, order_type=order_type)
 
-            for i, (index, row) in enumerate(ticker_data.iloc[signal + 1:].iterrows()):
+            for i, index in enumerate(range(signal + 1, len(ticker_data))):
                 self.trade_service.process_trading_period(
                     trade=trade,
-                    trading_period_data=row,
+                    bars=ticker_data,
+                    index=index,
                     is_first_trading_period=(i == 0)
                 )
                 logger.debug(
@@ -105,3 +215,47 @@ class Backtester:
 
         results = StrategyStats.from_strategy(strategy)
         return StrategyGroupedStats.from_strategy_stats(results)
+
+    def _run_vectorized_backtest(
+            self,
+            ticker_data: BarArray,
+            signal_events: Dict[OrderType, SignalEvents],
+            portfolio_management: PortfolioManagement,
+            trade_detail: TradeDetail,
+    ) -> StrategyGroupedStats:
+        """
+        Runs a backtest on the provided ticker data with the vectorized trade engine.
+        Produces the same results as the iterative backtest.
+        :param ticker_data: The BarArray containing ticker data with signals.
+        :param signal_events: the signal events of each order type.
+        :param portfolio_management: portfolio management settings for the backtest.
+        :param trade_detail: level of trade detail kept during the backtest.
+        :return: The results of the backtest, grouped by strategy.
+        """
+        strategy = self.strategy_service.init_strategy(
+            portfolio_management=portfolio_management,
+            bar_dates=ticker_data.dates,
+            trade_detail=trade_detail
+        )
+        logger.debug("Starting vectorized backtest for strategy %s", strategy)
+        breach_index = TickerDataProcessor.build_breach_index(ticker_data)
+        simulated_trades = self.vectorized_trade_engine.simulate(
+            ticker_data=ticker_data,
+            trade_targets=portfolio_management.trade_targets,
+            keep_trading_periods=trade_detail.keep_trading_periods,
+            breach_index=breach_index,
+            signal_events=signal_events
+        )
+        portfolio_path = self.vectorized_trade_engine.compound(
+            simulated_trades=simulated_trades,
+            portfolio_management=portfolio_management
+        )
+        self.strategy_service.process_simulated_trades(
+            strategy=strategy,
+            ticker_data=ticker_data,
+            simulated_trades=simulated_trades,
+            portfolio_path=portfolio_path
+        )
+
+        results = StrategyStats.from_strategy(strategy)
+        return StrategyGroupedStats.from_strategy_stats(results)
@@ -0,0 +1,98 @@
+"""
+Byte Limited Cache, the least recently used cache the caches of the service build on.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ByteLimitedCache:
+    """
+    Thread-safe least recently used cache, bounded by the bytes of the values it holds.
+    Values expose their size through an nbytes attribute,
+     and are returned without a copy.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initializes an empty cache.
+        :param max_bytes: maximum number of bytes of the cached values, 0 disabling the cache.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Gets a cached value, marking it as the most recently used.
+        :param key: key of the value.
+        :return: the value, or None if it is not cached.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """
+        Caches a value, evicting the least recently used values beyond the byte budget.
+        Values larger than the whole budget are not cached.
+        :param key: key of the value.
+        :param value: value to cache.
+        :return: the value.
+        """
+        if value.nbytes > self.max_bytes:
+            return value
+        with self._lock:
+            previous_value = self._entries.pop(key, None)
+            if previous_value is not None:
+                self.bytes -= previous_value.nbytes
+            self._entries[key] = value
+            self.bytes += value.nbytes
+            while self.bytes > self.max_bytes:
+                _, evicted_value = self._entries.popitem(last=False)
+                self.bytes -= evicted_value.nbytes
+                self.evictions += 1
+                logger.debug("Evicted %s bytes from %s", evicted_value.nbytes, type(self).__name__)
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes every cached value, keeping the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters and the occupancy of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the cache.
+        """
+        return f"{type(self).__name__}(entries={len(self._entries)}, " \
+               f"bytes={self.bytes}, max_bytes={self.max_bytes})"
@@ -0,0 +1,69 @@
+"""
+Indicator Cache, reusing indicator masks across requests.
+"""
+import hashlib
+import logging
+from typing import Any, Dict, Hashable, Tuple
+
+import numpy as np
+
+from backtester.application.byte_limited_cache import ByteLimitedCache
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorCache(ByteLimitedCache):
+    """
+    Least recently used cache of raw indicator masks, bounded by the bytes of the masks it holds.
+    Masks are keyed on a content fingerprint of the price data they were computed on,
+    the name of the indicator and its normalized parameters,
+    so requests on the same series share masks whatever their ticker request.
+    Cached masks are read-only and returned without a copy.
+    """
+
+    @staticmethod
+    def fingerprint(price_data: Dict[str, np.ndarray]) -> str:
+        """
+        Computes a content fingerprint of price data.
+        :param price_data: price columns.
+        :return: hex digest of the names, lengths and float64 bytes of the columns.
+        """
+        digest = hashlib.sha256()
+        for name in sorted(price_data):
+            column = np.ascontiguousarray(price_data[name], dtype=np.float64)
+            digest.update(f"{name}:{len(column)}".encode())
+            digest.update(column.view(np.uint8))
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(
+            fingerprint: str,
+            name: str,
+            parameters: Dict[str, Any]
+    ) -> Tuple[str, str, Tuple[Tuple[str, Any], ...]]:
+        """
+        Builds the key of an indicator mask.
+        Parameters that are not set are dropped, and whole floats are treated as integers,
+        so equivalent parameters share a key.
+        :param fingerprint: fingerprint of the price data.
+        :param name: name of the indicator.
+        :param parameters: parameters of the indicator, price data aside.
+        :return: the key of the mask.
+        """
+        normalized_parameters = tuple(sorted(
+            (parameter, int(value) if isinstance(value, float) and value.is_integer() else value)
+            for parameter, value in parameters.items()
+            if value is not None
+        ))
+        return fingerprint, name, normalized_parameters
+
+    def put(self, key: Hashable, mask: np.ndarray) -> np.ndarray:
+        """
+        Caches a mask, evicting the least recently used masks beyond the byte budget.
+        Masks larger than the whole budget are not cached.
+        :param key: key of the mask.
+        :param mask: mask to cache, made read-only.
+        :return: the read-only mask.
+        """
+        mask.setflags(write=False)
+        return super().put(key, mask)
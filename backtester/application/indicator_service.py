@@ -1,7 +1,10 @@
 import logging
-from typing import Dict, List
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from backtester.api.exceptions.indicator_exceptions import IndicatorNotFoundError
+from backtester.application.indicator_cache import IndicatorCache
 from backtester.application.indicator_validator_service import IndicatorValidatorService
 from backtester.domain.indicators.indicator import Indicator
 from backtester.domain.indicators.indicator_data import IndicatorData
@@ -14,26 +17,36 @@ class IndicatorService:
     def __init__(
             self,
             indicator_validator_service: IndicatorValidatorService,
-            registry: Dict
+            registry: Dict,
+            indicator_cache: Optional[IndicatorCache] = None
     ):
+        """
+        :param indicator_cache: if provided, raw masks are shared through the cache
+         with every request on the same price data.
+        """
         self.registry = registry
         self.indicator_validator_service = indicator_validator_service
+        self.indicator_cache = indicator_cache
         self.indicator_masks = {}
+        self.price_data_fingerprint: Optional[str] = None
 
     def compute_masks(
             self,
             indicators: Dict,
-            price_data: Dict[str, List]
-    ) -> Dict[str, List]:
+            price_data: Dict[str, np.ndarray],
+            price_data_fingerprint: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
         """
         Retrieve indicator func from Indicator Registry.
-        Preprocess the parameters,
-        compute the mask,
-        and postprocess the result before you return it.
+        Preprocess the parameters
+        and compute the mask as a float64 numpy array, NaN where the indicator is undefined.
+        :param price_data_fingerprint: fingerprint of the price data, computed if not provided.
         """
         price_data = self.indicator_validator_service.convert_lists_to_numpy_arrays(
             price_data
         )
+        if self.indicator_cache is not None:
+            self.price_data_fingerprint = price_data_fingerprint or self.indicator_cache.fingerprint(price_data)
         for indicator_id in indicators.keys():
             self._compute_mask(
                 indicators=indicators,
@@ -65,12 +78,20 @@ class IndicatorService:
     def _compute_mask(
             self,
             indicators: Dict[str, IndicatorData],
-            price_data: Dict[str, List],
+            price_data: Dict[str, np.ndarray],
             indicator_id: str,
     ) -> None:
         indicator = indicators.get(indicator_id)
         name = indicator.get('name')
         parameters = indicator.get('parameters')
+        if self.indicator_cache is not None:
+            self._compute_cached_mask(
+                name=name,
+                parameters=parameters,
+                price_data=price_data,
+                indicator_id=indicator_id
+            )
+            return
         parameters.update(price_data)
         # By importing all the declared indicator_subclasses
         # we are allowing them to be registered in the indicator class.
@@ -86,3 +107,35 @@ class IndicatorService:
             indicator_id
         )
         self.indicator_masks[indicator_id] = mask
+
+    def _compute_cached_mask(
+            self,
+            name: str,
+            parameters: Dict[str, Any],
+            price_data: Dict[str, np.ndarray],
+            indicator_id: str,
+    ) -> None:
+        """
+        Gets the mask of an indicator from the cache, computing and caching it on a miss.
+        Cached masks are read-only.
+        """
+        key = self.indicator_cache.make_key(
+            fingerprint=self.price_data_fingerprint,
+            name=name,
+            parameters=parameters
+        )
+        mask = self.indicator_cache.get(key)
+        if mask is not None:
+            logger.debug(
+                'Indicator mask for %s found in cache',
+                indicator_id
+            )
+            self.indicator_masks[indicator_id] = mask
+            return
+        indicator_function = self._get_indicator_class(name)
+        mask = indicator_function.compute({**parameters, **price_data})
+        logger.info(
+            'Indicator mask computed successfully for %s',
+            indicator_id
+        )
+        self.indicator_masks[indicator_id] = self.indicator_cache.put(key, mask)
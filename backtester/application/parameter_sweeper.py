@@ -0,0 +1,117 @@
+"""
+Parameter Sweeper, backtesting every combination of a parameter grid on a process pool.
+"""
+import logging
+from concurrent.futures import Future, as_completed
+from typing import Any, Dict, Iterator, List
+
+from backtester.api.exceptions.sweep_exceptions import SweepCombinationError, SweepTooLargeError
+from backtester.api.requests.parameter_sweep_request import ParameterSweepRequest
+from backtester.app.config import Settings
+from backtester.application.sweep_executor import SweepExecutor
+from backtester.application.sweep_worker import SweepCombination, run_sweep_chunk
+from backtester.application.ticker_service import TickerService
+from backtester.infrastructure.shared_bar_array import SharedBarArray
+
+logger = logging.getLogger(__name__)
+
+
+class ParameterSweeper:
+    """
+    Expands a parameter sweep into backtesting requests, fetches the ticker data once,
+    and fans chunks of combinations out to the workers of the SweepExecutor.
+    The ticker data is handed to the workers in shared memory, so chunks only carry its handle.
+    """
+
+    def __init__(
+            self,
+            ticker_service: TickerService,
+            sweep_executor: SweepExecutor,
+            settings: Settings
+    ):
+        self.ticker_service = ticker_service
+        self.sweep_executor = sweep_executor
+        self.settings = settings
+
+    def sweep(
+            self,
+            parameter_sweep_request: ParameterSweepRequest
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Starts backtesting every combination of the parameter grid.
+        The request is validated and the chunks are submitted before returning,
+        so invalid requests fail before any result is streamed.
+        :param parameter_sweep_request: the template request and its parameter grid.
+        :return: iterator over the result of each combination, in the order they finish.
+        """
+        if parameter_sweep_request.combinations > self.settings.sweep_max_combinations:
+            raise SweepTooLargeError(
+                combinations=parameter_sweep_request.combinations,
+                max_combinations=self.settings.sweep_max_combinations
+            )
+        combinations: List[SweepCombination] = [
+            (combination, parameters, backtesting_request)
+            for combination, (parameters, backtesting_request) in enumerate(parameter_sweep_request.expand())
+        ]
+
+        ticker_data = self.ticker_service.fetch_ticker_data(
+            parameter_sweep_request.backtesting_request.ticker_request
+        )
+        shared_ticker_data = SharedBarArray(ticker_data)
+        chunk_size = self.settings.sweep_chunk_size
+        chunks = {}
+        try:
+            for start in range(0, len(combinations), chunk_size):
+                chunk = combinations[start:start + chunk_size]
+                chunks[self.sweep_executor.submit(run_sweep_chunk, shared_ticker_data.handle, chunk)] = chunk
+        except BaseException:
+            self._cancel(chunks)
+            shared_ticker_data.unlink()
+            raise
+        logger.info(
+            "Sweeping %s combinations in %s chunks",
+            len(combinations),
+            len(chunks)
+        )
+        return self._iter_results(chunks, shared_ticker_data)
+
+    def _iter_results(
+            self,
+            chunks: Dict[Future, List[SweepCombination]],
+            shared_ticker_data: SharedBarArray
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the results of the chunks as they finish.
+        A chunk whose worker failed yields an error for each of its combinations, and the other chunks go on.
+        Chunks not started yet are cancelled if the iteration stops early.
+        :param chunks: Futures of the submitted chunks, and the combinations of each chunk.
+        :param shared_ticker_data: ticker data shared with the workers, released once the chunks are done.
+        """
+        futures = list(chunks)
+        try:
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception:  # pylint: disable=broad-except
+                    logger.error("Sweep chunk of %s combinations failed", len(chunks[future]), exc_info=True)
+                    results = [
+                        {
+                            'combination': combination,
+                            'parameters': parameters,
+                            'error': SweepCombinationError(combination).detail
+                        }
+                        for combination, parameters, _ in chunks[future]
+                    ]
+                yield from results
+        finally:
+            self._cancel(chunks)
+            shared_ticker_data.unlink()
+
+    @staticmethod
+    def _cancel(chunks: Dict[Future, List[SweepCombination]]) -> None:
+        """
+        Cancels the chunks not started yet.
+        :param chunks: Futures of the submitted chunks, and the combinations of each chunk.
+        """
+        for future in chunks:
+            future.cancel()
@@ -0,0 +1,586 @@
+"""
+Rule Compiler, lowering the rules of a trading system to a flat program.
+"""
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from backtester.application.rule_planner import Comparison, GroupRulePlan, Operand, RulePlanner
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
+from backtester.domain.enums.rule_opcode import RuleOpcode
+from backtester.domain.enums.rule_property_type import RulePropertyType
+from backtester.domain.signals.group_rule import GroupRule
+from backtester.domain.signals.order_type_rule import OrderTypeRule
+from backtester.domain.signals.rule import Rule
+from backtester.domain.signals.rule_program import Branch, Instruction, RuleProgram
+from backtester.domain.signals.signal_bitset import SignalBitset
+from backtester.domain.signals.tile import Tile
+from backtester.domain.signals.trading_sustem_rule import TradingSystemRule
+
+logger = logging.getLogger(__name__)
+
+
+class RuleCompiler:
+    """
+    Compiles a TradingSystemRule into a RuleProgram.
+    The rules of a group rule are combined with OR, the group rules of an order type with AND.
+
+    Every comparison is canonicalized to "greater operand is above lesser operand",
+     so comparisons equivalent after swapping their arguments share a value number,
+     as do crosses built from the same comparisons.
+    Each distinct operand, shifted operand, comparison and cross is computed once per program:
+     values used more than once are kept in a dedicated boolean buffer,
+     while the others are written into one of a few scratch buffers shared by the whole program.
+
+    Values read by more than one order type are computed first,
+     and the group rules of each order type follow, in the order of the RulePlanner when indicator masks are given.
+    A BRANCH_IF_EMPTY instruction after each group rule but the last
+     skips the rest of the order type once its signals are empty.
+
+    Given cached signals, keyed by the structural key of their rule, group rule or order type rule,
+     cached subtrees are loaded instead of compiled,
+     and CACHE instructions publish the signals of every other subtree.
+    """
+    CROSS_COMPARISONS = {
+        RuleComparisonMethod.CROSSES_ABOVE: RuleComparisonMethod.IS_ABOVE,
+        RuleComparisonMethod.CROSSES_BELOW: RuleComparisonMethod.IS_BELOW,
+    }
+
+    def __init__(self, cached_signals: Optional[Dict[Hashable, SignalBitset]] = None):
+        """
+        Initializes a RuleCompiler instance.
+        :param cached_signals: signals of the subtrees already computed, by structural key,
+         if the signals of subtrees are cached.
+        """
+        self.cached_signals = cached_signals if cached_signals is not None else {}
+        self.cache_signals = cached_signals is not None
+        self.published_keys: Set[Hashable] = set()
+        self.instructions: List[Instruction] = []
+        self.registers = 0
+        self.boolean_registers: List[int] = []
+        self.operand_registers: Dict[Hashable, int] = {}
+        self.constant_registers: Set[int] = set()
+        self.scratch_registers: Dict[str, int] = {}
+        self.uses: Dict[Hashable, int] = {}
+        self.values: Dict[Hashable, int] = {}
+        self.control_operations = 0
+
+    @classmethod
+    def compile(
+            cls,
+            trading_system_rule: TradingSystemRule,
+            indicator_masks: Optional[Dict[str, np.ndarray]] = None,
+            cached_signals: Optional[Dict[Hashable, SignalBitset]] = None
+    ) -> RuleProgram:
+        """
+        Compiles the rules of a trading system.
+        Order types without rules, or with a group rule without rules, never signal,
+         so no signals are stored for them.
+        :param trading_system_rule: TradingSystemRule instance containing the rules to compile.
+        :param indicator_masks: float64 mask of every indicator, by tile ID,
+         used to plan the order of the group rules. Group rules keep their order if not provided.
+        :param cached_signals: signals of the subtrees already computed, by structural key.
+         If provided, the program loads them, and caches the signals of the other subtrees.
+        :return: the compiled RuleProgram.
+        """
+        compiler = cls(cached_signals)
+        order_type_rules = compiler._get_order_type_rules(trading_system_rule)
+        rules = compiler._get_computed_rules(order_type_rules)
+        compiler._count_uses(rules)
+        compiler._compile_shared_values(order_type_rules)
+        for order_type_rule in order_type_rules:
+            compiler._compile_order_type_rule(order_type_rule, indicator_masks)
+
+        value_operations = len(compiler.instructions) - compiler.control_operations
+        program = RuleProgram(
+            instructions=compiler.instructions,
+            registers=compiler.registers,
+            boolean_registers=compiler.boolean_registers,
+            eliminated_operations=sum(compiler._get_rule_cost(rule) for rule in rules) - value_operations,
+            rules=sum(len(order_type_rule) for order_type_rule in order_type_rules)
+        )
+        logger.debug(
+            "Compiled trading system rule to %s, eliminating %s common operations",
+            program,
+            program.eliminated_operations
+        )
+        return program
+
+    @classmethod
+    def get_subtree_keys(cls, trading_system_rule: TradingSystemRule) -> Set[Hashable]:
+        """
+        Gets the structural keys of every rule, group rule and order type rule compiled for a trading system.
+        :param trading_system_rule: TradingSystemRule instance containing the rules.
+        :return: the structural keys of the subtrees.
+        """
+        compiler = cls()
+        keys = set()
+        for order_type_rule in compiler._get_order_type_rules(trading_system_rule):
+            keys.add(compiler.get_subtree_key(order_type_rule))
+            for group_rule in order_type_rule.group_rules:
+                keys.add(compiler.get_subtree_key(group_rule))
+                keys.update(compiler.get_subtree_key(rule) for rule in group_rule.rules)
+        return keys
+
+    @classmethod
+    def get_indicator_ids(
+            cls,
+            trading_system_rule: TradingSystemRule,
+            cached_signals: Optional[Dict[Hashable, SignalBitset]] = None
+    ) -> Set[str]:
+        """
+        Gets the IDs of the indicators the program of a trading system loads.
+        :param trading_system_rule: TradingSystemRule instance containing the rules.
+        :param cached_signals: signals of the subtrees already computed, by structural key.
+        :return: the tile IDs of the indicators.
+        """
+        compiler = cls(cached_signals)
+        return {
+            tile.id
+            for rule in compiler._get_computed_rules(compiler._get_order_type_rules(trading_system_rule))
+            for tile in (rule.first_tile, rule.second_tile)
+            if tile.type == RulePropertyType.INDICATOR
+        }
+
+    def get_subtree_key(self, subtree: Union[Rule, GroupRule, OrderTypeRule]) -> Hashable:
+        """
+        Gets the structural key of a rule, group rule or order type rule,
+         shared by the subtrees computing the same signals.
+        Rules combined are unordered, and a group rule of a single rule, or an order type rule of a single group rule,
+         shares the key of its only child.
+        :param subtree: Rule, GroupRule or OrderTypeRule instance.
+        :return: the structural key.
+        """
+        if isinstance(subtree, Rule):
+            return self._get_rule_key(subtree)
+        opcode, children = (RuleOpcode.OR, subtree.rules) if isinstance(subtree, GroupRule) \
+            else (RuleOpcode.AND, subtree.group_rules)
+        keys = frozenset(self.get_subtree_key(child) for child in children)
+        return next(iter(keys)) if len(keys) == 1 else (opcode, keys)
+
+    @staticmethod
+    def _get_order_type_rules(trading_system_rule: TradingSystemRule) -> List[OrderTypeRule]:
+        """
+        Gets the order type rules that may signal, those with rules and without an empty group rule.
+        """
+        return [
+            order_type_rule
+            for order_type_rule in (trading_system_rule.buy_rules, trading_system_rule.sell_rules)
+            if len(order_type_rule) > 0 and all(
+                len(group_rule) > 0 for group_rule in order_type_rule.group_rules
+            )
+        ]
+
+    def _get_computed_rules(self, order_type_rules: List[OrderTypeRule]) -> List[Rule]:
+        """
+        Gets the rules computed by the program, those of no cached subtree.
+        :param order_type_rules: order type rules compiled in the program.
+        :return: the rules, in order of appearance.
+        """
+        return [
+            rule
+            for order_type_rule in order_type_rules
+            if not self._is_cached(order_type_rule)
+            for group_rule in order_type_rule.group_rules
+            if not self._is_cached(group_rule)
+            for rule in group_rule.rules
+            if not self._is_cached(rule)
+        ]
+
+    def _is_cached(self, subtree: Union[Rule, GroupRule, OrderTypeRule]) -> bool:
+        """
+        Checks if the signals of a subtree are cached.
+        """
+        return bool(self.cached_signals) and self.get_subtree_key(subtree) in self.cached_signals
+
+    def _count_uses(self, rules: List[Rule]) -> None:
+        """
+        Counts the uses of the value number of every rule, and of the comparisons of every distinct cross.
+        :param rules: rules compiled in the program.
+        """
+        for rule in rules:
+            key = self._get_rule_key(rule)
+            self.uses[key] = self.uses.get(key, 0) + 1
+            if self.uses[key] > 1 or not rule.comparison_method.is_cross():
+                continue
+            for comparison in self._get_comparisons(rule):
+                comparison_key = self._get_comparison_key(comparison)
+                self.uses[comparison_key] = self.uses.get(comparison_key, 0) + 1
+
+    def _compile_shared_values(self, order_type_rules: List[OrderTypeRule]) -> None:
+        """
+        Compiles the values read by more than one order type, before any order type,
+         so that skipping the rest of an order type never skips a value another order type reads.
+        :param order_type_rules: order type rules compiled in the program.
+        """
+        order_types: Dict[Hashable, Set[OrderType]] = {}
+        for order_type_rule in order_type_rules:
+            for rule in self._get_computed_rules([order_type_rule]):
+                for key in self._get_value_keys(rule):
+                    order_types.setdefault(key, set()).add(order_type_rule.order_type)
+        shared_keys = {key for key, key_order_types in order_types.items() if len(key_order_types) > 1}
+
+        for rule in self._get_computed_rules(order_type_rules):
+            if self._get_rule_key(rule) in shared_keys:
+                self._compile_rule(rule, self._get_scratch_register('rule'))
+                continue
+            for comparison in self._get_comparisons(rule):
+                key = self._get_comparison_key(comparison)
+                if key in shared_keys and self.uses.get(key, 0) > 1:
+                    self._compare(comparison, self._get_scratch_register('rule'))
+                    continue
+                for operand in comparison:
+                    if self._get_operand_key(operand) in shared_keys:
+                        self._get_operand_register(operand)
+
+    def _compile_order_type_rule(
+            self,
+            order_type_rule: OrderTypeRule,
+            indicator_masks: Optional[Dict[str, np.ndarray]]
+    ) -> None:
+        """
+        Compiles an order type rule, storing its signals in a register no other value is written in.
+        The register stays empty until a second group rule is merged in it,
+         so a branch taken after any group rule leaves it empty.
+        Its signals are complete even when a branch is taken, so they are cached after the STORE.
+        :param order_type_rule: OrderTypeRule instance to compile.
+        :param indicator_masks: float64 mask of every indicator, by tile ID, if available.
+        """
+        key = self.get_subtree_key(order_type_rule)
+        if key in self.cached_signals:
+            result = self._load_signals(key)
+            self._emit_control(RuleOpcode.STORE, result, (result,), order_type_rule.order_type)
+            return
+
+        group_rules = order_type_rule.group_rules
+        if indicator_masks is not None:
+            group_rules = [
+                plan.group_rule for plan in RulePlanner.order(
+                    plans=[self._plan_group_rule(group_rule) for group_rule in group_rules],
+                    indicator_masks=indicator_masks
+                )
+            ]
+
+        target = self._allocate_boolean_register()
+        result = None
+        remaining_rules = len(order_type_rule)
+        branches = []
+        for group_rule in group_rules:
+            if result is None:
+                result = self._compile_group_rule(group_rule, target)
+            else:
+                group_result = self._compile_group_rule(group_rule, self._get_scratch_register('group'))
+                self._emit_control(RuleOpcode.AND, target, (result, group_result))
+                result = target
+            remaining_rules -= len(group_rule)
+            if remaining_rules > 0:
+                branches.append(len(self.instructions))
+                self._emit_control(RuleOpcode.BRANCH_IF_EMPTY, result, (result,), remaining_rules)
+
+        for branch in branches:
+            self.instructions[branch] = self.instructions[branch]._replace(
+                argument=Branch(target=len(self.instructions), skipped_rules=self.instructions[branch].argument)
+            )
+        self._emit_control(RuleOpcode.STORE, result, (result,), order_type_rule.order_type)
+        self._publish_signals(result, key)
+
+    def _plan_group_rule(self, group_rule: GroupRule) -> GroupRulePlan:
+        """
+        Gets the plan of a group rule, evaluating its cached subtrees from their signals.
+        """
+        group_key = self.get_subtree_key(group_rule)
+        if group_key in self.cached_signals:
+            return GroupRulePlan(group_rule=group_rule, cost=0, comparisons=[], signals=[self.cached_signals[group_key]])
+        return GroupRulePlan(
+            group_rule=group_rule,
+            cost=self._get_group_rule_cost(group_rule),
+            comparisons=[self._get_comparisons(rule) for rule in group_rule.rules if not self._is_cached(rule)],
+            signals=[
+                self.cached_signals[self.get_subtree_key(rule)]
+                for rule in group_rule.rules if self._is_cached(rule)
+            ]
+        )
+
+    def _compile_group_rule(
+            self,
+            group_rule: GroupRule,
+            target: int
+    ) -> int:
+        """
+        Compiles a group rule, or loads its cached signals.
+        :param group_rule: GroupRule instance to compile.
+        :param target: boolean register the signals of the group rule may be written in.
+        :return: register holding the signals of the group rule.
+        """
+        key = self.get_subtree_key(group_rule)
+        if key in self.cached_signals:
+            return self._load_signals(key)
+        result = None
+        for rule in group_rule.rules:
+            if result is None:
+                result = self._compile_rule(rule, target)
+                self._publish_signals(result, self.get_subtree_key(rule))
+                continue
+            rule_result = self._compile_rule(rule, self._get_scratch_register('rule'))
+            self._publish_signals(rule_result, self.get_subtree_key(rule))
+            self._emit_control(RuleOpcode.OR, target, (result, rule_result))
+            result = target
+        self._publish_signals(result, key)
+        return result
+
+    def _compile_rule(
+            self,
+            rule: Rule,
+            target: int
+    ) -> int:
+        """
+        Compiles a rule, or loads its cached signals.
+        A cross compares the tiles at the current and at the previous timestep.
+        :param rule: Rule instance to compile.
+        :param target: boolean register the signals of the rule may be written in.
+        :return: register holding the signals of the rule.
+        """
+        key = self._get_rule_key(rule)
+        if key in self.values:
+            return self.values[key]
+        if key in self.cached_signals:
+            return self._load_signals(key)
+        comparisons = self._get_comparisons(rule)
+        if not rule.comparison_method.is_cross():
+            return self._compare(comparisons[0], target)
+
+        if self.uses[key] > 1:
+            target = self._allocate_boolean_register()
+            self.values[key] = target
+        current = self._compare(comparisons[0], target)
+        previous = self._compare(comparisons[1], self._get_scratch_register('cross'))
+        self._emit(RuleOpcode.AND, target, (current, previous))
+        return target
+
+    def _compare(
+            self,
+            comparison: Comparison,
+            target: int
+    ) -> int:
+        """
+        Compiles a canonical comparison, once per distinct comparison.
+        :param comparison: greater and lesser operands of the comparison.
+        :param target: boolean register the comparison may be written in.
+        :return: register holding the comparison.
+        """
+        key = self._get_comparison_key(comparison)
+        if key in self.values:
+            return self.values[key]
+        greater, lesser = (self._get_operand_register(operand) for operand in comparison)
+        if self.uses.get(key, 0) > 1:
+            target = self._allocate_boolean_register()
+            self.values[key] = target
+        self._emit(RuleOpcode.COMPARE, target, (greater, lesser), RuleComparisonMethod.IS_ABOVE)
+        return target
+
+    def _get_comparisons(self, rule: Rule) -> List[Comparison]:
+        """
+        Canonicalizes the comparisons of a rule to (greater, lesser) operands.
+        A cross is the comparison at the current timestep,
+         and the opposite comparison at the previous timestep.
+        :param rule: Rule instance.
+        :return: the comparison of the rule, followed by the comparison at the previous timestep for a cross.
+        """
+        first, second = rule.first_tile, rule.second_tile
+        comparison_method = self.CROSS_COMPARISONS.get(rule.comparison_method, rule.comparison_method)
+        if comparison_method == RuleComparisonMethod.IS_ABOVE:
+            comparisons = [((first, False), (second, False)), ((second, True), (first, True))]
+        else:
+            comparisons = [((second, False), (first, False)), ((first, True), (second, True))]
+        return comparisons if rule.comparison_method.is_cross() else comparisons[:1]
+
+    def _get_rule_key(self, rule: Rule) -> Hashable:
+        """
+        Gets the value number of a rule,
+         a cross being the AND of its comparisons.
+        """
+        comparison_keys = tuple(
+            self._get_comparison_key(comparison) for comparison in self._get_comparisons(rule)
+        )
+        if not rule.comparison_method.is_cross():
+            return comparison_keys[0]
+        return (RuleOpcode.AND,) + comparison_keys
+
+    def _get_value_keys(self, rule: Rule) -> Set[Hashable]:
+        """
+        Gets the value numbers of a rule and of every value it reads,
+         a shifted indicator reading the indicator.
+        A cached rule reads no value.
+        """
+        keys = {self._get_rule_key(rule)}
+        if keys & self.cached_signals.keys():
+            return set()
+        for comparison in self._get_comparisons(rule):
+            keys.add(self._get_comparison_key(comparison))
+            for tile, shifted in comparison:
+                keys.add(self._get_operand_key((tile, shifted)))
+                keys.add(tile.id)
+        return keys
+
+    def _get_comparison_key(self, comparison: Comparison) -> Hashable:
+        """
+        Gets the value number of a canonical comparison.
+        """
+        return tuple(self._get_operand_key(operand) for operand in comparison)
+
+    @staticmethod
+    def _get_operand_key(operand: Operand) -> Hashable:
+        """
+        Gets the value number of an operand, values being the same at every timestep.
+        """
+        tile, shifted = operand
+        if shifted and tile.type == RulePropertyType.INDICATOR:
+            return RuleOpcode.SHIFT, tile.id
+        return tile.id
+
+    def _get_group_rule_cost(self, group_rule: GroupRule) -> int:
+        """
+        Gets the number of operations evaluating a group rule takes,
+         rules already computed or cached being free.
+        """
+        rules_cost = sum(
+            0 if self._get_rule_key(rule) in self.values or self._is_cached(rule) else self._get_rule_cost(rule)
+            for rule in group_rule.rules
+        )
+        return rules_cost + len(group_rule) - 1
+
+    def _get_rule_cost(self, rule: Rule) -> int:
+        """
+        Gets the number of operations compiling a rule on its own takes.
+        """
+        comparisons_cost = sum(self._get_comparison_cost(comparison) for comparison in self._get_comparisons(rule))
+        return comparisons_cost + 1 if rule.comparison_method.is_cross() else comparisons_cost
+
+    @staticmethod
+    def _get_comparison_cost(comparison: Comparison) -> int:
+        """
+        Gets the number of operations compiling a comparison on its own takes.
+        """
+        return 1 + sum(
+            2 if shifted and tile.type == RulePropertyType.INDICATOR else 1
+            for tile, shifted in comparison
+        )
+
+    def _get_operand_register(self, operand: Operand) -> int:
+        """
+        Gets the register holding an operand.
+        """
+        tile, shifted = operand
+        register = self._load(tile)
+        return self._shift(register) if shifted else register
+
+    def _load(self, tile: Tile) -> int:
+        """
+        Loads a tile in a register, once per distinct tile.
+        :param tile: Tile to load.
+        :return: register holding the indicator mask or the value of the tile.
+        """
+        register = self.operand_registers.get(tile.id)
+        if register is not None:
+            return register
+        register = self._allocate_register()
+        if tile.type == RulePropertyType.INDICATOR:
+            self._emit(RuleOpcode.LOAD_INDICATOR, register, argument=tile.id)
+        else:
+            self._emit(RuleOpcode.LOAD_CONSTANT, register, argument=tile.parameters.value)
+            self.constant_registers.add(register)
+        self.operand_registers[tile.id] = register
+        return register
+
+    def _shift(self, register: int) -> int:
+        """
+        Shifts a register by one timestep, once per distinct register.
+        Constants are the same at every timestep and are not shifted.
+        :param register: register to shift.
+        :return: register holding the shifted values.
+        """
+        if register in self.constant_registers:
+            return register
+        key = (RuleOpcode.SHIFT, register)
+        shifted_register = self.operand_registers.get(key)
+        if shifted_register is not None:
+            return shifted_register
+        shifted_register = self._allocate_register()
+        self._emit(RuleOpcode.SHIFT, shifted_register, (register,))
+        self.operand_registers[key] = shifted_register
+        return shifted_register
+
+    def _load_signals(self, key: Hashable) -> int:
+        """
+        Loads the cached signals of a subtree in a register.
+        Loads are not shared, as a branch may skip the load of another order type.
+        :param key: structural key of the subtree.
+        :return: register holding the signals.
+        """
+        register = self._allocate_register()
+        self._emit_control(RuleOpcode.LOAD_SIGNALS, register, argument=key)
+        return register
+
+    def _publish_signals(self, register: int, key: Hashable) -> None:
+        """
+        Caches the signals of a subtree, once per distinct subtree, if the signals of subtrees are cached.
+        :param register: register holding the signals.
+        :param key: structural key of the subtree.
+        """
+        if not self.cache_signals or key in self.published_keys or key in self.cached_signals:
+            return
+        self.published_keys.add(key)
+        self._emit_control(RuleOpcode.CACHE, register, (register,), key)
+
+    def _get_scratch_register(self, name: str) -> int:
+        """
+        Gets a boolean register reused across the program for the same purpose.
+        :param name: purpose of the register.
+        :return: the boolean register.
+        """
+        if name not in self.scratch_registers:
+            self.scratch_registers[name] = self._allocate_boolean_register()
+        return self.scratch_registers[name]
+
+    def _allocate_register(self) -> int:
+        """
+        Allocates a new register.
+        """
+        self.registers += 1
+        return self.registers - 1
+
+    def _allocate_boolean_register(self) -> int:
+        """
+        Allocates a new register backed by a boolean buffer.
+        """
+        register = self._allocate_register()
+        self.boolean_registers.append(register)
+        return register
+
+    def _emit(
+            self,
+            opcode: RuleOpcode,
+            target: int,
+            operands: Tuple[int, ...] = (),
+            argument: Any = None
+    ) -> None:
+        """
+        Appends an instruction to the program.
+        """
+        self.instructions.append(Instruction(opcode, target, operands, argument))
+
+    def _emit_control(
+            self,
+            opcode: RuleOpcode,
+            target: int,
+            operands: Tuple[int, ...] = (),
+            argument: Any = None
+    ) -> None:
+        """
+        Appends an instruction combining, branching on or storing signals,
+         rather than computing the value of a rule.
+        """
+        self._emit(opcode, target, operands, argument)
+        self.control_operations += 1
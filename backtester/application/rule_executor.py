@@ -0,0 +1,155 @@
+"""
+Rule Executor, running compiled rule programs over numpy buffers.
+"""
+import logging
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
+from backtester.domain.enums.rule_opcode import RuleOpcode
+from backtester.domain.signals.rule_program import RuleProgram
+from backtester.domain.signals.signal_bitset import SignalBitset
+
+logger = logging.getLogger(__name__)
+
+
+class RuleExecutor:
+    """
+    Executes a RuleProgram over the indicator masks of a price series.
+    The boolean registers of the program are bitsets over the rows of a single preallocated buffer of words.
+    Comparisons are evaluated in a shared boolean buffer and packed in their register,
+     and merges run a word at a time in place,
+     so arrays are only allocated for the distinct shifted operands.
+
+    A BRANCH_IF_EMPTY instruction skips the rest of an order type once its signals are empty.
+    Once they are sparse, the rest of the order type is only shifted and compared on the bars still signalling,
+     the other bars of its comparisons being left clear, as the AND with the signals clears them anyway.
+    Values read by other order types are computed before any order type, so they are always complete,
+     but the signals of a rule or group rule evaluated on a subset of the bars are not cached.
+    """
+    SUBSET_DENSITY = 1 / 32
+    COMPARISONS = {
+        RuleComparisonMethod.IS_ABOVE: np.greater,
+        RuleComparisonMethod.IS_BELOW: np.less,
+    }
+
+    @staticmethod
+    def execute(
+            program: RuleProgram,
+            indicator_masks: Dict[str, np.ndarray],
+            bars: int,
+            subtree_signals: Optional[Dict[Hashable, SignalBitset]] = None
+    ) -> Dict[OrderType, SignalBitset]:
+        """
+        Executes a rule program.
+        :param program: RuleProgram to execute.
+        :param indicator_masks: float64 mask of every indicator loaded by the program, by tile ID.
+        :param bars: number of bars of the price series.
+        :param subtree_signals: signals of subtrees by structural key,
+         LOAD_SIGNALS instructions reading from it and CACHE instructions adding to it.
+        :return: signals of every order type stored by the program.
+        """
+        registers: List[Any] = [None] * program.registers
+        words = np.zeros(
+            (len(program.boolean_registers), SignalBitset.get_word_count(bars)),
+            dtype='<u8'
+        )
+        for row, register in enumerate(program.boolean_registers):
+            registers[register] = SignalBitset(words[row], bars)
+        comparison = np.empty(bars, dtype=bool)
+
+        signals: Dict[OrderType, SignalBitset] = {}
+        active_bars: Optional[np.ndarray] = None
+        skipped_rules = 0
+        position = 0
+        while position < len(program.instructions):
+            instruction = program.instructions[position]
+            position += 1
+            opcode = instruction.opcode
+            operands = [registers[operand] for operand in instruction.operands]
+            if opcode == RuleOpcode.LOAD_INDICATOR:
+                registers[instruction.target] = indicator_masks[instruction.argument]
+            elif opcode == RuleOpcode.LOAD_CONSTANT:
+                registers[instruction.target] = instruction.argument
+            elif opcode == RuleOpcode.LOAD_SIGNALS:
+                registers[instruction.target] = subtree_signals[instruction.argument]
+            elif opcode == RuleOpcode.SHIFT:
+                registers[instruction.target] = RuleExecutor._shift(operands[0], active_bars)
+            elif opcode == RuleOpcode.COMPARE:
+                RuleExecutor._compare(instruction.argument, operands, comparison, active_bars)
+                registers[instruction.target].pack(comparison)
+            elif opcode == RuleOpcode.AND:
+                np.bitwise_and(
+                    operands[0].words, operands[1].words, out=registers[instruction.target].words
+                )
+            elif opcode == RuleOpcode.OR:
+                np.bitwise_or(
+                    operands[0].words, operands[1].words, out=registers[instruction.target].words
+                )
+            elif opcode == RuleOpcode.BRANCH_IF_EMPTY:
+                signal_count = operands[0].count()
+                if signal_count == 0:
+                    skipped_rules += instruction.argument.skipped_rules
+                    position = instruction.argument.target
+                elif signal_count <= bars * RuleExecutor.SUBSET_DENSITY:
+                    active_bars = operands[0].positions()
+            elif opcode == RuleOpcode.STORE:
+                signals[instruction.argument] = operands[0]
+                active_bars = None
+            elif opcode == RuleOpcode.CACHE and active_bars is None:
+                subtree_signals[instruction.argument] = SignalBitset(operands[0].words.copy(), bars)
+        logger.debug("Executed %s over %s bars", program, bars)
+        logger.info(
+            "Evaluated %s of %s rules, skipping %s rules after an empty AND",
+            program.rules - skipped_rules,
+            program.rules,
+            skipped_rules
+        )
+        return signals
+
+    @staticmethod
+    def _compare(
+            comparison_method: RuleComparisonMethod,
+            operands: List[Any],
+            out: np.ndarray,
+            active_bars: Optional[np.ndarray]
+    ) -> None:
+        """
+        Compares two operands, on every bar or only on the active bars.
+        :param comparison_method: IS_ABOVE or IS_BELOW.
+        :param operands: float64 masks or constants to compare.
+        :param out: boolean buffer the comparison is written in.
+        :param active_bars: sorted indexes of the bars to compare on, every bar if None.
+        """
+        if active_bars is None:
+            RuleExecutor.COMPARISONS[comparison_method](*operands, out=out)
+            return
+        out.fill(False)
+        out[active_bars] = RuleExecutor.COMPARISONS[comparison_method](*(
+            operand[active_bars] if isinstance(operand, np.ndarray) else operand
+            for operand in operands
+        ))
+
+    @staticmethod
+    def _shift(
+            mask: np.ndarray,
+            active_bars: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """
+        Shifts a mask by one timestep, on every bar or only on the active bars.
+        :param mask: float64 mask.
+        :param active_bars: sorted indexes of the bars to shift, every bar if None.
+        :return: the mask at the previous timestep, NaN at the first timestep,
+         and undefined on the bars that are not active.
+        """
+        previous_mask = np.empty_like(mask, dtype=np.float64)
+        if active_bars is None:
+            previous_mask[:1] = np.nan
+            previous_mask[1:] = mask[:-1]
+            return previous_mask
+        previous_mask[active_bars] = mask[active_bars - 1]
+        if len(active_bars) > 0 and active_bars[0] == 0:
+            previous_mask[0] = np.nan
+        return previous_mask
@@ -0,0 +1,127 @@
+"""
+Rule Planner, ordering the group rules of an order type for short-circuit evaluation.
+"""
+import logging
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from backtester.domain.enums.rule_property_type import RulePropertyType
+from backtester.domain.signals.group_rule import GroupRule
+from backtester.domain.signals.signal_bitset import SignalBitset
+from backtester.domain.signals.tile import Tile
+
+logger = logging.getLogger(__name__)
+
+
+Operand = Tuple[Tile, bool]
+Comparison = Tuple[Operand, Operand]
+
+
+class GroupRulePlan(NamedTuple):
+    """
+    Group rule to plan, with the cost of evaluating it,
+     the canonical comparisons of each of its rules to compute,
+     and the cached signals of its other rules, or of the whole group rule.
+    """
+    group_rule: GroupRule
+    cost: float
+    comparisons: List[List[Comparison]]
+    signals: List[SignalBitset]
+
+
+class RulePlanner:
+    """
+    Orders the group rules combined with AND in an order type,
+     so that the evaluation of an order type can stop as soon as its signals are empty,
+     and later group rules are evaluated on as few bars as possible.
+    The pass rate of every group rule is estimated on a strided sample of the bars,
+     and group rules are evaluated by increasing cost / (1 - pass rate),
+     cheap and selective group rules first.
+    """
+    SAMPLE_SIZE = 1024
+
+    @staticmethod
+    def order(
+            plans: List[GroupRulePlan],
+            indicator_masks: Dict[str, np.ndarray]
+    ) -> List[GroupRulePlan]:
+        """
+        Orders the group rules of an order type.
+        :param plans: group rules of the order type, with their costs and comparisons.
+        :param indicator_masks: float64 mask of every indicator, by tile ID.
+        :return: the plans, in order of evaluation.
+        """
+        bars = max((len(mask) for mask in indicator_masks.values()), default=0)
+        if len(plans) < 2 or bars < 2:
+            return plans
+        sample = np.unique(
+            np.linspace(1, bars - 1, min(RulePlanner.SAMPLE_SIZE, bars - 1)).astype(np.int64)
+        )
+        ranks = {
+            id(plan): RulePlanner._get_rank(plan, sample, indicator_masks)
+            for plan in plans
+        }
+        ordered_plans = sorted(plans, key=lambda plan: ranks[id(plan)])
+        logger.debug(
+            "Ordered group rules %s by rank %s",
+            [plan.group_rule.group_rule_id for plan in ordered_plans],
+            [ranks[id(plan)] for plan in ordered_plans]
+        )
+        return ordered_plans
+
+    @staticmethod
+    def _get_rank(
+            plan: GroupRulePlan,
+            sample: np.ndarray,
+            indicator_masks: Dict[str, np.ndarray]
+    ) -> float:
+        """
+        Gets the rank of a group rule, its cost per bar it rules out.
+        A group rule passing every sampled bar rules out none, and is evaluated last.
+        """
+        pass_rate = RulePlanner._get_pass_rate(plan, sample, indicator_masks)
+        if pass_rate >= 1:
+            return float('inf')
+        return plan.cost / (1 - pass_rate)
+
+    @staticmethod
+    def _get_pass_rate(
+            plan: GroupRulePlan,
+            sample: np.ndarray,
+            indicator_masks: Dict[str, np.ndarray]
+    ) -> float:
+        """
+        Estimates the share of the bars a group rule signals on,
+         by evaluating its rules on a sample of the bars.
+        :param plan: GroupRulePlan to estimate.
+        :param sample: sorted indexes of the sampled bars, all after the first bar.
+        :param indicator_masks: float64 mask of every indicator, by tile ID.
+        :return: the share of the sampled bars the group rule signals on.
+        """
+        group_passed = np.zeros(len(sample), dtype=bool)
+        for rule_comparisons in plan.comparisons:
+            rule_passed = np.ones(len(sample), dtype=bool)
+            for greater, lesser in rule_comparisons:
+                with np.errstate(invalid='ignore'):
+                    rule_passed &= RulePlanner._sample_operand(greater, sample, indicator_masks) > \
+                        RulePlanner._sample_operand(lesser, sample, indicator_masks)
+            group_passed |= rule_passed
+        for signals in plan.signals:
+            group_passed |= signals.take(sample)
+        return float(group_passed.mean())
+
+    @staticmethod
+    def _sample_operand(
+            operand: Operand,
+            sample: np.ndarray,
+            indicator_masks: Dict[str, np.ndarray]
+    ):
+        """
+        Gets the values of an operand at the sampled bars,
+         a shifted operand taking the values of the previous bars.
+        """
+        tile, shifted = operand
+        if tile.type != RulePropertyType.INDICATOR:
+            return tile.parameters.value
+        return indicator_masks[tile.id][sample - 1 if shifted else sample]
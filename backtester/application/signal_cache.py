@@ -0,0 +1,46 @@
+"""
+Signal Cache, reusing the signals of unchanged rules across requests.
+"""
+import logging
+from typing import Hashable, Tuple
+
+from backtester.application.byte_limited_cache import ByteLimitedCache
+from backtester.domain.signals.signal_bitset import SignalBitset
+
+logger = logging.getLogger(__name__)
+
+
+class SignalCache(ByteLimitedCache):
+    """
+    Least recently used cache of the signals of rules, group rules and order type rules,
+     bounded by the bytes of the bitsets it holds.
+    Signals are keyed on the content fingerprint of the price data they were computed on,
+     and on the structural key of their subtree,
+     so an edited trading system only recomputes the subtrees that changed,
+     and a trading system whose rules did not change computes no signals at all.
+    Cached bitsets are read-only and returned without a copy.
+    """
+
+    @staticmethod
+    def make_key(
+            fingerprint: str,
+            subtree_key: Hashable
+    ) -> Tuple[str, Hashable]:
+        """
+        Builds the key of the signals of a subtree.
+        :param fingerprint: fingerprint of the price data.
+        :param subtree_key: structural key of the rule, group rule or order type rule.
+        :return: the key of the signals.
+        """
+        return fingerprint, subtree_key
+
+    def put(self, key: Hashable, signals: SignalBitset) -> SignalBitset:
+        """
+        Caches the signals of a subtree, evicting the least recently used signals beyond the byte budget.
+        Signals larger than the whole budget are not cached.
+        :param key: key of the signals.
+        :param signals: signals to cache, made read-only.
+        :return: the read-only signals.
+        """
+        signals.words.setflags(write=False)
+        return super().put(key, signals)
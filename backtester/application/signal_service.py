@@ -2,21 +2,23 @@
 SignalService is responsible for managing and processing trading signals.
 """
 import logging
-from typing import Dict, List, Tuple, Union
+from typing import Dict, Hashable, List, Optional, Set
 
-import pandas as pd
+import numpy as np
 
 from backtester.api.requests.trading_system import TradingSystemRules
+from backtester.application.indicator_cache import IndicatorCache
 from backtester.application.indicator_service import IndicatorService
+from backtester.application.rule_compiler import RuleCompiler
+from backtester.application.rule_executor import RuleExecutor
+from backtester.application.signal_cache import SignalCache
 from backtester.domain.enums.order_type import OrderType
-from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
-from backtester.domain.enums.rule_property_type import RulePropertyType
-from backtester.domain.signals.group_rule import GroupRule
 from backtester.domain.signals.indicator_registry import IndicatorRegistry
-from backtester.domain.signals.order_type_rule import OrderTypeRule
 from backtester.domain.signals.rule import Rule
-from backtester.domain.signals.tile import Tile
+from backtester.domain.signals.signal_bitset import SignalBitset
+from backtester.domain.signals.signal_events import SignalEvents
 from backtester.domain.signals.trading_sustem_rule import TradingSystemRule
+from backtester.domain.ticker.bar_array import BarArray
 
 logger = logging.getLogger(__name__)
 
@@ -29,40 +31,62 @@ class SignalService:
     def __init__(
             self,
             indicator_service: IndicatorService,
-            indicator_registry: IndicatorRegistry
-
+            indicator_registry: IndicatorRegistry,
+            signal_cache: Optional[SignalCache] = None
     ):
         """
         Initializes the SignalService with an IndicatorClient.
+        :param signal_cache: if provided, the signals of rules, group rules and order type rules
+         are shared through the cache with every request on the same price data.
         """
         self.indicator_service = indicator_service
         self.indicator_registry = indicator_registry
-        self.price_columns = ['open', 'high', 'low', 'close']
+        self.signal_cache = signal_cache
 
-    @staticmethod
-    def _get_value_mask(tile: Tile) -> float:
+    def get_price_data(
+            self,
+            ticker_data: BarArray
+    ) -> Dict[str, np.ndarray]:
         """
-        Get the value mask for a tile of type VALUE.
-        :param tile: Tile object containing the value mask.
-        :return: The value mask as a float.
+        Gets the price columns indicators are computed on.
+        :param ticker_data: BarArray containing ticker data.
+        :return: float64 array of every price column.
         """
-        return tile.parameters.value
+        return ticker_data.price_data
+
+    def get_price_data_fingerprint(
+            self,
+            ticker_data: BarArray
+    ) -> str:
+        """
+        Gets the fingerprint of the price columns indicators are computed on.
+        Bars from the TickerService carry the fingerprint computed before they were shared,
+         other bars are fingerprinted without writing onto them, as they may be shared between requests.
+        :param ticker_data: BarArray containing ticker data.
+        :return: content fingerprint of the price data.
+        """
+        if ticker_data.price_data_fingerprint is not None:
+            return ticker_data.price_data_fingerprint
+        return IndicatorCache.fingerprint(self.get_price_data(ticker_data))
 
     def get_indicator_masks(
             self,
-            ticker_data: pd.DataFrame,
-            indicator_data: Dict
+            ticker_data: BarArray,
+            indicator_data: Dict,
+            price_data_fingerprint: Optional[str] = None
     ) -> Dict:
         """
         Calculate indicator masks for the given ticker data and indicator data.
-        :param ticker_data: pd.DataFrame containing ticker data.
+        :param ticker_data: BarArray containing ticker data.
         :param indicator_data: Dict containing indicator data.
+        :param price_data_fingerprint: fingerprint of the price data, if already computed.
         :return: A dictionary of masks for each indicator.
         """
         logger.debug("Calculating indicator masks for ticker data.")
         masks = self.indicator_service.compute_masks(
             indicators=indicator_data,
-            price_data={**ticker_data[self.price_columns].to_dict(orient='list')}
+            price_data=self.get_price_data(ticker_data),
+            price_data_fingerprint=price_data_fingerprint
         )
 
         logger.debug("Indicator masks calculated successfully.")
@@ -70,218 +94,119 @@ class SignalService:
 
     @staticmethod
     def assign_indicator_masks(
-            masks: Dict[str, List],
-            indicators: Dict[str, Tile]
+            masks: Dict[str, np.ndarray],
+            indicator_registry: IndicatorRegistry
     ) -> None:
         """
-        Assigns masks to indicators based on their tile IDs.
+        Assigns masks to indicators based on their tile IDs,
+         sharing each mask with every tile referencing the indicator.
         :param masks: Calculated masks for indicators
-        :param indicators: Dictionary of Tile objects representing indicators
+        :param indicator_registry: IndicatorRegistry holding the indicators
         """
-        for tile_id in masks.keys():
-            mask = masks.get(tile_id)
-            tile = indicators.get(tile_id)
-            tile.set_mask(mask)
+        for tile_id, mask in masks.items():
+            indicator_registry.set_mask(tile_id, mask)
         logger.debug("Indicator masks assigned to tiles successfully.")
 
-    @staticmethod
-    def _get_indicator_mask(
-            tile: Tile
-    ) -> pd.Series:
-        """
-        Get the mask for a tile of type INDICATOR.
-        :param tile: tile
-        :return: The mask.
-        """
-        return tile.mask
-
-    def _get_current_mask(
-            self,
-            tile: Tile
-    ) -> Union[pd.Series, float]:
-        """
-
-        :param tile: Tile object containing the mask.
-        :return: The mask for the tile, which can be a pandas Series or a float value.
-        """
-        if tile.type == RulePropertyType.INDICATOR:
-            logger.debug(
-                "Tile %s is of type INDICATOR,"
-                " retrieving its mask.", tile
-            )
-            return self._get_indicator_mask(tile)
-        logger.debug(
-            "Tile %s is of type VALUE,"
-            " retrieving its value mask.", tile
-        )
-        return self._get_value_mask(tile)
-
-    @staticmethod
-    def _get_previous_mask(
-            mask: pd.Series,
-            comparison_method: RuleComparisonMethod
-    ) -> Union[pd.Series, None]:
-        """
-        Get the mask at the previous timestep to compare it against the current timestep.
-        Applicable if the comparison method involves a cross.
-        :param mask: mask at the current timestep
-        :param comparison_method: Comparison method to determine if cross evaluation is needed.
-        :return: The previous filter data as a pandas Series
-         if comparison involves a cross; otherwise, None.
-        """
-        return mask.shift() if comparison_method.is_cross() else None
-
-    def _get_tile_mask(
-            self,
-            tile: Tile,
-            comparison_method: RuleComparisonMethod
-    ) -> Tuple[pd.Series, Union[pd.Series, None]]:
-        """
-        Get the mask for a tile, including the current and previous masks if applicable.
-        :param tile: Tile object containing the mask.
-        :param comparison_method: Comparison method to determine if cross evaluation is needed.
-        :return: A tuple containing the current mask and the previous mask (if applicable).
-        """
-        current_mask = self._get_current_mask(tile)
-        logger.debug(
-            "Current mask for tile %s: %s", tile, current_mask
-        )
-        previous_mask = self._get_previous_mask(current_mask, comparison_method)
-        logger.debug(
-            "Previous mask for tile %s: %s", tile, previous_mask
-        )
-        return current_mask, previous_mask
-
-    def _get_rule_mask(
-            self,
-            rule: Rule
-    ) -> None:
-        """
-        Get the mask for a rule by applying the comparison method to the first and second tiles.
-        :param rule: Rule object containing the first and second tiles.
-        """
-        first_tile_mask = self._get_tile_mask(
-            rule.first_tile,
-            rule.comparison_method
-        )
-        logger.debug(
-            "First tile mask for rule %s: %s", rule, first_tile_mask
-        )
-
-        second_tile_mask = self._get_tile_mask(
-            rule.second_tile,
-            rule.comparison_method
-        )
-        logger.debug(
-            "Second tile mask for rule %s: %s", rule, second_tile_mask
-        )
-
-        rule_signals_mask = rule.comparison_method.apply(
-            first_tile_mask,
-            second_tile_mask
-        )
-
-        rule.signals.outer_merge(rule_signals_mask)
-
-    def _get_group_rule_mask(
-            self,
-            group_rule: GroupRule
-    ) -> None:
-        """
-        Get the mask for a group rule by iterating through its rules and merging their signals.
-        :param group_rule: GroupRule object containing the rules.
-        """
-        for rule in group_rule.rules:
-            self._get_rule_mask(
-                rule
-            )
-            logger.debug(
-                "Merged signals for rule %s: %s",
-                rule,
-                rule.signals.signal_indexes
-            )
-            group_rule.signals.outer_merge(rule.signals.signal_indexes)
-
-    def _get_order_type_rule_mask(
-            self,
-            order_type_rule: OrderTypeRule
-    ) -> None:
-        """
-        Get the mask for an order type rule
-        by iterating through its group rules and merging their signals.
-        :param order_type_rule: OrderTypeRule object containing the group rules.
-        """
-        for group_rule in order_type_rule.group_rules:
-            self._get_group_rule_mask(
-                group_rule=group_rule
-            )
-            logger.debug(
-                "Merged signals for group rule %s: %s",
-                group_rule,
-                group_rule.signals.signal_indexes
-            )
-            order_type_rule.signals.inner_merge(
-                group_rule.signals.signal_indexes
-            )
-
-    def get_trading_system_rule_mask(
+    def get_signal_events(
             self,
-            ticker_data: pd.DataFrame,
+            ticker_data: BarArray,
             trading_system_rule: TradingSystemRule
-    ) -> pd.DataFrame:
-        """
-        Get the mask for a trading system rule
-        by applying the order type rules to the ticker data.
-        :param ticker_data: pd.DataFrame containing ticker data.
+    ) -> Dict[OrderType, SignalEvents]:
+        """
+        Get the signals of a trading system rule as sparse events,
+        by compiling its rules to a program planned on the indicator masks, and executing it.
+        The indicators the program reads are calculated if they are not yet.
+        With a signal cache, cached subtrees are loaded instead of computed, along with their indicators,
+         and the signals of the other subtrees are cached.
+        Bars without a date never signal, and a sell signal overrides a buy signal on the same bar.
+        :param ticker_data: BarArray containing ticker data.
         :param trading_system_rule: TradingSystemRule object containing the order type rules.
-        """
-        self._get_order_type_rule_mask(
-            order_type_rule=trading_system_rule.buy_rules
-        )
-        logger.debug(
-            "Buy rules signals: %s",
-            trading_system_rule.buy_rules
+        :return: the signal events of the buy and sell order types.
+        """
+        price_data_fingerprint = None
+        if self.signal_cache is not None or self.indicator_service.indicator_cache is not None:
+            price_data_fingerprint = self.get_price_data_fingerprint(ticker_data)
+        subtree_signals: Optional[Dict[Hashable, SignalBitset]] = None
+        if self.signal_cache is not None:
+            subtree_signals = self._get_cached_signals(trading_system_rule, price_data_fingerprint)
+        cached_keys = set(subtree_signals or ())
+
+        indicator_ids = RuleCompiler.get_indicator_ids(trading_system_rule, subtree_signals)
+        self.calculate_indicators(
+            ticker_data=ticker_data,
+            indicator_ids={
+                tile_id for tile_id in indicator_ids
+                if len(self.indicator_registry.indicators[tile_id].mask) != len(ticker_data)
+            },
+            price_data_fingerprint=price_data_fingerprint
         )
-        self._get_order_type_rule_mask(
-            order_type_rule=trading_system_rule.sell_rules
+        indicator_masks = {
+            tile_id: self.indicator_registry.indicators[tile_id].mask
+            for tile_id in indicator_ids
+        }
+        program = RuleCompiler.compile(
+            trading_system_rule,
+            indicator_masks=indicator_masks,
+            cached_signals=subtree_signals
         )
-        logger.debug(
-            "Sell rules signals: %s",
-            trading_system_rule.sell_rules
+        signals = RuleExecutor.execute(
+            program=program,
+            indicator_masks=indicator_masks,
+            bars=len(ticker_data),
+            subtree_signals=subtree_signals
         )
+        if self.signal_cache is not None:
+            for key, subtree_signal in subtree_signals.items():
+                if key not in cached_keys:
+                    self.signal_cache.put(self.signal_cache.make_key(price_data_fingerprint, key), subtree_signal)
+            logger.info(
+                "Loaded %s cached subtrees, cached %s computed subtrees",
+                len(cached_keys),
+                len(subtree_signals) - len(cached_keys)
+            )
+        valid_dates = SignalBitset.from_mask(ticker_data.dates.is_valid())
+        signal_events = {
+            order_type: SignalEvents.from_bitset(
+                signals.get(order_type, SignalBitset.zeros(len(ticker_data))) & valid_dates
+            )
+            for order_type in (OrderType.BUY, OrderType.SELL)
+        }
+        signal_events[OrderType.BUY] -= signal_events[OrderType.SELL]
+        logger.debug("Signal events: %s", signal_events)
+        return signal_events
 
-        if len(trading_system_rule.buy_rules) > 0:
-            ticker_data.loc[
-                trading_system_rule.buy_rules.signals.signal_indexes,
-                'signal'] = OrderType.BUY
-
-        if len(trading_system_rule.sell_rules) > 0:
-            ticker_data.loc[
-                trading_system_rule.sell_rules.signals.signal_indexes,
-                'signal'] = OrderType.SELL
-
-        ticker_data['signal'] = ticker_data['signal'].fillna(OrderType.NO_ACTION)
+    @staticmethod
+    def assign_signals(
+            ticker_data: BarArray,
+            signal_events: Dict[OrderType, SignalEvents]
+    ) -> BarArray:
+        """
+        Writes the signal events to the signal column of new bars, sharing the other columns of the ticker data.
+        :param ticker_data: BarArray containing ticker data.
+        :param signal_events: the signal events of the buy and sell order types.
+        :return: BarArray with the signals applied to the ticker data.
+        """
+        signal = np.full(len(ticker_data), OrderType.NO_ACTION.code, dtype=np.int8)
+        for order_type, events in signal_events.items():
+            signal[events.positions()] = order_type.code
+        ticker_data = ticker_data.with_signals(signal)
         logger.debug(
             "Final ticker data with signals: %s",
-            ticker_data[['signal']]
+            signal_events
         )
         return ticker_data
 
     def process_trading_system_rules(
             self,
-            ticker_data: pd.DataFrame,
             trading_system_rules: TradingSystemRules,
     ) -> TradingSystemRule:
         """
-        Processes the trading system rules to
-         generate signals based on the provided ticker data.
-        :param ticker_data: pd.DataFrame containing ticker data.
+        Processes the trading system rules,
+         registering the indicators they reference.
         :param trading_system_rules: TradingSystemRules containing the rules for the trading system.
-        :return: TradingSystemRule instance containing the generated signals.
+        :return: TradingSystemRule instance containing the rules.
         """
-        base_signal_indexes = ticker_data['date'].isnull()
         trading_system_signals = self._init_trading_system_signals(
-            signal_indexes=base_signal_indexes,
             trading_system_rules=trading_system_rules,
             indicator_registry=self.indicator_registry
         )
@@ -289,59 +214,73 @@ class SignalService:
 
     def calculate_indicators(
             self,
-            ticker_data: pd.DataFrame,
+            ticker_data: BarArray,
+            indicator_ids: Optional[Set[str]] = None,
+            price_data_fingerprint: Optional[str] = None
     ) -> None:
         """
         Calculates indicators for the given ticker data
          and assigns them to the indicator registry.
-        :param ticker_data: pd.DataFrame containing ticker data.
-        """
+        :param ticker_data: BarArray containing ticker data.
+        :param indicator_ids: tile IDs of the indicators to calculate, every registered indicator if None.
+        :param price_data_fingerprint: fingerprint of the price data, if already computed.
+        """
+        if indicator_ids is None:
+            indicator_ids = set(self.indicator_registry.indicators)
+        if not indicator_ids:
+            return
         logger.debug("Calculating indicators for ticker data")
         masks = self.get_indicator_masks(
             ticker_data=ticker_data,
-            indicator_data=self.indicator_registry.indicator_data
+            indicator_data={
+                tile_id: indicator_data
+                for tile_id, indicator_data in self.indicator_registry.indicator_data.items()
+                if tile_id in indicator_ids
+            },
+            price_data_fingerprint=price_data_fingerprint
         )
         self.assign_indicator_masks(
             masks=masks,
-            indicators=self.indicator_registry.indicators
+            indicator_registry=self.indicator_registry
+        )
+        logger.info(
+            "Computed %s of %s distinct indicators for %s indicator tiles, saving %s computations",
+            len(indicator_ids),
+            len(self.indicator_registry.indicators),
+            self.indicator_registry.references,
+            self.indicator_registry.saved_computations
         )
 
-    def calculate_rules_mask(
+    def _get_cached_signals(
             self,
-            ticker_data: pd.DataFrame,
-            trading_system_rule: TradingSystemRule
-    ) -> pd.DataFrame:
+            trading_system_rule: TradingSystemRule,
+            price_data_fingerprint: str
+    ) -> Dict[Hashable, SignalBitset]:
         """
-        Calculates the mask for the trading system rule
-        :param ticker_data: pd.DataFrame containing ticker data.
-        :param trading_system_rule: TradingSystemRule instance containing the rules to apply.
-        :return: pd.DataFrame with the mask applied to the ticker data.
+        Gets the cached signals of the subtrees of a trading system rule.
+        :param trading_system_rule: TradingSystemRule object containing the order type rules.
+        :param price_data_fingerprint: fingerprint of the price data.
+        :return: the cached signals, by structural key of their subtree.
         """
-        logger.debug(
-            "Calculating rules mask for trading system rule %s",
-            trading_system_rule
-        )
-        ticker_data = self.get_trading_system_rule_mask(
-            ticker_data=ticker_data,
-            trading_system_rule=trading_system_rule
-        )
-        return ticker_data
+        cached_signals = {}
+        for key in RuleCompiler.get_subtree_keys(trading_system_rule):
+            signals = self.signal_cache.get(self.signal_cache.make_key(price_data_fingerprint, key))
+            if signals is not None:
+                cached_signals[key] = signals
+        return cached_signals
 
     @staticmethod
     def _init_trading_system_signals(
-            signal_indexes: pd.Series,
             trading_system_rules: TradingSystemRules,
             indicator_registry: IndicatorRegistry
     ) -> TradingSystemRule:
         """
         Initializes a TradingSystemRule instance with the provided parameters.
-        :param signal_indexes: pd.Series with signal indexes,
         :param trading_system_rules: TradingSystemRules,
         :param indicator_registry: IndicatorRegistry instance to manage indicators.
         :return: TradingSystemRule instance initialized with the provided parameters.
         """
         return TradingSystemRule(
-            signal_indexes=signal_indexes,
             trading_system_rules=trading_system_rules,
             indicator_registry=indicator_registry
         )
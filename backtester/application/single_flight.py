@@ -0,0 +1,74 @@
+"""
+Single Flight, coalescing concurrent identical calls into one.
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+    Callers arriving while the call of their key is in flight wait for it,
+     and share its result, or its error, instead of running their own.
+    Results are shared without a copy, so they must not be modified.
+    """
+
+    def __init__(self):
+        """
+        Initializes a SingleFlight without calls in flight.
+        """
+        self.executions = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Runs a call, or waits for the call of the same key already in flight.
+        :param key: key of the call, identical calls having equal keys.
+        :param function: the call, run without arguments.
+        :return: the result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_waiter = call is not None
+            if is_waiter:
+                self.coalesced += 1
+            else:
+                call = self._calls[key] = Future()
+                self.executions += 1
+        if is_waiter:
+            logger.debug("Waiting for the call in flight of %s", key)
+            return call.result()
+
+        try:
+            call.set_result(function())
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return call.result()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the calls, and the number of calls in flight.
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the SingleFlight instance.
+        """
+        return f"SingleFlight(executions={self.executions}, coalesced={self.coalesced})"
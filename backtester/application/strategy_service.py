@@ -3,11 +3,18 @@ This module provides the StrategyService class
 """
 import logging
 
+import numpy as np
+
 from backtester.api.exceptions.strategy_exceptions import InvalidTradeResultType
 from backtester.api.requests.portfolio_management import PortfolioManagement
+from backtester.application.vectorized_trade_engine import PortfolioPath, SimulatedTrades
+from backtester.domain.enums.trade_detail import TradeDetail
 from backtester.domain.enums.trade_result import TradeResult
+from backtester.domain.enums.trading_period_result import TradingPeriodResult
 from backtester.domain.strategy.strategy import Strategy
 from backtester.domain.strategy.trade import Trade
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.domain.ticker.bar_dates import BarDates
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +32,20 @@ class StrategyService:
     @staticmethod
     def init_strategy(
             portfolio_management: PortfolioManagement,
+            bar_dates: BarDates,
+            trade_detail: TradeDetail = TradeDetail.TRADES
     ) -> Strategy:
         """
         Initializes a Strategy instance.
         :param portfolio_management: Portfolio object containing trade size and targets
+        :param bar_dates: dates of the bars the strategy is backtested on
+        :param trade_detail: level of trade detail kept for the strategy
         :return: Strategy instance
         """
         return Strategy(
             portfolio_management=portfolio_management,
+            bar_dates=bar_dates,
+            trade_detail=trade_detail
         )
 
     def process_trade_results(
@@ -63,6 +76,93 @@ class StrategyService:
         strategy.set_current_amount(trade.current_portfolio_amount)
         strategy.add_trade_object(trade)
 
+    @staticmethod
+    def process_simulated_trades(
+            strategy: Strategy,
+            ticker_data: BarArray,
+            simulated_trades: SimulatedTrades,
+            portfolio_path: PortfolioPath
+    ) -> None:
+        """
+        Records the trades of the vectorized engine in the strategy's trade ledger,
+         and updates the strategy accordingly.
+        Trades whose result is undetermined are not recorded.
+        :param strategy: Strategy object to update with trade results
+        :param ticker_data: BarArray containing the ticker data the trades were simulated on
+        :param simulated_trades: trades simulated by the vectorized engine
+        :param portfolio_path: portfolio amounts of the simulated trades
+        """
+        actionable = portfolio_path.actionable
+        entry_index = simulated_trades.entry_index[actionable]
+        exit_index = simulated_trades.exit_index[actionable]
+        entry_amount = portfolio_path.entry_amount[actionable]
+        current_amount = portfolio_path.current_amount[actionable]
+        trade_result = np.where(
+            current_amount > entry_amount,
+            TradeResult.WIN.code,
+            TradeResult.LOSS.code
+        )
+        strategy.ledger.extend(
+            order_type=simulated_trades.order_type[actionable],
+            entry_index=entry_index,
+            exit_index=exit_index,
+            trading_periods=exit_index - entry_index + 1,
+            entry_price=ticker_data['open'][entry_index],
+            exit_close=ticker_data['close'][exit_index],
+            exit_high=ticker_data['high'][exit_index],
+            exit_low=ticker_data['low'][exit_index],
+            trade_returns=simulated_trades.trade_returns[actionable],
+            exit_reason=simulated_trades.exit_reason[actionable],
+            trade_result=trade_result,
+            starting_portfolio_amount=portfolio_path.starting_portfolio_amount[actionable],
+            entry_amount=entry_amount,
+            current_amount=current_amount,
+            current_portfolio_amount=portfolio_path.current_portfolio_amount[actionable],
+        )
+        if simulated_trades.period_returns is not None:
+            StrategyService._process_simulated_trading_periods(
+                strategy=strategy,
+                simulated_trades=simulated_trades,
+                actionable=actionable
+            )
+        wins = int(np.count_nonzero(trade_result == TradeResult.WIN.code))
+        strategy.add_trade_results(
+            wins=wins,
+            losses=len(trade_result) - wins
+        )
+        if len(trade_result) > 0:
+            strategy.set_current_amount(float(portfolio_path.current_portfolio_amount[actionable][-1]))
+        logger.debug(
+            "Processed %s simulated trades for strategy %s",
+            len(trade_result),
+            strategy
+        )
+
+    @staticmethod
+    def _process_simulated_trading_periods(
+            strategy: Strategy,
+            simulated_trades: SimulatedTrades,
+            actionable: np.ndarray
+    ) -> None:
+        """
+        Records the trading periods of the actionable simulated trades in the strategy's trade ledger.
+        :param strategy: Strategy object whose ledger records the trading periods
+        :param simulated_trades: trades simulated by the vectorized engine, with their trading periods
+        :param actionable: mask of the simulated trades recorded in the ledger
+        """
+        for trade_index in np.flatnonzero(actionable):
+            period_returns = simulated_trades.period_returns[trade_index]
+            period_result = np.full(
+                len(period_returns),
+                TradingPeriodResult.CONTINUE_TRADE.code,
+                dtype=np.int8
+            )
+            period_result[-1] = simulated_trades.exit_reason[trade_index]
+            strategy.ledger.extend_trading_periods(
+                period_returns=period_returns,
+                period_result=period_result
+            )
+
     @staticmethod
     def _is_actionable_trade(
             trade: Trade
@@ -0,0 +1,63 @@
+"""
+Sweep Executor, a warm process pool backtesting parameter sweeps.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from backtester.application.sweep_worker import init_sweep_worker
+
+logger = logging.getLogger(__name__)
+
+
+class SweepExecutor:
+    """
+    Holds a process pool whose workers have TA-Lib and the indicators preloaded.
+    The pool is started on first use and kept for the lifetime of the application,
+    so sweeps after the first one do not pay for starting workers.
+    """
+
+    def __init__(self, workers: int, start_method: str = "spawn"):
+        """
+        Initializes the SweepExecutor.
+        :param workers: number of worker processes.
+        :param start_method: multiprocessing start method of the workers.
+        """
+        self.workers = workers
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, function: Callable, *args: Any) -> Future:
+        """
+        Submits a function to the pool, starting the pool if needed.
+        :param function: module-level function run by a worker.
+        :param args: arguments of the function.
+        :return: Future of the function's result.
+        """
+        with self._lock:
+            if self._executor is None:
+                logger.info("Starting sweep pool with %s workers", self.workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=init_sweep_worker
+                )
+            return self._executor.submit(function, *args)
+
+    def shutdown(self) -> None:
+        """
+        Shuts the pool down, waiting for the submitted functions.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the SweepExecutor instance.
+        """
+        return f"SweepExecutor(workers={self.workers}, started={self._executor is not None})"
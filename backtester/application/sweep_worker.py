@@ -0,0 +1,124 @@
+"""
+Sweep Worker, backtesting chunks of parameter sweep combinations inside a worker process.
+Functions of this module run in the worker processes of the SweepExecutor.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import talib
+from fastapi import HTTPException
+
+from backtester.api.exceptions.sweep_exceptions import SweepCombinationError
+from backtester.api.requests.backtesting_request import BacktestingRequest
+from backtester.app.config import get_settings
+from backtester.application.backtester import Backtester
+from backtester.application.indicator_cache import IndicatorCache
+from backtester.application.indicator_service import IndicatorService
+from backtester.application.indicator_validator_service import IndicatorValidatorService
+from backtester.application.signal_cache import SignalCache
+from backtester.application.signal_service import SignalService
+from backtester.application.strategy_service import StrategyService
+from backtester.application.trade_service import TradeService
+from backtester.application.vectorized_trade_engine import VectorizedTradeEngine
+from backtester.domain.indicators.indicator import Indicator
+from backtester.domain.signals.indicator_registry import IndicatorRegistry
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.infrastructure.shared_bar_array import SharedBarArray, SharedBarArrayHandle
+
+logger = logging.getLogger(__name__)
+
+SweepCombination = Tuple[int, Dict[str, int], BacktestingRequest]
+
+_dataset_key: Optional[str] = None
+_ticker_data: Optional[BarArray] = None
+_settings = get_settings()
+# The cache budgets are shared by the workers, so the caches of the pool stay within them
+_indicator_cache = IndicatorCache(max_bytes=_settings.indicator_cache_max_bytes // _settings.sweep_workers)
+_signal_cache = SignalCache(max_bytes=_settings.signal_cache_max_bytes // _settings.sweep_workers)
+
+
+def init_sweep_worker() -> None:
+    """
+    Warms up a worker process.
+    TA-Lib and the indicator registry are loaded when this module is imported,
+    so a first call to TA-Lib is enough to have them ready before the first chunk.
+    """
+    talib.SMA(np.arange(2, dtype=np.float64), timeperiod=2)
+    logger.debug("Sweep worker ready with %s indicators", len(Indicator.registry))
+
+
+def run_sweep_chunk(
+        dataset: SharedBarArrayHandle,
+        combinations: List[SweepCombination]
+) -> List[Dict[str, Any]]:
+    """
+    Backtests a chunk of combinations of a parameter sweep.
+    Indicator masks and rule signals are kept in the worker's IndicatorCache and SignalCache,
+    so combinations sharing an indicator or a rule compute it once per worker.
+    :param dataset: handle of the shared ticker data of the sweep, loaded once per worker.
+    :param combinations: index, swept parameters and backtesting request of each combination.
+    :return: a result per combination, holding either its data or its error,
+     so a failed combination does not fail the other combinations of the chunk.
+    """
+    ticker_data = _get_ticker_data(dataset)
+    results = []
+    for combination, parameters, backtesting_request in combinations:
+        result: Dict[str, Any] = {'combination': combination, 'parameters': parameters}
+        try:
+            result['data'] = _init_backtester().backtest_ticker_data(
+                ticker_data=ticker_data,
+                backtesting_request=backtesting_request
+            ).dict()
+        except HTTPException as error:
+            logger.error("Sweep combination %s failed with %s", combination, error.detail)
+            result['error'] = error.detail
+        except Exception:  # pylint: disable=broad-except
+            logger.error("Sweep combination %s failed", combination, exc_info=True)
+            result['error'] = SweepCombinationError(combination).detail
+        results.append(result)
+    logger.debug(
+        "Sweep chunk of %s combinations done, indicator cache %s, signal cache %s",
+        len(combinations),
+        _indicator_cache.stats,
+        _signal_cache.stats
+    )
+    return results
+
+
+def _get_ticker_data(dataset: SharedBarArrayHandle) -> BarArray:
+    """
+    Gets the ticker data of a sweep, loading it from shared memory on the first chunk of the sweep the worker runs,
+     so the ticker data crosses to a worker once per sweep, and the caches of the worker see the same arrays
+     for every chunk of the sweep.
+    :param dataset: handle of the shared ticker data of the sweep.
+    :return: The BarArray containing processed ticker data.
+    """
+    global _dataset_key, _ticker_data  # pylint: disable=global-statement
+    if dataset.name != _dataset_key:
+        _ticker_data = SharedBarArray.load(dataset)
+        _dataset_key = dataset.name
+    return _ticker_data
+
+
+def _init_backtester() -> Backtester:
+    """
+    Initializes a Backtester for a single combination, sharing the worker's caches.
+    The ticker data of the combination is received by the worker, so the Backtester has no TickerService.
+    """
+    indicator_service = IndicatorService(
+        indicator_validator_service=IndicatorValidatorService(),
+        registry=Indicator.registry,
+        indicator_cache=_indicator_cache
+    )
+    return Backtester(
+        ticker_service=None,
+        signal_service=SignalService(
+            indicator_service=indicator_service,
+            indicator_registry=IndicatorRegistry(),
+            signal_cache=_signal_cache
+        ),
+        strategy_service=StrategyService(),
+        trade_service=TradeService(),
+        vectorized_trade_engine=VectorizedTradeEngine()
+    )
@@ -0,0 +1,48 @@
+"""
+Ticker Data Cache, reusing the processed ticker data of identical requests.
+"""
+import logging
+from datetime import date, datetime
+from typing import Hashable, Optional, Tuple, Union
+
+from backtester.api.requests.ticker_request import TickerRequest
+from backtester.application.byte_limited_cache import ByteLimitedCache
+from backtester.domain.ticker.bar_array import BarArray
+
+logger = logging.getLogger(__name__)
+
+
+class TickerDataCache(ByteLimitedCache):
+    """
+    Least recently used cache of the processed bars of ticker requests,
+     bounded by the bytes of their columns.
+    Bars are keyed on the ticker, interval and range of their request,
+     so a repeated request gets the bars of the previous one without fetching or processing anything.
+    Cached bars are read-only and returned without a copy, each backtest overlaying them with its own signals.
+    """
+
+    @staticmethod
+    def make_key(
+            ticker_request: TickerRequest
+    ) -> Tuple[str, str, Optional[Union[date, datetime]], Optional[Union[date, datetime]]]:
+        """
+        Builds the key of the bars of a request.
+        :param ticker_request: request containing ticker, start date, end date, and interval.
+        :return: the key of the bars.
+        """
+        return (
+            ticker_request.ticker,
+            ticker_request.interval.value,
+            ticker_request.start_date,
+            ticker_request.end_date
+        )
+
+    def put(self, key: Hashable, ticker_data: BarArray) -> BarArray:
+        """
+        Caches the bars of a request, evicting the least recently used bars beyond the byte budget.
+        Bars larger than the whole budget are not cached.
+        :param key: key of the bars.
+        :param ticker_data: processed bars, made read-only.
+        :return: the read-only bars.
+        """
+        return super().put(key, ticker_data.freeze())
@@ -1,64 +1,144 @@
 """
 Ticker Data Processor
 """
+from typing import Dict, Tuple
+
 import numpy as np
 import pandas as pd
 
+from backtester.domain.strategy.breach_index import BreachIndex
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.domain.ticker.bar_dates import BarDates
+
 
 class TickerDataProcessor:
     """
     A class to process ticker data for trading strategies.
     """
+    # Returns columns depending on the close of the previous bar
+    PREVIOUS_CLOSE_COLUMNS = ('returns_on_close', 'returns_on_high', 'returns_on_low')
 
     @staticmethod
-    def add_helper_columns(df: pd.DataFrame) -> pd.DataFrame:
+    def to_bar_array(df: pd.DataFrame, previous_close: float = np.nan) -> BarArray:
         """
-        Add helper columns to the DataFrame.
+        Converts the price data of a provider to bars, with their helper columns and without signals.
+        :param df: dataframe with the date, open, high, low and close of every bar.
+        :param previous_close: close of the bar before the first one, if the price data continues other bars.
+        :return: BarArray of the price data.
         """
-        df['previous_close'] = df['close'].shift(1)
-
-        # Calculate returns from same day's open, to be used for first trading period
-        df['returns_on_close_same_day'] = (
-                (df['close'] - df['open']) / df['open']
-        ).astype(float)
-        # Calculate returns from previous day's close for the rest of the trading periods
-        df['returns_on_close'] = (
-                (df['close'] - df['previous_close']) / df['previous_close']
-        ).astype(float)
-        # Calculate returns for current trading period's high and low to identify hitting TP or SL
-        # during the first trading period
-        df['returns_on_high_same_day'] = (
-                (df['high'] - df['open']) / df['open']
-        ).astype(float)
-        df['returns_on_low_same_day'] = (
-                (df['low'] - df['open']) / df['open']
-        ).astype(float)
+        columns = TickerDataProcessor.add_helper_columns({
+            column: df[column].to_numpy(dtype=np.float64)
+            for column in BarArray.PRICE_COLUMNS
+        }, previous_close=previous_close)
+        return BarArray(dates=BarDates.from_series(df['date']), columns=columns)
 
-        # Calculate returns from previous day's high and low to identify hitting TP or SL
-        df['returns_on_high'] = (
-                (df['high'] - df['previous_close']) / df['previous_close']
-        ).astype(float)
-
-        df['returns_on_low'] = (
-                (df['low'] - df['previous_close']) / df['previous_close']
-        ).astype(float)
-
-        df = df.drop(['previous_close'], axis=1)
+    @staticmethod
+    def add_helper_columns(
+            columns: Dict[str, np.ndarray],
+            previous_close: float = np.nan
+    ) -> Dict[str, np.ndarray]:
+        """
+        Add the returns helper columns to the price columns.
+        The returns of a bar only depend on its prices and on the close of the previous bar,
+         so the bars appended to a series are processed alone, given the close of the last bar of the series.
+        :param columns: float64 open, high, low and close columns.
+        :param previous_close: close of the bar before the first one, missing for the first bar of a series.
+        :return: the price and returns columns, with missing and infinite values replaced by 0.
+        """
+        open_, high, low, close = (columns[column] for column in BarArray.PRICE_COLUMNS)
+        previous_close = np.concatenate(([previous_close], close[:-1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = {
+                # Calculate returns from same day's open, to be used for first trading period
+                'returns_on_close_same_day': (close - open_) / open_,
+                # Calculate returns from previous day's close for the rest of the trading periods
+                'returns_on_close': (close - previous_close) / previous_close,
+                # Calculate returns for current trading period's high and low to identify hitting TP or SL
+                # during the first trading period
+                'returns_on_high_same_day': (high - open_) / open_,
+                'returns_on_low_same_day': (low - open_) / open_,
+                # Calculate returns from previous day's high and low to identify hitting TP or SL
+                'returns_on_high': (high - previous_close) / previous_close,
+                'returns_on_low': (low - previous_close) / previous_close,
+            }
+        return {
+            column: TickerDataProcessor._replace_non_finite_values(values)
+            for column, values in {**columns, **returns}.items()
+        }
 
-        df = df.replace({np.nan: 0, np.inf: 0})
+    @staticmethod
+    def _replace_non_finite_values(values: np.ndarray) -> np.ndarray:
+        """
+        Replaces the missing and positive infinite values of a column by 0.
+        A column without any is returned as is, so it keeps sharing the memory of the fetched data.
+        """
+        replaced = np.isnan(values) | (values == np.inf)
+        if not replaced.any():
+            return values
+        return np.where(replaced, 0.0, values)
 
-        df['signal'] = None
+    @staticmethod
+    def slice_bars(bars: BarArray, first: int, last: int) -> BarArray:
+        """
+        Gets the bars of a range of a series, processed as if the series started at the range.
+        Columns are shared with the series,
+         but those depending on the previous close, whose first bar has no previous close in the range.
+        :param bars: bars of the series.
+        :param first: index of the first bar of the range.
+        :param last: index past the last bar of the range.
+        :return: the bars of the range.
+        """
+        bars = bars.slice(first, last)
+        if first == 0 or not len(bars):
+            return bars
+        columns = {name: bars[name] for name in BarArray.COLUMNS}
+        for name in TickerDataProcessor.PREVIOUS_CLOSE_COLUMNS:
+            columns[name] = columns[name].copy()
+            columns[name][0] = 0.0
+        return BarArray(dates=bars.dates, columns=columns)
 
-        return df
+    @staticmethod
+    def get_revised_index(bars: BarArray, first: int, fetched_bars: BarArray) -> int:
+        """
+        Finds the first bar of a series revised by the provider, comparing its bars with the bars fetched again.
+        :param bars: bars of the series.
+        :param first: index of the bar of the series the fetched bars start at.
+        :param fetched_bars: bars fetched again from the first one, followed by the new bars.
+        :return: index of the first bar of the series whose date or prices changed,
+         or of the first new bar if none changed.
+        """
+        overlap = min(len(bars) - first, len(fetched_bars))
+        unchanged = bars.dates.values[first:first + overlap] == fetched_bars.dates.values[:overlap]
+        for column in BarArray.PRICE_COLUMNS:
+            unchanged &= bars[column][first:first + overlap] == fetched_bars[column][:overlap]
+        changed = np.flatnonzero(~unchanged)
+        return first + int(changed[0] if len(changed) else overlap)
 
     @staticmethod
-    def convert_date_to_isoformat(df: pd.DataFrame) -> pd.DataFrame:
+    def get_growth_columns(
+            bars: BarArray
+    ) -> Tuple[Tuple[np.ndarray, ...], Tuple[np.ndarray, ...]]:
         """
-        Convert date column in DataFrame to ISO format.
-        :param df: dataframe with date column to be converted
-        :return: dataframe with date column in ISO format
+        Convert the returns helper columns of the bars to growth factors.
+        :param bars: bars with helper columns
+        :return: close, high and low growth of first trading periods and of the following ones
         """
-        df['date'] = df['date'].apply(
-            lambda dt: dt.isoformat() if pd.notnull(dt) else None
+        first_growth = tuple(
+            1 + bars[column]
+            for column in ('returns_on_close_same_day', 'returns_on_high_same_day', 'returns_on_low_same_day')
         )
-        return df
+        growth = tuple(
+            1 + bars[column]
+            for column in ('returns_on_close', 'returns_on_high', 'returns_on_low')
+        )
+        return first_growth, growth
+
+    @staticmethod
+    def build_breach_index(bars: BarArray) -> BreachIndex:
+        """
+        Build the index used to find the first threshold hit of trades on the bars.
+        :param bars: bars with helper columns
+        :return: BreachIndex over the price path of the bars
+        """
+        first_growth, growth = TickerDataProcessor.get_growth_columns(bars)
+        return BreachIndex(first_growth=first_growth, growth=growth)
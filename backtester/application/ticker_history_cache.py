@@ -0,0 +1,52 @@
+"""
+Ticker History Cache, keeping the processed bars of ticker series across requests.
+"""
+import logging
+import threading
+import weakref
+from typing import Tuple
+
+from backtester.application.byte_limited_cache import ByteLimitedCache
+
+logger = logging.getLogger(__name__)
+
+
+class TickerHistoryCache(ByteLimitedCache):
+    """
+    Least recently used cache of the processed bars of ticker series, one TickerHistory per ticker and interval,
+     bounded by the bytes of their columns.
+    Intervals resampled from the history of their base interval hold ResampledBars instead.
+    A request within the covered range of a history is served from it without fetching,
+     and a request past it only fetches and processes the bars after the history.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initializes an empty cache.
+        :param max_bytes: maximum number of bytes of the cached histories, 0 disabling the cache.
+        """
+        super().__init__(max_bytes=max_bytes)
+        self._locks: "weakref.WeakValueDictionary[Tuple[str, str], threading.Lock]" = weakref.WeakValueDictionary()
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(ticker: str, interval: str) -> Tuple[str, str]:
+        """
+        Builds the key of the history of a series.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the key of the history.
+        """
+        return ticker, interval
+
+    def lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """
+        Gets the lock of the history of a series, so concurrent requests do not refresh it twice.
+        Locks are only kept while a request holds or waits for them, so series no longer requested leave no lock behind.
+        :param key: key of the history.
+        """
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
@@ -0,0 +1,148 @@
+"""
+Ticker Resampler
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+from backtester.application.ticker_data_processor import TickerDataProcessor
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.domain.ticker.bar_dates import NAT, BarDates
+from backtester.domain.ticker.resampled_bars import ResampledBars
+
+
+class TickerResampler:
+    """
+    A class to resample processed bars to a coarser interval, one bar per period of the interval.
+    A period takes the date and open of its first bar, the close of its last bar,
+     and the highest high and lowest low of its bars, reduced over every period at once.
+    Periods are aligned on the local time of the dates:
+     minutes and days are counted from the epoch, weeks start on Monday, and months and quarters on the first day.
+    Returns are computed again on the resampled prices.
+    """
+    MINUTE = 60 * 10 ** 9
+    DAY = 24 * 60 * MINUTE
+    PERIOD_NANOSECONDS = {
+        TickerInterval.TWO_MINUTES: 2 * MINUTE,
+        TickerInterval.FIVE_MINUTES: 5 * MINUTE,
+        TickerInterval.FIFTEEN_MINUTES: 15 * MINUTE,
+        TickerInterval.THIRTY_MINUTES: 30 * MINUTE,
+        TickerInterval.HOURLY: 60 * MINUTE,
+        TickerInterval.FIVE_DAYS: 5 * DAY,
+    }
+    PERIOD_MONTHS = {
+        TickerInterval.MONTHLY: 1,
+        TickerInterval.QUARTERLY: 3,
+    }
+
+    @staticmethod
+    def get_periods(dates: BarDates, interval: TickerInterval) -> np.ndarray:
+        """
+        Gets the period of the interval of every date.
+        :param dates: dates of the bars, every bar having a date.
+        :param interval: interval of the periods.
+        :return: int64 number of the period of every date, increasing with the dates.
+        """
+        local_values = dates.values if dates.timezone is None else dates.to_index().tz_localize(None).asi8
+        if interval in TickerResampler.PERIOD_NANOSECONDS:
+            return local_values // TickerResampler.PERIOD_NANOSECONDS[interval]
+        if interval is TickerInterval.WEEKLY:
+            # The epoch is a Thursday, three days after the start of its week
+            return (local_values // TickerResampler.DAY + 3) // 7
+        months = local_values.view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+        return months // TickerResampler.PERIOD_MONTHS[interval]
+
+    @staticmethod
+    def resample(bars: BarArray, interval: TickerInterval) -> Tuple[BarArray, np.ndarray]:
+        """
+        Resamples bars to a coarser interval.
+        Bars without a date are left out, and bars out of order are sorted by date.
+        :param bars: processed bars of the base interval of the interval.
+        :param interval: interval of the resampled bars.
+        :return: the resampled bars,
+         and the index of the first bar of every period followed by the number of bars.
+        """
+        if not bars.dates.is_sorted():
+            bars = TickerResampler._sort(bars)
+        periods = TickerResampler.get_periods(bars.dates, interval)
+        starts = np.concatenate((
+            np.zeros(1 if len(bars) else 0, dtype=np.int64),
+            np.flatnonzero(np.diff(periods)) + 1,
+            [len(bars)]
+        )).astype(np.int64)
+        dates, prices = TickerResampler._reduce(bars, starts)
+        resampled_bars = BarArray(
+            dates=BarDates(dates, bars.dates.timezone),
+            columns=TickerDataProcessor.add_helper_columns(prices)
+        )
+        return resampled_bars, starts
+
+    @staticmethod
+    def slice_bars(resampled_bars: ResampledBars, bars: BarArray, first: int, last: int) -> BarArray:
+        """
+        Gets the resampled bars of a range of the bars they were resampled from,
+         processed as if the bars started at the range.
+        Periods cut by the edges of the range only reduce their bars within the range,
+         the other periods being shared with the resampled bars.
+        :param resampled_bars: bars resampled from the bars.
+        :param bars: bars of the base interval, sorted by date.
+        :param first: index of the first bar of the range.
+        :param last: index past the last bar of the range.
+        :return: the resampled bars of the range.
+        """
+        starts = resampled_bars.starts
+        first_period = int(np.searchsorted(starts, first, side='right')) - 1
+        last_period = int(np.searchsorted(starts, last, side='left'))
+        if starts[first_period] == first and starts[last_period] == last:
+            return TickerDataProcessor.slice_bars(resampled_bars.bars, first_period, last_period)
+
+        range_starts = starts[first_period:last_period + 1].copy()
+        range_starts[0], range_starts[-1] = first, last
+        dates = resampled_bars.bars.dates.values[first_period:last_period].copy()
+        prices = {
+            column: resampled_bars.bars[column][first_period:last_period].copy()
+            for column in BarArray.PRICE_COLUMNS
+        }
+        for period in {0, len(dates) - 1}:
+            edge_dates, edge_prices = TickerResampler._reduce(bars, range_starts[period:period + 2])
+            dates[period] = edge_dates[0]
+            for column in BarArray.PRICE_COLUMNS:
+                prices[column][period] = edge_prices[column][0]
+        return BarArray(
+            dates=BarDates(dates, bars.dates.timezone),
+            columns=TickerDataProcessor.add_helper_columns(prices)
+        )
+
+    @staticmethod
+    def _reduce(bars: BarArray, starts: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Reduces the bars of consecutive periods to one bar per period.
+        :param bars: bars sorted by date.
+        :param starts: index of the first bar of every period, followed by the index past the last bar of the last period.
+        :return: the date and the open, high, low and close prices of every period.
+        """
+        first, last = starts[0], starts[-1]
+        period_starts = starts[:-1] - first
+        period_ends = starts[1:] - first - 1
+        columns = {column: bars[column][first:last] for column in BarArray.PRICE_COLUMNS}
+        if not len(period_starts):
+            return bars.dates.values[:0].copy(), {column: values.copy() for column, values in columns.items()}
+        return bars.dates.values[first:last][period_starts], {
+            'open': columns['open'][period_starts],
+            'high': np.maximum.reduceat(columns['high'], period_starts),
+            'low': np.minimum.reduceat(columns['low'], period_starts),
+            'close': columns['close'][period_ends],
+        }
+
+    @staticmethod
+    def _sort(bars: BarArray) -> BarArray:
+        """
+        Sorts the bars with a date by date, leaving out the bars without one.
+        """
+        order = np.flatnonzero(bars.dates.values != NAT)
+        order = order[np.argsort(bars.dates.values[order], kind='stable')]
+        return BarArray(
+            dates=BarDates(bars.dates.values[order], bars.dates.timezone),
+            columns={name: bars[name][order] for name in BarArray.COLUMNS}
+        )
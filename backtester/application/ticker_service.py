@@ -1,9 +1,26 @@
 """
 TickerService for fetching ticker data.
 """
+from datetime import date, datetime
+from typing import Dict, Hashable, List, Optional, Union
+
+from fastapi import HTTPException
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound, TickerProviderError
 from backtester.api.requests.ticker_request import TickerRequest
+from backtester.application.single_flight import SingleFlight
+from backtester.application.indicator_cache import IndicatorCache
+from backtester.application.ticker_data_cache import TickerDataCache
 from backtester.application.ticker_data_processor import TickerDataProcessor
-from backtester.infrastructure.ticker_provider import TickerProvider
+from backtester.application.ticker_history_cache import TickerHistoryCache
+from backtester.application.ticker_resampler import TickerResampler
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.domain.ticker.resampled_bars import ResampledBars
+from backtester.domain.ticker.ticker_history import TickerHistory
+from backtester.infrastructure.base_ticker_provider import BaseTickerProvider
+from backtester.infrastructure.bulk_ticker_fetcher import BulkTickerFetcher, TickerFetchResult
+import numpy as np
 import pandas as pd
 import logging
 
@@ -12,39 +29,346 @@ logger = logging.getLogger(__name__)
 
 class TickerService:
     """
-    Service for fetching ticker data using a TickerProvider.
+    Service for fetching ticker data using a ticker provider.
+    With a TickerHistoryCache, the processed bars of every series are kept across requests,
+     and a request ending after them only fetches and processes the new bars,
+     along with the last revision_bars bars, fetched again in case the provider revised them.
+    With a SingleFlight, concurrent requests for the same ticker, interval and range
+     wait for the one fetch in flight and share its read-only bars.
+    Intervals with a base interval are resampled from the bars of their base interval,
+     and, with a TickerHistoryCache, the resampled bars of every series are kept along with its history,
+     so every interval of a series is served from a single fetched history.
+    With a TickerDataCache, a repeated request gets the read-only bars of the previous one,
+     without fetching or processing anything.
+    With a BulkTickerFetcher, the tickers of a multi-ticker fetch missing from the TickerDataCache
+     are fetched concurrently, in batches if the provider fetches several tickers at once.
     """
 
-    def __init__(self, ticker_provider: TickerProvider):
+    def __init__(
+            self,
+            ticker_provider: BaseTickerProvider,
+            ticker_history_cache: Optional[TickerHistoryCache] = None,
+            revision_bars: int = 0,
+            single_flight: Optional[SingleFlight] = None,
+            ticker_data_cache: Optional[TickerDataCache] = None,
+            bulk_ticker_fetcher: Optional[BulkTickerFetcher] = None
+    ):
         self.ticker_provider = ticker_provider
+        self.ticker_history_cache = ticker_history_cache
+        self.revision_bars = revision_bars
+        self.single_flight = single_flight
+        self.ticker_data_cache = ticker_data_cache
+        self.bulk_ticker_fetcher = bulk_ticker_fetcher
 
-    def fetch_ticker_data(self, ticker_request: TickerRequest) -> pd.DataFrame:
+    def fetch_ticker_data(self, ticker_request: TickerRequest) -> BarArray:
         """
         Fetches ticker data based on the provided TickerRequest.
         :param ticker_request: request containing ticker, start date, end date, and interval
-        :return: dataframe with ticker data
+        :return: read-only bars of the ticker data, without signals
+        """
+        key = TickerDataCache.make_key(ticker_request)
+        if self.ticker_data_cache is not None:
+            ticker_data = self.ticker_data_cache.get(key)
+            if ticker_data is not None:
+                logger.debug("Serving %s from the ticker data cache", ticker_request)
+                return ticker_data
+        if self.single_flight is None:
+            return self._prepare_ticker_data(key, ticker_request)
+        return self.single_flight.run(key, lambda: self._prepare_ticker_data(key, ticker_request))
+
+    def fetch_tickers_data(
+            self,
+            tickers: List[str],
+            interval: TickerInterval,
+            start_date: Optional[Union[date, datetime]],
+            end_date: Optional[Union[date, datetime]]
+    ) -> Dict[str, TickerFetchResult]:
+        """
+        Fetches the ticker data of many tickers over a shared range.
+        Tickers missing from the TickerDataCache are fetched in bulk,
+         and processed like a ticker fetched without a TickerHistoryCache.
+        Without a BulkTickerFetcher, tickers are fetched one at a time.
+        A ticker failing to fetch does not fail the others.
+        :param tickers: ticker symbols, fetched once each.
+        :param interval: interval of the bars.
+        :param start_date: inclusive start date, shared by every ticker.
+        :param end_date: exclusive end date, shared by every ticker.
+        :return: the read-only bars or the error of every ticker, in the order of the tickers.
         """
-        df = self.ticker_provider.fetch(
-            ticker=ticker_request.ticker,
-            interval=ticker_request.interval.value,
-            start=ticker_request.start_date,
-            end=ticker_request.end_date
+        ticker_requests = {
+            ticker: TickerRequest(ticker=ticker, interval=interval, start_date=start_date, end_date=end_date)
+            for ticker in dict.fromkeys(tickers)
+        }
+        if self.bulk_ticker_fetcher is None:
+            return {
+                ticker: self._fetch_ticker_result(ticker_request)
+                for ticker, ticker_request in ticker_requests.items()
+            }
+
+        results: Dict[str, TickerFetchResult] = {}
+        if self.ticker_data_cache is not None:
+            for ticker, ticker_request in ticker_requests.items():
+                ticker_data = self.ticker_data_cache.get(TickerDataCache.make_key(ticker_request))
+                if ticker_data is not None:
+                    results[ticker] = TickerFetchResult(data=ticker_data)
+        missing_requests = [
+            ticker_request for ticker, ticker_request in ticker_requests.items() if ticker not in results
+        ]
+        if missing_requests:
+            fetched = self.bulk_ticker_fetcher.fetch(
+                tickers=[ticker_request.ticker for ticker_request in missing_requests],
+                interval=(interval.base_interval or interval).value,
+                start=missing_requests[0].start_date,
+                end=missing_requests[0].end_date
+            )
+            for ticker_request in missing_requests:
+                result = fetched[ticker_request.ticker]
+                if result.error is None:
+                    result = TickerFetchResult(data=self._cache_ticker_data(
+                        TickerDataCache.make_key(ticker_request),
+                        ticker_request,
+                        self._process_interval_data(result.data, interval)
+                    ))
+                results[ticker_request.ticker] = result
+        logger.info(
+            "Fetched the ticker data of %s tickers, %s of them from the provider",
+            len(ticker_requests),
+            len(missing_requests)
         )
-        df = self._process_ticker_data(df)
-        return df
+        return {ticker: results[ticker] for ticker in ticker_requests}
+
+    def _fetch_ticker_result(self, ticker_request: TickerRequest) -> TickerFetchResult:
+        """
+        Fetches the ticker data of a request, catching its error like the BulkTickerFetcher does.
+        :param ticker_request: request containing ticker, start date, end date, and interval
+        :return: the read-only bars of the ticker data, or the error of the fetch
+        """
+        try:
+            return TickerFetchResult(data=self.fetch_ticker_data(ticker_request))
+        except HTTPException as error:
+            return TickerFetchResult(error=error)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Fetching %s failed", ticker_request.ticker, exc_info=True)
+            return TickerFetchResult(error=TickerProviderError(ticker=ticker_request.ticker, reason=str(error)))
+
+    def _prepare_ticker_data(self, key: Hashable, ticker_request: TickerRequest) -> BarArray:
+        """
+        Fetches and processes the ticker data of a request, caching its read-only bars.
+        :param key: key of the bars of the request.
+        :param ticker_request: request containing ticker, start date, end date, and interval
+        :return: read-only bars of the ticker data
+        """
+        return self._cache_ticker_data(key, ticker_request, self._fetch_ticker_data(ticker_request))
+
+    def _cache_ticker_data(self, key: Hashable, ticker_request: TickerRequest, ticker_data: BarArray) -> BarArray:
+        """
+        Fingerprints and freezes the processed ticker data of a request, and caches it.
+        The fingerprint is set while the bars are not shared yet, so requests sharing them only read it.
+        Bars of a range ending after the current day are not final, and are not cached.
+        :param key: key of the bars of the request.
+        :param ticker_request: request containing ticker, start date, end date, and interval
+        :param ticker_data: processed bars of the request.
+        :return: read-only bars of the ticker data
+        """
+        ticker_data.price_data_fingerprint = IndicatorCache.fingerprint(ticker_data.price_data)
+        ticker_data = ticker_data.freeze()
+        if self.ticker_data_cache is not None and ticker_request.end_date is not None \
+                and pd.Timestamp(ticker_request.end_date) <= pd.Timestamp.now().normalize():
+            self.ticker_data_cache.put(key, ticker_data)
+        return ticker_data
+
+    def _fetch_ticker_data(self, ticker_request: TickerRequest) -> BarArray:
+        """
+        Fetches and processes the ticker data of a request, from the history of its series if it is cached.
+        :param ticker_request: request containing ticker, start date, end date, and interval
+        :return: bars of the ticker data
+        """
+        interval = ticker_request.interval
+        base_interval = interval.base_interval or interval
+        if self.ticker_history_cache is None or not self.ticker_history_cache.max_bytes \
+                or ticker_request.start_date is None or ticker_request.end_date is None:
+            df = self.ticker_provider.fetch(
+                ticker=ticker_request.ticker,
+                interval=base_interval.value,
+                start=ticker_request.start_date,
+                end=ticker_request.end_date
+            )
+            return self._process_interval_data(df, interval)
+
+        start, end = pd.Timestamp(ticker_request.start_date), pd.Timestamp(ticker_request.end_date)
+        key = self.ticker_history_cache.make_key(ticker_request.ticker, base_interval.value)
+        with self.ticker_history_cache.lock(key):
+            history = self._get_history(ticker_request.ticker, base_interval.value, start, end)
+        first, last = history.get_range(start, end)
+        if first == last:
+            logger.error("No data found for ticker: %s", ticker_request.ticker)
+            raise TickerDataNotFound(ticker=ticker_request.ticker)
+        if base_interval is interval:
+            return TickerDataProcessor.slice_bars(history.bars, first, last)
+        resampled_bars = self._get_resampled_bars(ticker_request.ticker, interval, history)
+        if resampled_bars is None:
+            return TickerResampler.resample(TickerDataProcessor.slice_bars(history.bars, first, last), interval)[0]
+        return TickerResampler.slice_bars(resampled_bars, history.bars, first, last)
+
+    def _get_resampled_bars(
+            self,
+            ticker: str,
+            interval: TickerInterval,
+            history: TickerHistory
+    ) -> Optional[ResampledBars]:
+        """
+        Gets the bars of a series resampled to an interval, resampling its history only once per history.
+        :param ticker: ticker symbol.
+        :param interval: interval of the resampled bars.
+        :param history: history of the series, of the base interval of the interval.
+        :return: the resampled bars of the whole history, or None if its bars are not sorted by date.
+        """
+        key = self.ticker_history_cache.make_key(ticker, interval.value)
+        with self.ticker_history_cache.lock(key):
+            resampled_bars = self.ticker_history_cache.get(key)
+            if resampled_bars is not None and resampled_bars.is_resampled_from(history):
+                logger.debug("Serving %s %s from the resampled ticker history", ticker, interval.value)
+                return resampled_bars
+            if not history.bars.dates.is_sorted():
+                return None
+            bars, starts = TickerResampler.resample(history.bars, interval)
+            logger.info(
+                "Resampled %s bars of %s %s to %s %s bars",
+                len(history), ticker, interval.base_interval.value, len(bars), interval.value
+            )
+            return self.ticker_history_cache.put(key, ResampledBars(bars.freeze(), starts, history))
+
+    def _get_history(
+            self,
+            ticker: str,
+            interval: str,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> TickerHistory:
+        """
+        Gets the history of a series, covering the requested range.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :param start: inclusive start of the requested range.
+        :param end: exclusive end of the requested range.
+        :return: the history, from the cache, refreshed, or newly fetched.
+        """
+        key = self.ticker_history_cache.make_key(ticker, interval)
+        history = self.ticker_history_cache.get(key)
+        if history is not None and history.start <= start:
+            if end <= history.end:
+                logger.debug("Serving %s %s from the ticker history", ticker, interval)
+                return history
+            refreshed_history = self._refresh_history(ticker, interval, history, end)
+            if refreshed_history is not None:
+                return self.ticker_history_cache.put(key, refreshed_history)
+
+        bars = self._process_ticker_data(
+            self.ticker_provider.fetch(
+                ticker=ticker,
+                interval=interval,
+                start=start.to_pydatetime(),
+                end=end.to_pydatetime()
+            )
+        )
+        history = TickerHistory.from_bars(bars, start, self._get_covered_end(start, end))
+        if not bars.dates.is_sorted():
+            # Bars without a date, or out of order, cannot be looked up by date
+            return history
+        return self.ticker_history_cache.put(key, history)
+
+    def _refresh_history(
+            self,
+            ticker: str,
+            interval: str,
+            history: TickerHistory,
+            end: pd.Timestamp
+    ) -> Optional[TickerHistory]:
+        """
+        Extends a history up to the end of a request,
+         fetching the bars after the covered range and the last revision_bars bars before it.
+        Only the fetched bars are processed, from the close of the bar before them,
+         and only the bars from the first one the provider revised on are replaced.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :param history: history covering the start of the request, but not its end.
+        :param end: exclusive end of the requested range.
+        :return: the refreshed history, or None if the fetched bars cannot extend it.
+        """
+        first = max(history.get_range(history.end, history.end)[0] - self.revision_bars, 0)
+        fetch_start = history.get_date(first) if first < len(history) else history.end
+        try:
+            df = self.ticker_provider.fetch(
+                ticker=ticker,
+                interval=interval,
+                start=fetch_start.to_pydatetime(),
+                end=end.to_pydatetime()
+            )
+        except TickerDataNotFound:
+            logger.debug("No new bars of %s %s after %s", ticker, interval, fetch_start)
+            df = pd.DataFrame(columns=['date', *BarArray.PRICE_COLUMNS])
+
+        bars = history.bars
+        fetched_bars = TickerDataProcessor.to_bar_array(
+            df,
+            previous_close=bars['close'][first - 1] if first else np.nan
+        )
+        if len(fetched_bars) and (fetched_bars.dates.timezone != history.timezone
+                                  or not fetched_bars.dates.is_sorted()):
+            return None
+        revised_index = TickerDataProcessor.get_revised_index(bars, first, fetched_bars)
+        if revised_index < len(bars):
+            logger.info(
+                "Provider revised the bars of %s %s from %s, replacing %s bars",
+                ticker, interval, history.get_date(revised_index), len(bars) - revised_index
+            )
+        new_bars = fetched_bars.slice(revised_index - first, len(fetched_bars))
+        history = history.extend(
+            bars=new_bars,
+            index=revised_index,
+            end=self._get_covered_end(history.start, end)
+        )
+        logger.info(
+            "Refreshed %s %s with %s bars, out of %s fetched bars",
+            ticker, interval, len(new_bars), len(fetched_bars)
+        )
+        return history
+
+    @staticmethod
+    def _get_covered_end(start: pd.Timestamp, end: pd.Timestamp) -> pd.Timestamp:
+        """
+        Gets the end of the part of a range whose bars are final, before the current day.
+        """
+        return max(start, min(end, pd.Timestamp.now().normalize()))
+
+    @classmethod
+    def _process_interval_data(
+            cls,
+            df: pd.DataFrame,
+            interval: TickerInterval
+    ) -> BarArray:
+        """
+        Processes the price data fetched for an interval, resampling it if it is of the base interval.
+        :param df: Raw DataFrame containing ticker data, of the base interval of the interval if it has one.
+        :param interval: interval of the requested bars.
+        :return: bars of the interval, with helper columns added.
+        """
+        bars = cls._process_ticker_data(df)
+        if interval.base_interval is None:
+            return bars
+        return TickerResampler.resample(bars, interval)[0]
 
     @staticmethod
     def _process_ticker_data(
             df: pd.DataFrame
-    ) -> pd.DataFrame:
+    ) -> BarArray:
         """
         Apply transformations to prepare ticker data for downstream use.
         :param df: Raw DataFrame containing ticker data.
-        :return: df with helper columns added and date converted to ISO format.
+        :return: bars with helper columns added.
         """
-        df = TickerDataProcessor.add_helper_columns(df)
+        bars = TickerDataProcessor.to_bar_array(df)
         logger.debug(
-            "Helper columns added to ticker data: %s", df.columns
+            "Helper columns added to ticker data: %s", bars
         )
-        df = TickerDataProcessor.convert_date_to_isoformat(df)
-        return df
+        return bars
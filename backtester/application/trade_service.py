@@ -3,12 +3,11 @@ Trade Service for managing trades in a backtesting environment.
 """
 import logging
 
-import pandas as pd
-
 from backtester.domain.enums.order_type import OrderType
 from backtester.domain.strategy.strategy import Strategy
 from backtester.domain.strategy.trade import Trade
 from backtester.domain.strategy.trading_period import TradingPeriod
+from backtester.domain.ticker.bar_array import BarArray
 
 logger = logging.getLogger(__name__)
 
@@ -38,19 +37,22 @@ class TradeService:
             starting_portfolio_amount=strategy.current_amount,
             trade_size=strategy.trade_size,
             trade_targets=strategy.trade_targets,
-            order_type=order_type
+            order_type=order_type,
+            keep_trading_periods=strategy.trade_detail.keep_trading_periods
         )
 
     @staticmethod
     def _init_trading_period(
             trade: Trade,
-            trading_period_data: pd.Series,
+            bars: BarArray,
+            index: int,
             is_first_trading_period: bool
     ) -> TradingPeriod:
         """
         Initializes a TradingPeriod instance for the given trade and trading period data.
         :param trade: Trade instance containing trade details
-        :param trading_period_data: pd.Series containing trading period data
+        :param bars: BarArray containing the ticker data
+        :param index: index of the bar of the trading period
         :param is_first_trading_period: Boolean indicating if this is the first trading period
         :return: TradingPeriod instance initialized with trade details and trading period data
         """
@@ -58,7 +60,8 @@ class TradeService:
             trade_returns=trade.trade_returns,
             order_type=trade.order_type,
             thresholds=trade.thresholds,
-            trading_period_data=trading_period_data,
+            bars=bars,
+            index=index,
             is_first_trading_period=is_first_trading_period
         )
         return trading_period
@@ -66,24 +69,27 @@ class TradeService:
     def process_trading_period(
             self,
             trade: Trade,
-            trading_period_data: pd.Series,
+            bars: BarArray,
+            index: int,
             is_first_trading_period: bool
     ) -> None:
         """
         Processes a trading period for the given trade
          and updates the trade with the new trading period.
         :param trade: Trade instance to process
-        :param trading_period_data: pd.Series containing trading period data
+        :param bars: BarArray containing the ticker data
+        :param index: index of the bar of the trading period
         :param is_first_trading_period: Boolean indicating if this is the first trading period
         """
         logger.debug(
-            "Processing trading period for trade %s with data %s",
+            "Processing trading period for trade %s on bar %s",
             trade,
-            trading_period_data
+            index
         )
         trading_period = self._init_trading_period(
             trade,
-            trading_period_data,
+            bars,
+            index,
             is_first_trading_period
         )
         trade.add_trading_period(trading_period)
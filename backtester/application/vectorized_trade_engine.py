@@ -0,0 +1,490 @@
+"""
+Vectorized Trade Engine for simulating trades on numpy arrays.
+"""
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backtester.api.requests.portfolio_management import PortfolioManagement, TradeSize, TradeTargets
+from backtester.application.ticker_data_processor import TickerDataProcessor
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.trade_size_type import TradeSizeType
+from backtester.domain.enums.trading_period_result import TradingPeriodResult
+from backtester.domain.signals.signal_events import SignalEvents
+from backtester.domain.strategy.breach_index import BreachIndex
+from backtester.domain.strategy.thresholds import Thresholds
+from backtester.domain.ticker.bar_array import BarArray
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedTrades(NamedTuple):
+    """
+    Path-independent results of the simulated trades, one element per trade.
+    Optionally holds the trade returns after each trading period of every trade.
+    """
+    order_type: np.ndarray
+    entry_index: np.ndarray
+    exit_index: np.ndarray
+    trade_returns: np.ndarray
+    exit_reason: np.ndarray
+    period_returns: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.entry_index)
+
+
+class PortfolioPath(NamedTuple):
+    """
+    Portfolio amounts of the simulated trades, after compounding them in order.
+    """
+    starting_portfolio_amount: np.ndarray
+    entry_amount: np.ndarray
+    current_amount: np.ndarray
+    current_portfolio_amount: np.ndarray
+    actionable: np.ndarray
+
+
+class SweptTrades(NamedTuple):
+    """
+    Path-independent results of the trades simulated for every pair of trade targets.
+    Element [k, c] holds the k-th trade of target pair c,
+    slots past the last trade of a pair are not filled.
+    """
+    order_type: np.ndarray
+    trade_returns: np.ndarray
+    exit_reason: np.ndarray
+    filled: np.ndarray
+
+
+class SweptPortfolios(NamedTuple):
+    """
+    Trade counts and final portfolio amount of every combination of trade size and trade targets.
+    Element [s, c] holds trade size s with target pair c.
+    """
+    wins: np.ndarray
+    losses: np.ndarray
+    current_amount: np.ndarray
+
+
+class VectorizedTradeEngine:
+    """
+    Simulates the trades of a strategy on the numpy arrays of the ticker data.
+    The BreachIndex of the ticker data bounds the bars a trade can exit at,
+    and the exit is confirmed with a cumulative product over those bars,
+    so the ticker data is never iterated row by row.
+    Produces the same trades as the iterative engine of the Backtester.
+    """
+
+    def __init__(self, tolerance: float = 1e-8):
+        """
+        Initializes the VectorizedTradeEngine.
+        :param tolerance: log distance past a threshold at which the BreachIndex reports a certain hit,
+         covering the rounding difference between log sums and cumulative products.
+        """
+        self.tolerance = tolerance
+
+    def simulate(
+            self,
+            ticker_data: BarArray,
+            trade_targets: TradeTargets,
+            keep_trading_periods: bool = False,
+            breach_index: Optional[BreachIndex] = None,
+            signal_events: Optional[Dict[OrderType, SignalEvents]] = None
+    ) -> SimulatedTrades:
+        """
+        Simulates the trades triggered by the signals of the ticker data.
+        :param ticker_data: BarArray containing ticker data with signals.
+        :param trade_targets: take profit and stop loss of the trades.
+        :param keep_trading_periods: whether the trade returns after each trading period are kept.
+        :param breach_index: BreachIndex of the ticker data, built if not provided.
+        :param signal_events: signal events of each order type,
+         read from the signal column of the ticker data if not provided.
+        :return: SimulatedTrades with the entry, exit and returns of each trade.
+        """
+        first_growth, growth = TickerDataProcessor.get_growth_columns(ticker_data)
+        if breach_index is None:
+            breach_index = TickerDataProcessor.build_breach_index(ticker_data)
+        bars = len(ticker_data)
+
+        order_type_indexes = self._get_order_type_indexes(ticker_data, signal_events)
+        signal_indexes, signal_order_types = self._merge_order_type_indexes(order_type_indexes)
+        opposing_signal_indexes = {
+            OrderType.BUY.code: order_type_indexes[OrderType.SELL],
+            OrderType.SELL.code: order_type_indexes[OrderType.BUY],
+        }
+        thresholds = {
+            order_type.code: Thresholds.from_trade_targets(order_type, trade_targets)
+            for order_type in (OrderType.BUY, OrderType.SELL)
+        }
+
+        trades = []
+        period_returns = [] if keep_trading_periods else None
+        position = 0
+        while position < len(signal_indexes):
+            signal_index = signal_indexes[position]
+            entry_index = signal_index + 1
+            if entry_index >= bars:
+                break
+            order_type_code = signal_order_types[position]
+            opposing_indexes = opposing_signal_indexes[order_type_code]
+            opposing_position = np.searchsorted(opposing_indexes, entry_index, side='left')
+            opposing_index = (
+                opposing_indexes[opposing_position]
+                if opposing_position < len(opposing_indexes) else bars
+            )
+            trade_period_returns = [] if keep_trading_periods else None
+            exit_index, exit_reason, trade_returns = self._find_exit(
+                entry_index=entry_index,
+                last_index=min(opposing_index, bars - 1),
+                opposing_signal=opposing_index < bars,
+                first_growth=first_growth,
+                growth=growth,
+                thresholds=thresholds[order_type_code],
+                breach_index=breach_index,
+                period_returns=trade_period_returns
+            )
+            if keep_trading_periods:
+                period_returns.append(np.concatenate(trade_period_returns))
+            trades.append(
+                (order_type_code, entry_index, exit_index, trade_returns, exit_reason)
+            )
+            logger.debug(
+                "Simulated %s trade from %s to %s with returns %s",
+                OrderType.from_code(order_type_code),
+                entry_index,
+                exit_index,
+                trade_returns
+            )
+            if not TradingPeriodResult.from_code(exit_reason).end_trade:
+                break
+            position = np.searchsorted(signal_indexes, exit_index, side='left')
+
+        return self._to_simulated_trades(trades, period_returns)
+
+    @staticmethod
+    def compound(
+            simulated_trades: SimulatedTrades,
+            portfolio_management: PortfolioManagement
+    ) -> PortfolioPath:
+        """
+        Compounds the returns of the simulated trades into the portfolio, in a single scan.
+        Trades whose result is undetermined leave the portfolio untouched.
+        :param simulated_trades: the simulated trades of the strategy.
+        :param portfolio_management: portfolio management settings for the backtest.
+        :return: PortfolioPath with the portfolio amounts of each trade.
+        """
+        trades = len(simulated_trades)
+        starting_portfolio_amount = np.empty(trades, dtype=np.float64)
+        entry_amount = np.empty(trades, dtype=np.float64)
+        current_amount = np.empty(trades, dtype=np.float64)
+        current_portfolio_amount = np.empty(trades, dtype=np.float64)
+        actionable = np.empty(trades, dtype=bool)
+
+        trade_size_type = TradeSizeType(portfolio_management.trade_size.type)
+        trade_size_value = portfolio_management.trade_size.value
+        portfolio_amount = portfolio_management.starting_amount
+        for i in range(trades):
+            if trade_size_type == TradeSizeType.DYNAMIC:
+                amount = trade_size_value * portfolio_amount
+            else:
+                amount = trade_size_value
+            returns = float(simulated_trades.trade_returns[i])
+            if simulated_trades.order_type[i] == OrderType.BUY.code:
+                exit_amount = round(amount * returns, 4)
+            else:
+                exit_amount = round(amount * (2 - returns), 4)
+
+            starting_portfolio_amount[i] = portfolio_amount
+            entry_amount[i] = amount
+            current_amount[i] = exit_amount
+            current_portfolio_amount[i] = portfolio_amount - amount + exit_amount
+            actionable[i] = exit_amount != amount
+            if actionable[i]:
+                portfolio_amount = portfolio_amount - amount + exit_amount
+
+        return PortfolioPath(
+            starting_portfolio_amount=starting_portfolio_amount,
+            entry_amount=entry_amount,
+            current_amount=current_amount,
+            current_portfolio_amount=current_portfolio_amount,
+            actionable=actionable
+        )
+
+    @staticmethod
+    def sweep(
+            ticker_data: BarArray,
+            take_profit: np.ndarray,
+            stop_loss: np.ndarray,
+            breach_index: BreachIndex,
+            signal_events: Optional[Dict[OrderType, SignalEvents]] = None
+    ) -> SweptTrades:
+        """
+        Simulates the trades triggered by the signals of the ticker data for many pairs of trade targets.
+        Every pair advances one trade per step, and the exits of a step are found
+        for all pairs with a single batched BreachIndex query.
+        Trade returns are compounded in log space, so they can differ from the exact cumulative product
+        by rounding, and a trade touching a threshold within rounding can exit differently.
+        :param ticker_data: BarArray containing ticker data with signals.
+        :param take_profit: take profit of each target pair.
+        :param stop_loss: stop loss of each target pair.
+        :param breach_index: BreachIndex of the ticker data.
+        :param signal_events: signal events of each order type,
+         read from the signal column of the ticker data if not provided.
+        :return: SweptTrades with a column per target pair.
+        """
+        bars = len(ticker_data)
+        pairs = len(take_profit)
+
+        order_type_indexes = VectorizedTradeEngine._get_order_type_indexes(ticker_data, signal_events)
+        signal_indexes, signal_order_types = VectorizedTradeEngine._merge_order_type_indexes(order_type_indexes)
+        opposing_indexes = np.full(len(signal_indexes), bars, dtype=np.int64)
+        for order_type, opposing_order_type in ((OrderType.BUY, OrderType.SELL), (OrderType.SELL, OrderType.BUY)):
+            order_type_signals = signal_order_types == order_type.code
+            opposing_signal_indexes = np.append(order_type_indexes[opposing_order_type], bars)
+            opposing_indexes[order_type_signals] = opposing_signal_indexes[np.searchsorted(
+                opposing_signal_indexes, signal_indexes[order_type_signals] + 1, side='left'
+            )]
+
+        position = np.zeros(pairs, dtype=np.int64)
+        active = np.full(pairs, len(signal_indexes) > 0)
+        steps = []
+        while active.any():
+            pair_indexes = np.flatnonzero(active)
+            signal_position = position[pair_indexes]
+            entry_index = signal_indexes[signal_position] + 1
+            entering = entry_index < bars
+            active[pair_indexes[~entering]] = False
+            pair_indexes, signal_position, entry_index = (
+                column[entering] for column in (pair_indexes, signal_position, entry_index)
+            )
+            if len(pair_indexes) == 0:
+                break
+
+            order_type = signal_order_types[signal_position]
+            is_buy = order_type == OrderType.BUY.code
+            upper = np.where(is_buy, 1 + take_profit[pair_indexes], 1 - stop_loss[pair_indexes])
+            lower = np.where(is_buy, 1 + stop_loss[pair_indexes], 1 - take_profit[pair_indexes])
+            opposing_index = opposing_indexes[signal_position]
+            last_index = np.minimum(opposing_index, bars - 1)
+
+            upper_hit, lower_hit = breach_index.first_breach(
+                entry_index=entry_index,
+                last_index=last_index,
+                upper=upper,
+                lower=lower
+            )
+            exit_index = np.minimum(np.minimum(upper_hit, lower_hit), last_index)
+            exit_reason = np.select(
+                [upper_hit <= exit_index, lower_hit <= exit_index, opposing_index < bars],
+                [TradingPeriodResult.HIGHER_LIMIT.code, TradingPeriodResult.LOWER_LIMIT.code,
+                 TradingPeriodResult.OPPOSING_TRADE.code],
+                TradingPeriodResult.CONTINUE_TRADE.code
+            ).astype(np.int8)
+            trade_returns = np.select(
+                [exit_reason == TradingPeriodResult.HIGHER_LIMIT.code,
+                 exit_reason == TradingPeriodResult.LOWER_LIMIT.code],
+                [upper, lower],
+                np.exp(breach_index.log_returns(entry_index, exit_index))
+            )
+            steps.append((pair_indexes, order_type, trade_returns, exit_reason))
+
+            position[pair_indexes] = np.searchsorted(signal_indexes, exit_index, side='left')
+            active[pair_indexes] = (
+                (exit_reason != TradingPeriodResult.CONTINUE_TRADE.code)
+                & (position[pair_indexes] < len(signal_indexes))
+            )
+        logger.debug("Swept %s target pairs in %s steps", pairs, len(steps))
+
+        swept_trades = SweptTrades(
+            order_type=np.zeros((len(steps), pairs), dtype=np.int8),
+            trade_returns=np.ones((len(steps), pairs), dtype=np.float64),
+            exit_reason=np.zeros((len(steps), pairs), dtype=np.int8),
+            filled=np.zeros((len(steps), pairs), dtype=bool)
+        )
+        for step, (pair_indexes, order_type, trade_returns, exit_reason) in enumerate(steps):
+            swept_trades.order_type[step, pair_indexes] = order_type
+            swept_trades.trade_returns[step, pair_indexes] = trade_returns
+            swept_trades.exit_reason[step, pair_indexes] = exit_reason
+            swept_trades.filled[step, pair_indexes] = True
+        return swept_trades
+
+    @staticmethod
+    def compound_sweep(
+            swept_trades: SweptTrades,
+            trade_sizes: List[TradeSize],
+            starting_amount: float
+    ) -> SweptPortfolios:
+        """
+        Compounds the returns of the swept trades into a portfolio per trade size and target pair,
+         scanning the trades in order for all combinations at once.
+        Trades whose result is undetermined leave the portfolio untouched.
+        :param swept_trades: the trades simulated for every target pair.
+        :param trade_sizes: trade sizes to compound the trades with.
+        :param starting_amount: starting amount of every portfolio.
+        :return: SweptPortfolios with the results of each combination.
+        """
+        shape = (len(trade_sizes), swept_trades.filled.shape[1])
+        dynamic = np.array(
+            [TradeSizeType(trade_size.type) == TradeSizeType.DYNAMIC for trade_size in trade_sizes]
+        )[:, None]
+        trade_size_value = np.array([trade_size.value for trade_size in trade_sizes], dtype=np.float64)[:, None]
+
+        portfolio_amount = np.full(shape, starting_amount, dtype=np.float64)
+        wins = np.zeros(shape, dtype=np.int64)
+        losses = np.zeros(shape, dtype=np.int64)
+        for step in range(len(swept_trades.filled)):
+            amount = np.where(dynamic, trade_size_value * portfolio_amount, trade_size_value)
+            returns = np.where(
+                swept_trades.order_type[step] == OrderType.BUY.code,
+                swept_trades.trade_returns[step],
+                2 - swept_trades.trade_returns[step]
+            )
+            exit_amount = np.round(amount * returns, 4)
+            actionable = swept_trades.filled[step] & (exit_amount != amount)
+            wins += actionable & (exit_amount > amount)
+            losses += actionable & (exit_amount < amount)
+            portfolio_amount = np.where(actionable, portfolio_amount - amount + exit_amount, portfolio_amount)
+
+        return SweptPortfolios(
+            wins=wins,
+            losses=losses,
+            current_amount=portfolio_amount
+        )
+
+    def _find_exit(
+            self,
+            entry_index: int,
+            last_index: int,
+            opposing_signal: bool,
+            first_growth: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            growth: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            thresholds: Thresholds,
+            breach_index: BreachIndex,
+            period_returns: Optional[List[np.ndarray]] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Finds the trading period a trade exits at.
+        The BreachIndex gives the first trading period at which a threshold is certainly hit,
+        and the cumulative product up to it finds the exact exit,
+        multiplying the trade returns in the same order as in the iterative engine.
+        Should rounding hide the hit, the rest of the trade is searched in a second window
+        seeded with the returns of the first one.
+        :param entry_index: index of the first trading period of the trade.
+        :param last_index: index of the last trading period the trade can reach,
+         either an opposing signal or the last bar of the ticker data.
+        :param opposing_signal: whether the last index holds an opposing signal.
+        :param first_growth: close, high and low growth of a first trading period.
+        :param growth: close, high and low growth of the following trading periods.
+        :param thresholds: thresholds of the trade.
+        :param breach_index: BreachIndex of the ticker data.
+        :param period_returns: if provided, collects the trade returns after each trading period.
+        :return: exit index, exit reason code and trade returns.
+        """
+        returns = 1.0
+        start = entry_index
+        certain_exit_index = breach_index.first_exit(
+            entry_index=entry_index,
+            last_index=last_index,
+            thresholds=thresholds,
+            tolerance=self.tolerance
+        )
+        window_stop = min(certain_exit_index, last_index) + 1
+        while start <= last_index:
+            stop = window_stop
+            close_growth, high_growth, low_growth = (
+                column[start:stop].copy() for column in growth
+            )
+            if start == entry_index:
+                close_growth[0], high_growth[0], low_growth[0] = (
+                    column[entry_index] for column in first_growth
+                )
+
+            cumulative_returns = np.cumprod(np.concatenate(([returns], close_growth)))
+            previous_returns = cumulative_returns[:-1]
+            upper_limit_hit = previous_returns * high_growth >= thresholds.upper
+            lower_limit_hit = previous_returns * low_growth <= thresholds.lower
+            exits = upper_limit_hit | lower_limit_hit
+            opposing_trade = opposing_signal and stop - 1 == last_index
+
+            if exits.any() or opposing_trade:
+                offset = int(np.argmax(exits)) if exits.any() else len(exits) - 1
+                if upper_limit_hit[offset]:
+                    result, trade_returns = TradingPeriodResult.HIGHER_LIMIT, thresholds.upper
+                elif lower_limit_hit[offset]:
+                    result, trade_returns = TradingPeriodResult.LOWER_LIMIT, thresholds.lower
+                else:
+                    result, trade_returns = TradingPeriodResult.OPPOSING_TRADE, cumulative_returns[offset + 1]
+                if period_returns is not None:
+                    window_returns = cumulative_returns[1:offset + 2].copy()
+                    window_returns[-1] = trade_returns
+                    period_returns.append(window_returns)
+                return start + offset, result.code, trade_returns
+
+            if period_returns is not None:
+                period_returns.append(cumulative_returns[1:])
+            returns = cumulative_returns[-1]
+            start = stop
+            window_stop = last_index + 1
+        return last_index, TradingPeriodResult.CONTINUE_TRADE.code, returns
+
+    @staticmethod
+    def _get_order_type_indexes(
+            ticker_data: BarArray,
+            signal_events: Optional[Dict[OrderType, SignalEvents]]
+    ) -> Dict[OrderType, np.ndarray]:
+        """
+        Gets the sorted indexes of the bars with a signal of each order type.
+        Sparse signal events are used directly, the signal column is only scanned without them.
+        :param ticker_data: BarArray containing ticker data with signals.
+        :param signal_events: signal events of each order type, if available.
+        :return: int64 indexes of the signals of the buy and sell order types.
+        """
+        if signal_events is not None:
+            return {
+                order_type: signal_events[order_type].positions().astype(np.int64)
+                for order_type in (OrderType.BUY, OrderType.SELL)
+            }
+        signals = ticker_data['signal']
+        return {
+            order_type: np.flatnonzero(signals == order_type.code)
+            for order_type in (OrderType.BUY, OrderType.SELL)
+        }
+
+    @staticmethod
+    def _merge_order_type_indexes(
+            order_type_indexes: Dict[OrderType, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merges the signal indexes of the buy and sell order types into a single sorted sequence.
+        :param order_type_indexes: sorted, disjoint signal indexes of the buy and sell order types.
+        :return: the sorted signal indexes, and the int8 order type code of each signal.
+        """
+        signal_indexes = np.concatenate((order_type_indexes[OrderType.BUY], order_type_indexes[OrderType.SELL]))
+        signal_order_types = np.concatenate((
+            np.full(len(order_type_indexes[OrderType.BUY]), OrderType.BUY.code, dtype=np.int8),
+            np.full(len(order_type_indexes[OrderType.SELL]), OrderType.SELL.code, dtype=np.int8)
+        ))
+        order = np.argsort(signal_indexes, kind='stable')
+        return signal_indexes[order], signal_order_types[order]
+
+    @staticmethod
+    def _to_simulated_trades(
+            trades: list,
+            period_returns: Optional[List[np.ndarray]]
+    ) -> SimulatedTrades:
+        """
+        Converts the simulated trade tuples to typed numpy columns.
+        :param trades: list of simulated trade tuples.
+        :param period_returns: trade returns after each trading period of every trade, if kept.
+        :return: SimulatedTrades instance.
+        """
+        columns: Dict[str, np.ndarray] = {
+            'order_type': np.array([trade[0] for trade in trades], dtype=np.int8),
+            'entry_index': np.array([trade[1] for trade in trades], dtype=np.int64),
+            'exit_index': np.array([trade[2] for trade in trades], dtype=np.int64),
+            'trade_returns': np.array([trade[3] for trade in trades], dtype=np.float64),
+            'exit_reason': np.array([trade[4] for trade in trades], dtype=np.int8),
+        }
+        return SimulatedTrades(**columns, period_returns=period_returns)
@@ -0,0 +1,12 @@
+"""
+Backtest Engine Enum
+"""
+from enum import Enum
+
+
+class BacktestEngine(Enum):
+    """
+    Enum representing the engine used to simulate trades during a backtest.
+    """
+    ITERATIVE = 'ITERATIVE'
+    VECTORIZED = 'VECTORIZED'
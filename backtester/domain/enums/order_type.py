@@ -23,3 +23,23 @@ class OrderType(Enum):
             OrderType.NO_ACTION: OrderType.NO_ACTION
         }
         return opposites[self]
+
+    @property
+    def code(self) -> int:
+        """
+        Returns the integer code of the order type, used in numpy signal arrays.
+        """
+        codes = {
+            OrderType.BUY: 1,
+            OrderType.SELL: -1,
+            OrderType.NO_ACTION: 0
+        }
+        return codes[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> "OrderType":
+        """
+        Returns the order type matching the given integer code.
+        :param code: integer code of the order type.
+        """
+        return next(order_type for order_type in cls if order_type.code == code)
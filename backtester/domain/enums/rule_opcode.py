@@ -0,0 +1,20 @@
+"""
+RuleOpcode Enum
+"""
+from enum import Enum
+
+
+class RuleOpcode(Enum):
+    """
+    Enum representing the operations of a compiled rule program.
+    """
+    LOAD_INDICATOR = 'LOAD_INDICATOR'
+    LOAD_CONSTANT = 'LOAD_CONSTANT'
+    LOAD_SIGNALS = 'LOAD_SIGNALS'
+    SHIFT = 'SHIFT'
+    COMPARE = 'COMPARE'
+    AND = 'AND'
+    OR = 'OR'
+    BRANCH_IF_EMPTY = 'BRANCH_IF_EMPTY'
+    STORE = 'STORE'
+    CACHE = 'CACHE'
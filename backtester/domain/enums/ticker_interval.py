@@ -2,10 +2,35 @@
 TickerInterval Enum
 """
 from enum import Enum
+from typing import Optional
 
 
 class TickerInterval(Enum):
     """
-    Enum representing the types of properties that can be used in a rule.
+    Enum representing the intervals of the bars of a ticker.
+    Minute and daily bars are fetched from the provider,
+     the other intervals are resampled from them.
     """
+    MINUTE = '1m'
+    TWO_MINUTES = '2m'
+    FIVE_MINUTES = '5m'
+    FIFTEEN_MINUTES = '15m'
+    THIRTY_MINUTES = '30m'
+    HOURLY = '60m'
     DAILY = '1d'
+    FIVE_DAYS = '5d'
+    WEEKLY = '1wk'
+    MONTHLY = '1mo'
+    QUARTERLY = '3mo'
+
+    @property
+    def base_interval(self) -> Optional["TickerInterval"]:
+        """
+        Returns the interval of the fetched bars the bars of the interval are resampled from,
+         None if the bars of the interval are fetched themselves.
+        """
+        if self in (TickerInterval.MINUTE, TickerInterval.DAILY):
+            return None
+        if self.value.endswith('m') and not self.value.endswith('mo'):
+            return TickerInterval.MINUTE
+        return TickerInterval.DAILY
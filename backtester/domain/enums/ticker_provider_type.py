@@ -0,0 +1,13 @@
+"""
+Ticker Provider Type Enum
+"""
+from enum import Enum
+
+
+class TickerProviderType(Enum):
+    """
+    Enum representing the providers the price data of tickers can be fetched from.
+    """
+    YFINANCE = 'yfinance'
+    SYNTHETIC = 'synthetic'
+    DIRECTORY = 'directory'
@@ -0,0 +1,40 @@
+"""
+Trade Detail Enum
+"""
+from enum import Enum
+
+
+class TradeDetail(Enum):
+    """
+    Enum representing the level of trade detail kept during a backtest and presented in its results.
+    """
+    SUMMARY = 'SUMMARY'
+    TRADES = 'TRADES'
+    BARS = 'BARS'
+
+    @property
+    def keep_trades(self) -> bool:
+        """
+        Determines if the statistics of every trade are presented.
+        :return: True if per-trade statistics are presented, False otherwise.
+        """
+        details = {
+            TradeDetail.SUMMARY: False,
+            TradeDetail.TRADES: True,
+            TradeDetail.BARS: True
+        }
+        return details[self]
+
+    @property
+    def keep_trading_periods(self) -> bool:
+        """
+        Determines if every trading period of a trade is kept,
+         instead of only its first and last trading periods.
+        :return: True if every trading period is kept, False otherwise.
+        """
+        details = {
+            TradeDetail.SUMMARY: False,
+            TradeDetail.TRADES: False,
+            TradeDetail.BARS: True
+        }
+        return details[self]
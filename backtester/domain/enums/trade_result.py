@@ -25,3 +25,23 @@ class TradeResult(Enum):
             TradeResult.UNDETERMINED: False
         }
         return actions[self]
+
+    @property
+    def code(self) -> int:
+        """
+        Returns the integer code of the trade result, used in numpy result arrays.
+        """
+        codes = {
+            TradeResult.UNDETERMINED: 0,
+            TradeResult.WIN: 1,
+            TradeResult.LOSS: -1
+        }
+        return codes[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> "TradeResult":
+        """
+        Returns the trade result matching the given integer code.
+        :param code: integer code of the trade result.
+        """
+        return next(trade_result for trade_result in cls if trade_result.code == code)
@@ -27,3 +27,24 @@ class TradingPeriodResult(Enum):
 
         }
         return results[self]
+
+    @property
+    def code(self) -> int:
+        """
+        Returns the integer code of the result, used in numpy result arrays.
+        """
+        codes = {
+            TradingPeriodResult.CONTINUE_TRADE: 0,
+            TradingPeriodResult.HIGHER_LIMIT: 1,
+            TradingPeriodResult.LOWER_LIMIT: 2,
+            TradingPeriodResult.OPPOSING_TRADE: 3,
+        }
+        return codes[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> "TradingPeriodResult":
+        """
+        Returns the trading period result matching the given integer code.
+        :param code: integer code of the result.
+        """
+        return next(result for result in cls if result.code == code)
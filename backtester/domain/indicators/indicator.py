@@ -8,7 +8,7 @@ class Indicator(ABC):
     All indicator_subclasses should be able to:
      - bring the input to the relevant format
      - compute their mask
-     - process the result to a JSON serialisable format
+     - return their mask as a float64 numpy array, NaN where it is undefined
     """
     registry = {}
 
@@ -8,7 +8,8 @@ from typing import Any, Dict, List
 
 import numpy as np
 
-from backtester.application.talib_converter import TalibConverter
+from backtester.api.exceptions.indicator_exceptions import IndicatorComputationError, \
+    MissingIndicatorParametersError
 from backtester.domain.indicators.indicator import Indicator
 
 logger = logging.getLogger(__name__)
@@ -19,13 +20,15 @@ class TalibIndicator(Indicator, abc.ABC):
     def compute(
             self,
             parameters: Dict[str, Any]
-    ) -> List:
-
+    ) -> np.ndarray:
+        """
+        Computes the indicator mask.
+        :param parameters: parameters of the indicator, price data included.
+        :return: mask as a float64 numpy array, NaN where the indicator is undefined.
+        """
         self._validate_parameters(parameters)
         try:
-            mask = self._compute_talib_function(parameters)
-            mask = self._postprocess(mask)
-            return mask
+            return np.asarray(self._compute_talib_function(parameters), dtype=np.float64)
         except Exception as error:
             logger.error(
                 "Encountered unexpected error calculating %s."
@@ -37,13 +40,6 @@ class TalibIndicator(Indicator, abc.ABC):
                 indicator=str(self)
             ) from error
 
-    @staticmethod
-    def _postprocess(
-            output: np.ndarray
-    ) -> List:
-        result = TalibConverter.convert_np_nan_to_none(output)
-        return result
-
     def _validate_parameters(self, parameters: Dict[str, Any]) -> None:
         """
         Validate that all required parameters are present and not None.
@@ -1,15 +1,10 @@
 """
 Group Rule
 """
-from copy import deepcopy
 from typing import Dict
 
-import pandas as pd
-
-
 from .indicator_registry import IndicatorRegistry
 from .rule import Rule
-from .signals import Signals
 from backtester.domain.enums.order_type import OrderType
 from backtester.api.requests.trading_system import RuleProperties
 
@@ -25,7 +20,6 @@ class GroupRule:
 
     def __init__(
             self,
-            signal_indexes: pd.Series,
             order_type: OrderType,
             rule_properties: Dict[str, RuleProperties],
             group_rule_id: str,
@@ -34,7 +28,6 @@ class GroupRule:
     ):
         """
         Initializes a GroupRule instance.
-        :param signal_indexes: pd.Series with signals
         :param order_type: OrderType, indicating the type of order (BUY/SELL)
         :param rule_properties: Properties of the rules
         :param group_rule_id: ID of the group rule
@@ -43,17 +36,10 @@ class GroupRule:
         """
         self.order_type_rule_id = order_type_rule_id
         self.group_rule_id = group_rule_id
-        self.signal_indexes: pd.Series = signal_indexes
         self.order_type: OrderType = order_type
         self.rule_properties = rule_properties
-
-        self.signals: Signals = Signals(
-            signal_indexes=deepcopy(signal_indexes),
-            order_type=self.order_type
-        )
         self.rules = [
             Rule(
-                signal_indexes=deepcopy(signal_indexes),
                 order_type=self.order_type,
                 rule_properties=self.rule_properties.get(key),
                 group_rule_id=self.group_rule_id,
@@ -1,7 +1,9 @@
 """
 Indicator Registry Module
 """
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+import numpy as np
 
 from .tile import Tile
 
@@ -9,6 +11,9 @@ from .tile import Tile
 class IndicatorRegistry:
     """
     Holds indicator tiles and their associated data.
+    Tiles describing the same indicator share their ID,
+    so each distinct indicator is stored once and computed once,
+    and its mask is shared by every tile referencing it.
     """
 
     def __init__(self):
@@ -18,18 +23,49 @@ class IndicatorRegistry:
         """
         self.indicators: Dict[str, Tile] = {}
         self.indicator_data: Dict[str, Any] = {}
+        self.referencing_tiles: Dict[str, List[Tile]] = {}
 
     def register_indicator(self, tile: Tile) -> None:
         """
         Registers an indicator tile in the registry.
+        Tiles of an indicator already registered are only recorded as references to it.
         :param tile: Tile object representing the indicator to be registered.
         """
+        self.referencing_tiles.setdefault(tile.id, []).append(tile)
+        if tile.id in self.indicators:
+            return
         self.indicators[tile.id] = tile
         self.indicator_data[tile.id] = {
             'name': tile.name,
             'parameters': tile.parameters.dict()
         }
 
+    def set_mask(self, tile_id: str, mask: np.ndarray) -> None:
+        """
+        Sets the mask of an indicator on every tile referencing it, sharing a single array.
+        :param tile_id: ID of the indicator.
+        :param mask: mask of the indicator.
+        """
+        indicator = self.indicators[tile_id]
+        indicator.set_mask(mask)
+        for tile in self.referencing_tiles[tile_id]:
+            if tile is not indicator:
+                tile.mask = indicator.mask
+
+    @property
+    def references(self) -> int:
+        """
+        Gets the number of indicator tiles registered, duplicates included.
+        """
+        return sum(len(tiles) for tiles in self.referencing_tiles.values())
+
+    @property
+    def saved_computations(self) -> int:
+        """
+        Gets the number of indicator computations saved by sharing the masks of duplicate tiles.
+        """
+        return self.references - len(self.indicators)
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the IndicatorRegistry.
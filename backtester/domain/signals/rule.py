@@ -1,13 +1,7 @@
 """
 Rule class represents a trading rule in a strategy.
 """
-from copy import deepcopy
-
-import pandas as pd
-
-
 from .indicator_registry import IndicatorRegistry
-from .signals import Signals
 from .tile import Tile
 from backtester.domain.enums.order_type import OrderType
 from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
@@ -24,7 +18,6 @@ class Rule:
 
     def __init__(
             self,
-            signal_indexes: pd.Series,
             order_type: OrderType,
             rule_properties: RuleProperties,
             group_rule_id: str,
@@ -35,7 +28,6 @@ class Rule:
         """
         self.group_rule_id = group_rule_id
         self.rule_id = rule_properties.rule_id
-        self.signal_indexes = signal_indexes
         self.order_type = order_type
         self.indicator_registry = indicator_registry
         self.first_tile: Tile = Tile(
@@ -51,10 +43,6 @@ class Rule:
         if self.second_tile.type == RulePropertyType.INDICATOR:
             self.indicator_registry.register_indicator(self.second_tile)
         self.comparison_method = RuleComparisonMethod(rule_properties.comparison.value)
-        self.signals = Signals(
-            signal_indexes=deepcopy(signal_indexes),
-            order_type=self.order_type
-        )
 
     @property
     def is_valid_rule(self) -> bool:
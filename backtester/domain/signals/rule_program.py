@@ -0,0 +1,102 @@
+"""
+Rule Program Entity
+"""
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.rule_opcode import RuleOpcode
+
+
+class Instruction(NamedTuple):
+    """
+    Single operation of a rule program, writing its result in a target register.
+    """
+    opcode: RuleOpcode
+    target: int
+    operands: Tuple[int, ...] = ()
+    argument: Any = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Instruction.
+        """
+        return f"{self.opcode.value} r{self.target} " \
+               f"{' '.join(f'r{operand}' for operand in self.operands)} {self.argument}"
+
+
+class Branch(NamedTuple):
+    """
+    Argument of a BRANCH_IF_EMPTY instruction:
+     the instruction to continue from, and the rules the branch skips.
+    """
+    target: int
+    skipped_rules: int
+
+
+class RuleProgram:
+    """
+    Flat program evaluating the rules of a trading system.
+    Registers hold the values of indicators and constants, or boolean buffers
+     the signals are combined in place in,
+     and STORE instructions publish the signals of an order type.
+    BRANCH_IF_EMPTY instructions skip the rest of an order type once its signals are empty.
+    LOAD_SIGNALS and CACHE instructions read and publish the signals of a subtree, by structural key.
+    """
+
+    def __init__(
+            self,
+            instructions: List[Instruction],
+            registers: int,
+            boolean_registers: List[int],
+            eliminated_operations: int = 0,
+            rules: int = 0
+    ):
+        """
+        Initializes a RuleProgram instance.
+        :param instructions: instructions of the program, in order of execution.
+        :param registers: number of registers of the program.
+        :param boolean_registers: registers backed by a preallocated boolean buffer.
+        :param eliminated_operations: number of operations common subexpressions saved.
+        :param rules: number of rules compiled in the program.
+        """
+        self.instructions = instructions
+        self.registers = registers
+        self.boolean_registers = boolean_registers
+        self.eliminated_operations = eliminated_operations
+        self.rules = rules
+
+    @property
+    def order_types(self) -> List[OrderType]:
+        """
+        Gets the order types the program stores signals for.
+        """
+        return [
+            instruction.argument for instruction in self.instructions
+            if instruction.opcode == RuleOpcode.STORE
+        ]
+
+    @property
+    def opcode_counts(self) -> Dict[RuleOpcode, int]:
+        """
+        Gets the number of instructions of each opcode.
+        """
+        counts: Dict[RuleOpcode, int] = {}
+        for instruction in self.instructions:
+            counts[instruction.opcode] = counts.get(instruction.opcode, 0) + 1
+        return counts
+
+    def __len__(self) -> int:
+        """
+        Returns the number of instructions of the program.
+        """
+        return len(self.instructions)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the RuleProgram instance.
+        """
+        return f"RuleProgram(instructions={len(self.instructions)}, " \
+               f"registers={self.registers}, " \
+               f"boolean_registers={len(self.boolean_registers)}, " \
+               f"eliminated_operations={self.eliminated_operations}, " \
+               f"rules={self.rules})"
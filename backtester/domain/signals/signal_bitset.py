@@ -0,0 +1,155 @@
+"""
+Signal Bitset Entity
+"""
+from typing import Iterator
+
+import numpy as np
+
+
+class SignalBitset:
+    """
+    Signal mask packed in little-endian uint64 words, one bit per bar,
+     taking an eighth of the memory of a boolean mask.
+    Merges and negations run a word at a time,
+     and bits past the last bar are always kept clear.
+    """
+    WORD_BITS = 64
+
+    def __init__(self, words: np.ndarray, length: int):
+        """
+        Initializes a SignalBitset instance.
+        :param words: uint64 words holding the bits, bit i of word k being bar 64k + i.
+        :param length: number of bars of the mask.
+        """
+        self.words = words
+        self.length = length
+
+    @classmethod
+    def zeros(cls, length: int) -> "SignalBitset":
+        """
+        Creates a bitset with no signals.
+        :param length: number of bars of the mask.
+        :return: the empty SignalBitset.
+        """
+        return cls(np.zeros(cls.get_word_count(length), dtype='<u8'), length)
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "SignalBitset":
+        """
+        Packs a boolean mask.
+        :param mask: boolean mask, True where there is a signal.
+        :return: the packed SignalBitset.
+        """
+        bitset = cls.zeros(len(mask))
+        bitset.pack(mask)
+        return bitset
+
+    @classmethod
+    def get_word_count(cls, length: int) -> int:
+        """
+        Gets the number of words holding a mask.
+        :param length: number of bars of the mask.
+        """
+        return -(-length // cls.WORD_BITS)
+
+    def pack(self, mask: np.ndarray) -> None:
+        """
+        Overwrites the bits with a boolean mask of the same length.
+        :param mask: boolean mask, True where there is a signal.
+        """
+        packed_mask = np.packbits(mask, bitorder='little')
+        self.words.view(np.uint8)[:len(packed_mask)] = packed_mask
+
+    def to_mask(self) -> np.ndarray:
+        """
+        Unpacks the bitset.
+        :return: boolean mask, True where there is a signal.
+        """
+        return np.unpackbits(
+            self.words.view(np.uint8), count=self.length, bitorder='little'
+        ).view(bool)
+
+    def positions(self) -> np.ndarray:
+        """
+        Gets the bars with a signal, unpacking only the words holding one.
+        :return: sorted indexes of the set bits.
+        """
+        word_indexes = np.flatnonzero(self.words)
+        bits = np.flatnonzero(np.unpackbits(
+            self.words[word_indexes].view(np.uint8), bitorder='little'
+        ))
+        return word_indexes[bits // self.WORD_BITS] * self.WORD_BITS + bits % self.WORD_BITS
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Gets the signals of some bars.
+        :param positions: indexes of the bars.
+        :return: boolean array, True where the bar has a signal.
+        """
+        bits = self.words[positions // self.WORD_BITS] >> (positions % self.WORD_BITS).astype(np.uint64)
+        return (bits & np.uint64(1)).astype(bool)
+
+    def count(self) -> int:
+        """
+        Counts the bars with a signal, with a word-at-a-time popcount.
+        """
+        words = self.words - ((self.words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        words = (words & np.uint64(0x3333333333333333)) + \
+            ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return int(((words * np.uint64(0x0101010101010101)) >> np.uint64(56)).sum())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the number of bytes of the words.
+        """
+        return self.words.nbytes
+
+    def __and__(self, other: "SignalBitset") -> "SignalBitset":
+        """
+        Returns the bars with a signal in both bitsets.
+        """
+        return SignalBitset(np.bitwise_and(self.words, other.words), self.length)
+
+    def __or__(self, other: "SignalBitset") -> "SignalBitset":
+        """
+        Returns the bars with a signal in either bitset.
+        """
+        return SignalBitset(np.bitwise_or(self.words, other.words), self.length)
+
+    def __invert__(self) -> "SignalBitset":
+        """
+        Returns the bars without a signal, keeping the bits past the last bar clear.
+        """
+        words = np.invert(self.words)
+        tail_bits = self.length % self.WORD_BITS
+        if tail_bits:
+            words[-1] &= np.uint64((1 << tail_bits) - 1)
+        return SignalBitset(words, self.length)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the bars with a signal.
+        """
+        return iter(self.positions().tolist())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars of the mask.
+        """
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks if two bitsets hold the same signals.
+        """
+        return isinstance(other, SignalBitset) and \
+            self.length == other.length and \
+            np.array_equal(self.words, other.words)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the SignalBitset instance.
+        """
+        return f"SignalBitset(length={self.length}, signals={self.count()})"
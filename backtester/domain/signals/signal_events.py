@@ -0,0 +1,101 @@
+"""
+Signal Events Entity
+"""
+from typing import Iterator
+
+import numpy as np
+
+from .signal_bitset import SignalBitset
+
+
+class SignalEvents:
+    """
+    Sparse signal mask, holding the sorted int32 indexes of the bars with a signal.
+    Events are the hand-off format of the signals of each order type to the backtest engines,
+     which walk the bars with a signal instead of scanning every bar of the series.
+    Signals are combined on SignalBitset words before they become events.
+    """
+
+    def __init__(self, indexes: np.ndarray, length: int):
+        """
+        Initializes a SignalEvents instance.
+        :param indexes: sorted, unique indexes of the bars with a signal.
+        :param length: number of bars of the mask.
+        """
+        self.indexes = np.asarray(indexes, dtype=np.int32)
+        self.length = length
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "SignalEvents":
+        """
+        Creates the events of a boolean mask.
+        :param mask: boolean mask, True where there is a signal.
+        :return: the SignalEvents of the mask.
+        """
+        return cls(np.flatnonzero(mask), len(mask))
+
+    @classmethod
+    def from_bitset(cls, bitset: SignalBitset) -> "SignalEvents":
+        """
+        Creates the events of a bitset, unpacking only its non-zero words.
+        :param bitset: SignalBitset holding the signals.
+        :return: the SignalEvents of the bitset.
+        """
+        return cls(bitset.positions(), len(bitset))
+
+    def to_mask(self) -> np.ndarray:
+        """
+        Expands the events to a boolean mask.
+        :return: boolean mask, True where there is a signal.
+        """
+        mask = np.zeros(self.length, dtype=bool)
+        mask[self.indexes] = True
+        return mask
+
+    def positions(self) -> np.ndarray:
+        """
+        Gets the bars with a signal.
+        :return: sorted indexes of the bars.
+        """
+        return self.indexes
+
+    def difference(self, other: "SignalEvents") -> "SignalEvents":
+        """
+        Gets the bars with a signal in this event list but not in the other.
+        """
+        positions = np.searchsorted(other.indexes, self.indexes)
+        found = positions < len(other.indexes)
+        found[found] = other.indexes[positions[found]] == self.indexes[found]
+        return SignalEvents(self.indexes[~found], self.length)
+
+    def __sub__(self, other: "SignalEvents") -> "SignalEvents":
+        """
+        Returns the bars with a signal in this event list but not in the other.
+        """
+        return self.difference(other)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the bars with a signal.
+        """
+        return iter(self.indexes.tolist())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars with a signal.
+        """
+        return len(self.indexes)
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks if two event lists hold the same signals.
+        """
+        return isinstance(other, SignalEvents) and \
+            self.length == other.length and \
+            np.array_equal(self.indexes, other.indexes)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the SignalEvents instance.
+        """
+        return f"SignalEvents(length={self.length}, signals={len(self.indexes)})"
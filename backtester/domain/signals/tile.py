@@ -2,10 +2,8 @@
 Tile Entity
 """
 import hashlib
-import os
-from typing import List
-
-import pandas as pd
+import json
+import numpy as np
 
 from backtester.api.requests.trading_system import RuleProperty
 from backtester.domain.enums.rule_property_type import RulePropertyType
@@ -27,11 +25,11 @@ class Tile:
         :param rule_id: ID of the rule
         """
         self.rule_id = rule_id
-        self.id = hashlib.sha256(os.urandom(32)).hexdigest()
         self.type = RulePropertyType(rule_property.type)
         self.name = rule_property.name
         self.parameters = rule_property.parameters
-        self.mask: pd.Series = pd.Series()
+        self.id = self._get_content_id()
+        self.mask: np.ndarray = np.empty(0, dtype=np.float64)
 
     def __eq__(self, other) -> bool:
         """
@@ -45,12 +43,25 @@ class Tile:
                 self.parameters == other.parameters
         )
 
-    def set_mask(self, mask: List) -> None:
+    def _get_content_id(self) -> str:
+        """
+        Derives the ID of the tile from its type, name and parameters,
+        so tiles describing the same indicator share their ID.
+        :return: hex digest identifying the content of the tile.
+        """
+        content = json.dumps(
+            [self.type.value, self.name, self.parameters.dict()],
+            sort_keys=True
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def set_mask(self, mask: np.ndarray) -> None:
         """
         Sets the mask for the tile.
-        :param mask: List of boolean values representing the mask.
+        :param mask: values of the indicator, NaN where it is undefined.
+         float64 arrays are kept without a copy.
         """
-        self.mask = pd.Series(mask)
+        self.mask = np.asarray(mask, dtype=np.float64)
 
     def __repr__(self) -> str:
         """
@@ -0,0 +1,244 @@
+"""
+Breach Index entity for backtesting strategies.
+"""
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from .thresholds import Thresholds
+
+
+class BreachIndex:
+    """
+    Range-query index over the log-cumulative high and low returns of a ticker dataset.
+    Given the entry bar of a trade and its thresholds, finds the first trading period
+    at which the trade hits its upper or lower threshold in logarithmic time.
+
+    The log returns of a trade before a trading period are the prefix sum of the log close growth,
+    so hitting a threshold reduces to comparing a single path value against a per-trade constant.
+    Each path is split in blocks, and a sparse table over the block maxima finds
+    the first block holding a hit, which is then scanned.
+    Queries take numpy arrays, so many trades or thresholds are resolved in one batch.
+    """
+    BLOCK_SIZE = 64
+
+    def __init__(
+            self,
+            first_growth: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            growth: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    ):
+        """
+        Initializes a BreachIndex instance.
+        :param first_growth: close, high and low growth of a bar when it is the first trading period.
+        :param growth: close, high and low growth of a bar when it is a following trading period.
+        """
+        first_log_close, first_log_high, first_log_low = (self._log(column) for column in first_growth)
+        log_close, log_high, log_low = (self._log(column) for column in growth)
+
+        self.bars = len(log_close)
+        self.prefix = np.cumsum(log_close)
+        previous_prefix = np.concatenate(([0.0], self.prefix[:-1]))
+        self.first_log_close = first_log_close
+        self.first_log_high = first_log_high
+        self.first_log_low = first_log_low
+        self.high_path = self._pad(previous_prefix + log_high)
+        # The low path is negated, so both paths are searched for the first value at least a target
+        self.low_path = self._pad(-(previous_prefix + log_low))
+        self.high_table = self._build_table(self.high_path)
+        self.low_table = self._build_table(self.low_path)
+
+    def log_returns(
+            self,
+            entry_index: Union[int, np.ndarray],
+            exit_index: Union[int, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """
+        Calculates the log returns of trades after their exit trading period, without hitting a threshold.
+        :param entry_index: index of the first trading period of the trades.
+        :param exit_index: index of the last trading period of the trades.
+        :return: log returns of the trades.
+        """
+        return self.first_log_close[entry_index] + self.prefix[exit_index] - self.prefix[entry_index]
+
+    def first_breach(
+            self,
+            entry_index: np.ndarray,
+            last_index: np.ndarray,
+            upper: np.ndarray,
+            lower: np.ndarray,
+            tolerance: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the first trading period at which trades hit their upper or lower threshold.
+        :param entry_index: index of the first trading period of the trades.
+        :param last_index: index of the last trading period searched for each trade.
+        :param upper: upper threshold of each trade.
+        :param lower: lower threshold of each trade.
+        :param tolerance: log distance a path value must exceed a threshold by to count as a hit.
+         A positive tolerance only returns hits that are certain despite rounding errors.
+        :return: index of the first hit of the upper and of the lower threshold,
+         or last index + 1 where the threshold is not hit.
+        """
+        entry_index, last_index = (np.asarray(index, dtype=np.int64) for index in (entry_index, last_index))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_upper = np.log(np.asarray(upper, dtype=np.float64)) + tolerance
+            log_lower = np.log(np.asarray(lower, dtype=np.float64)) - tolerance
+
+        upper_hit = np.where(
+            self.first_log_high[entry_index] >= log_upper,
+            entry_index,
+            self._first_at_least(
+                path=self.high_path,
+                table=self.high_table,
+                start=entry_index + 1,
+                stop=last_index,
+                target=log_upper - self.first_log_close[entry_index] + self.prefix[entry_index]
+            )
+        )
+        lower_hit = np.where(
+            self.first_log_low[entry_index] <= log_lower,
+            entry_index,
+            self._first_at_least(
+                path=self.low_path,
+                table=self.low_table,
+                start=entry_index + 1,
+                stop=last_index,
+                target=-(log_lower - self.first_log_close[entry_index] + self.prefix[entry_index])
+            )
+        )
+        upper_hit = np.minimum(upper_hit, last_index + 1)
+        lower_hit = np.minimum(lower_hit, last_index + 1)
+        return upper_hit, lower_hit
+
+    def first_exit(
+            self,
+            entry_index: int,
+            last_index: int,
+            thresholds: Thresholds,
+            tolerance: float = 0.0
+    ) -> int:
+        """
+        Finds the first trading period at which a trade hits either of its thresholds.
+        :param entry_index: index of the first trading period of the trade.
+        :param last_index: index of the last trading period searched.
+        :param thresholds: thresholds of the trade.
+        :param tolerance: log distance a path value must exceed a threshold by to count as a hit.
+        :return: index of the first hit, or last index + 1 if no threshold is hit.
+        """
+        upper_hit, lower_hit = self.first_breach(
+            entry_index=np.array([entry_index]),
+            last_index=np.array([last_index]),
+            upper=np.array([thresholds.upper]),
+            lower=np.array([thresholds.lower]),
+            tolerance=tolerance
+        )
+        return int(min(upper_hit[0], lower_hit[0]))
+
+    def _first_at_least(
+            self,
+            path: np.ndarray,
+            table: List[np.ndarray],
+            start: np.ndarray,
+            stop: np.ndarray,
+            target: np.ndarray
+    ) -> np.ndarray:
+        """
+        Finds the first index between start and stop, inclusive, where the path is at least the target.
+        :param path: padded path values.
+        :param table: sparse table of the path's block maxima.
+        :param start: first index searched for each query.
+        :param stop: last index searched for each query.
+        :param target: target value of each query.
+        :return: the first index found, or stop + 1 where there is none.
+        """
+        block_size = self.BLOCK_SIZE
+        start = np.minimum(start, stop + 1)
+        result = np.full(len(start), -1, dtype=np.int64)
+
+        first_block = start // block_size
+        first_block_hit = self._scan_blocks(path, first_block, start, stop, target)
+        result = np.where(first_block_hit >= 0, first_block_hit, result)
+
+        pending = (result < 0) & (start <= stop)
+        block = first_block + 1
+        last_block = stop // block_size
+        for level in range(len(table) - 1, -1, -1):
+            step = 1 << level
+            level_table = table[level]
+            fits = pending & (block + step - 1 <= last_block)
+            skip = np.zeros(len(start), dtype=bool)
+            skip[fits] = level_table[block[fits]] < target[fits]
+            block = np.where(skip, block + step, block)
+
+        pending &= block <= last_block
+        pending_indexes = np.flatnonzero(pending)
+        pending[pending_indexes] = table[0][block[pending_indexes]] >= target[pending_indexes]
+        block_hit = self._scan_blocks(path, block, block * block_size, stop, target)
+        result = np.where(pending, block_hit, result)
+        return np.where(result >= 0, result, stop + 1)
+
+    def _scan_blocks(
+            self,
+            path: np.ndarray,
+            block: np.ndarray,
+            start: np.ndarray,
+            stop: np.ndarray,
+            target: np.ndarray
+    ) -> np.ndarray:
+        """
+        Scans a block of the path per query for the first index where the path is at least the target.
+        :param path: padded path values.
+        :param block: block scanned for each query.
+        :param start: first index searched for each query.
+        :param stop: last index searched for each query.
+        :param target: target value of each query.
+        :return: the first index found, or -1 where there is none.
+        """
+        block_size = self.BLOCK_SIZE
+        block = np.minimum(block, len(path) // block_size - 1)
+        indexes = block[:, None] * block_size + np.arange(block_size)
+        in_range = (indexes >= start[:, None]) & (indexes <= stop[:, None])
+        hits = in_range & (path[indexes] >= target[:, None])
+        found = hits.any(axis=1)
+        return np.where(found, indexes[np.arange(len(block)), np.argmax(hits, axis=1)], -1)
+
+    def _pad(self, path: np.ndarray) -> np.ndarray:
+        """
+        Pads a path with -inf up to a whole number of blocks.
+        :param path: path values.
+        :return: padded path values.
+        """
+        blocks = max(1, -(-len(path) // self.BLOCK_SIZE))
+        padded = np.full(blocks * self.BLOCK_SIZE, -np.inf)
+        padded[:len(path)] = np.nan_to_num(path, nan=-np.inf)
+        return padded
+
+    def _build_table(self, path: np.ndarray) -> List[np.ndarray]:
+        """
+        Builds a sparse table of block maxima, level k holding the maxima of 2^k consecutive blocks.
+        :param path: padded path values.
+        :return: levels of the sparse table.
+        """
+        table = [path.reshape(-1, self.BLOCK_SIZE).max(axis=1)]
+        step = 1
+        while 2 * step <= len(table[0]):
+            previous_level = table[-1]
+            table.append(np.maximum(previous_level[:-step], previous_level[step:]))
+            step *= 2
+        return table
+
+    @staticmethod
+    def _log(growth: np.ndarray) -> np.ndarray:
+        """
+        Converts growth factors to log growth.
+        :param growth: growth factors.
+        :return: log growth, -inf where the growth is not positive.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(np.where(growth > 0, growth, 0.0))
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the BreachIndex instance.
+        """
+        return f"BreachIndex(bars={self.bars}, levels={len(self.high_table)})"
@@ -3,4 +3,6 @@ Imports for the backtesting domain presenters module.
 """
 from .strategy_grouped_stats import StrategyGroupedStats
 from .strategy_stats import StrategyStats
+from .target_sweep_stats import TargetSweepStats
 from .trade_stats import TradeStats
+from .trading_period_stats import TradingPeriodStats
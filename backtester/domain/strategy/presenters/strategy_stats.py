@@ -62,9 +62,9 @@ class StrategyStats(BaseModel):
                 "Current Amount", "Currency", strategy.current_amount
             ),
             trade_stats={
-                i: TradeStats.from_trade(trade)
-                for i, trade in enumerate(strategy.all_trades)
-            },
+                i: TradeStats.from_ledger(strategy.ledger, i)
+                for i in range(len(strategy.ledger))
+            } if strategy.trade_detail.keep_trades else {},
         )
 
     def __repr__(self) -> str:
@@ -0,0 +1,61 @@
+"""
+TargetSweepStats Presenter
+"""
+from typing import Any, List
+
+from pydantic import BaseModel
+
+from backtester.domain.strategy.strategy import Strategy
+
+
+class TargetSweepStats(BaseModel):
+    """
+    Represents the statistics of every combination of a trade target sweep, as a compact table.
+    """
+    columns: List[str]
+    rows: List[List[Any]]
+
+    @classmethod
+    def from_strategies(cls, strategies: List[Strategy]) -> "TargetSweepStats":
+        """
+        Creates a TargetSweepStats instance from the strategies of the sweep.
+        :param strategies: Strategy entities, one per combination of the sweep.
+        :return: TargetSweepStats instance with a row per strategy.
+        """
+        return cls(
+            columns=[
+                "take_profit",
+                "stop_loss",
+                "trade_size_type",
+                "trade_size_value",
+                "trades",
+                "wins",
+                "losses",
+                "win_rate",
+                "percentage_returns",
+                "absolute_returns",
+                "current_amount",
+            ],
+            rows=[
+                [
+                    strategy.trade_targets.take_profit,
+                    strategy.trade_targets.stop_loss,
+                    strategy.trade_size.type.value,
+                    strategy.trade_size.value,
+                    strategy.trades,
+                    strategy.wins,
+                    strategy.losses,
+                    strategy.win_rate,
+                    strategy.percentage_returns,
+                    strategy.absolute_returns,
+                    strategy.current_amount,
+                ]
+                for strategy in strategies
+            ]
+        )
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the TargetSweepStats instance.
+        """
+        return f"TargetSweepStats(combinations={len(self.rows)})"
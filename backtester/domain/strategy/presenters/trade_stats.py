@@ -1,11 +1,17 @@
 """
 TradeStats Presenter
 """
+from typing import Any, Dict, List, Optional
+
 from pydantic import BaseModel
 
-from backtester.domain.strategy.trade import Trade
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.trade_result import TradeResult
+from backtester.domain.enums.trading_period_result import TradingPeriodResult
+from backtester.domain.strategy.trade_ledger import TradeLedger
 
 from .stats_field import StatsField
+from .trading_period_stats import TradingPeriodStats
 
 
 class TradeStats(BaseModel):
@@ -28,13 +34,15 @@ class TradeStats(BaseModel):
     exit_period_close: StatsField
     exit_period_high: StatsField
     exit_period_low: StatsField
+    trading_period_stats: Optional[List[TradingPeriodStats]] = None
 
     @classmethod
-    def from_trade(cls, trade: Trade) -> "TradeStats":
+    def from_ledger(cls, ledger: TradeLedger, trade_index: int) -> "TradeStats":
         """
-        Creates a TradeStats instance from a Trade entity.
-        :param trade: Trade entity containing the statistics to be converted.
-        :return: TradeStats instance with statistics from the Trade entity.
+        Creates a TradeStats instance from a trade of a TradeLedger.
+        :param ledger: TradeLedger containing the trade to be converted.
+        :param trade_index: index of the trade in the ledger.
+        :return: TradeStats instance with statistics from the ledger's trade.
         """
 
         def wrap(name: str, typ: str, val) -> StatsField:
@@ -47,62 +55,87 @@ class TradeStats(BaseModel):
             """
             return StatsField(display_name=name, type=typ, value=val)
 
+        def value(column: str):
+            """
+            Reads the value of a ledger column for the trade.
+            :param column: name of the ledger column.
+            :return: the value as a python scalar.
+            """
+            return ledger[column][trade_index].item()
+
+        entry_amount = value('entry_amount')
+        current_amount = value('current_amount')
+        trading_period_records = ledger.trading_period_records(trade_index)
         return cls(
             order_type=wrap(
-                "Order Type", "String", trade.order_type.value
+                "Order Type", "String", OrderType.from_code(value('order_type')).value
             ),
             starting_portfolio_amount=wrap(
                 "Starting Portfolio Amount",
                 "Currency",
-                trade.starting_portfolio_amount
+                value('starting_portfolio_amount')
             ),
             current_portfolio_amount=wrap(
                 "Current Portfolio Amount",
                 "Currency",
-                trade.current_portfolio_amount
+                value('current_portfolio_amount')
             ),
             entry_amount=wrap(
-                "Entry Amount", "Currency", trade.entry_amount
+                "Entry Amount", "Currency", entry_amount
             ),
             current_amount=wrap(
-                "Exit Amount", "Currency", trade.current_amount
+                "Exit Amount", "Currency", current_amount
             ),
 
             percentage_returns=wrap(
-                "ROI %", "Percentage", trade.percentage_returns
+                "ROI %", "Percentage", value('trade_returns') - 1
             ),
             absolute_returns=wrap(
-                "ROI", "Currency", trade.absolute_returns
+                "ROI", "Currency", current_amount - entry_amount
             ),
             trade_result=wrap(
-                "Result", "String", trade.trade_result.value
+                "Result", "String", TradeResult.from_code(value('trade_result')).value
             ),
             starting_period=wrap(
-                "Entered at", "Date", trade.starting_period
+                "Entered at", "Date", ledger.entry_date(trade_index)
             ),
             ending_period=wrap(
-                "Exited at", "Date", trade.ending_period
+                "Exited at", "Date", ledger.exit_date(trade_index)
             ),
             trading_periods=wrap(
-                "Trading Periods", "Integer", len(trade.trading_periods)
+                "Trading Periods", "Integer", value('trading_periods')
             ),
             exit_period_result=wrap(
-                "Exit Reason", "String", trade.exit_period_result.value
+                "Exit Reason", "String", TradingPeriodResult.from_code(value('exit_reason')).value
             ),
             starting_period_open=wrap(
-                "Entry Period Open", "Currency", trade.starting_period_open
+                "Entry Period Open", "Currency", value('entry_price')
             ),
             exit_period_close=wrap(
-                "Exit Period Close", "Currency", trade.exit_period_close
+                "Exit Period Close", "Currency", value('exit_close')
             ),
             exit_period_high=wrap(
-                "Exit Period High", "Currency", trade.exit_period_high
+                "Exit Period High", "Currency", value('exit_high')
             ),
             exit_period_low=wrap(
-                "Exit Period Low", "Currency", trade.exit_period_low
+                "Exit Period Low", "Currency", value('exit_low')
             ),
+            trading_period_stats=[
+                TradingPeriodStats.from_record(date, trade_returns.item(), result_code.item())
+                for date, trade_returns, result_code in zip(*trading_period_records)
+            ] if trading_period_records is not None else None,
         )
 
+    def dict(self, **kwargs) -> Dict[str, Any]:
+        """
+        Converts the statistics to a dictionary,
+         leaving the trading period statistics out unless the trading periods were kept.
+        """
+        trade_stats = super().dict(**kwargs)
+        if self.trading_period_stats is None:
+            trade_stats.pop('trading_period_stats', None)
+        return trade_stats
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the TradeStats instance.
@@ -124,5 +157,6 @@ class TradeStats(BaseModel):
             f"starting_period_open={self.starting_period_open}, "
             f"exit_period_close={self.exit_period_close}, "
             f"exit_period_high={self.exit_period_high}, "
-            f"exit_period_low={self.exit_period_low})"
+            f"exit_period_low={self.exit_period_low}, "
+            f"trading_period_stats={self.trading_period_stats})"
         )
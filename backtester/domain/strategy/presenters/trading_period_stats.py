@@ -0,0 +1,51 @@
+"""
+TradingPeriodStats Presenter
+"""
+from typing import Any
+
+from pydantic import BaseModel
+
+from backtester.domain.enums.trading_period_result import TradingPeriodResult
+
+from .stats_field import StatsField
+
+
+class TradingPeriodStats(BaseModel):
+    """
+    Represents the statistics of a single trading period of a trade after backtesting.
+    """
+    period: StatsField
+    percentage_returns: StatsField
+    result: StatsField
+
+    @classmethod
+    def from_record(cls, date: Any, trade_returns: float, result_code: int) -> "TradingPeriodStats":
+        """
+        Creates a TradingPeriodStats instance from a trading period recorded in a TradeLedger.
+        :param date: date of the trading period.
+        :param trade_returns: returns of the trade after the trading period.
+        :param result_code: code of the trading period's result.
+        :return: TradingPeriodStats instance with statistics from the recorded trading period.
+        """
+        return cls(
+            period=StatsField(
+                display_name="Period", type="Date", value=date
+            ),
+            percentage_returns=StatsField(
+                display_name="ROI %", type="Percentage", value=trade_returns - 1
+            ),
+            result=StatsField(
+                display_name="Result", type="String", value=TradingPeriodResult.from_code(result_code).value
+            ),
+        )
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the TradingPeriodStats instance.
+        """
+        return (
+            f"TradingPeriodStats("
+            f"period={self.period}, "
+            f"percentage_returns={self.percentage_returns}, "
+            f"result={self.result})"
+        )
@@ -1,9 +1,11 @@
 """
 Strategy entity for backtesting in the strategy service.
 """
-
 from .trade import Trade
+from .trade_ledger import TradeLedger
 from backtester.api.requests.portfolio_management import PortfolioManagement, TradeSize, TradeTargets
+from backtester.domain.enums.trade_detail import TradeDetail
+from backtester.domain.ticker.bar_dates import BarDates
 
 
 class Strategy:
@@ -14,10 +16,14 @@ class Strategy:
     def __init__(
             self,
             portfolio_management: PortfolioManagement,
+            bar_dates: BarDates,
+            trade_detail: TradeDetail = TradeDetail.TRADES
     ):
         """
         Initializes a Strategy instance.
         :param portfolio_management: Portfolio object containing initial amounts and trade settings.
+        :param bar_dates: dates of the bars the strategy is backtested on.
+        :param trade_detail: level of trade detail kept for the strategy.
         """
         self.starting_amount = portfolio_management.starting_amount
         self.current_amount = portfolio_management.starting_amount
@@ -26,7 +32,11 @@ class Strategy:
         self.trades = 0
         self.wins = 0
         self.losses = 0
-        self.all_trades = []
+        self.trade_detail = trade_detail
+        self.ledger = TradeLedger(
+            bar_dates=bar_dates,
+            keep_trading_periods=trade_detail.keep_trading_periods
+        )
 
     @property
     def win_rate(self) -> float:
@@ -80,12 +90,22 @@ class Strategy:
         """
         self.losses += 1
 
+    def add_trade_results(self, wins: int, losses: int) -> None:
+        """
+        Increments the trade, win and loss counts for a batch of trades.
+        :param wins: number of winning trades in the batch.
+        :param losses: number of losing trades in the batch.
+        """
+        self.trades += wins + losses
+        self.wins += wins
+        self.losses += losses
+
     def add_trade_object(self, trade: Trade) -> None:
         """
-        Adds a Trade object to the strategy's list of trades.
+        Records a Trade object in the strategy's trade ledger.
         :param trade: Trade object to be added to the strategy.
         """
-        self.all_trades.append(trade)
+        self.ledger.append_trade(trade)
 
     def __repr__(self):
         """
@@ -1,6 +1,8 @@
 """
 Thresholds entity for backtesting strategies.
 """
+from backtester.api.requests.portfolio_management import TradeTargets
+from backtester.domain.enums.order_type import OrderType
 
 
 class Thresholds:
@@ -18,3 +20,24 @@ class Thresholds:
         """
         self.upper = upper
         self.lower = lower
+
+    @classmethod
+    def from_trade_targets(
+            cls,
+            order_type: OrderType,
+            trade_targets: TradeTargets
+    ) -> "Thresholds":
+        """
+        Calculates the thresholds of a trade based on its order type and trade targets.
+        :param order_type: type of order for the trade (buy or sell).
+        :param trade_targets: trade targets including take profit and stop loss values.
+        :return: Thresholds object containing upper and lower thresholds.
+        """
+        lower_threshold = 1 + trade_targets.stop_loss \
+            if order_type == OrderType.BUY else 1 - trade_targets.take_profit
+        upper_threshold = 1 + trade_targets.take_profit \
+            if order_type == OrderType.BUY else 1 - trade_targets.stop_loss
+        return cls(
+            upper=upper_threshold,
+            lower=lower_threshold
+        )
@@ -25,7 +25,8 @@ class Trade:
             starting_portfolio_amount: float,
             trade_size: TradeSize,
             trade_targets: TradeTargets,
-            order_type: OrderType
+            order_type: OrderType,
+            keep_trading_periods: bool = True
     ):
         """
         Initializes a Trade instance.
@@ -33,15 +34,24 @@ class Trade:
         :param trade_size: trade size settings, either dynamic or static.
         :param trade_targets: trade targets including take profit and stop loss values.
         :param order_type: type of order for the trade (buy or sell).
+        :param keep_trading_periods: whether every trading period of the trade is kept,
+         or only its first and last trading periods.
         """
         self.id = hashlib.sha256(os.urandom(32)).hexdigest()
         self.starting_portfolio_amount = starting_portfolio_amount
         self.trade_size_type = TradeSizeType(trade_size.type)
         self.trade_size_value = trade_size.value
+        self.trade_targets = trade_targets
         self.take_profit = trade_targets.take_profit
         self.stop_loss = trade_targets.stop_loss
         self.order_type = order_type
+        self.thresholds = Thresholds.from_trade_targets(
+            order_type=self.order_type,
+            trade_targets=self.trade_targets
+        )
+        self.keep_trading_periods = keep_trading_periods
         self.trading_periods: List[TradingPeriod] = []
+        self.trading_periods_count = 0
         self.trade_returns = 1
 
     @property
@@ -100,21 +110,6 @@ class Trade:
             return TradeResult.LOSS
         return TradeResult.UNDETERMINED
 
-    @property
-    def thresholds(self) -> Thresholds:
-        """
-        Calculates the thresholds for the trade based on the order type and trade targets.
-        :return: Thresholds object containing upper and lower thresholds.
-        """
-        lower_threshold = 1 + self.stop_loss \
-            if self.order_type == OrderType.BUY else 1 - self.take_profit
-        upper_threshold = 1 + self.take_profit \
-            if self.order_type == OrderType.BUY else 1 - self.stop_loss
-        return Thresholds(
-            upper=upper_threshold,
-            lower=lower_threshold
-        )
-
     @property
     def starting_period(self) -> Optional[datetime]:
         """
@@ -130,6 +125,20 @@ class Trade:
         """
         return self.trading_periods[-1].start_date if self.trading_periods else None
 
+    @property
+    def entry_index(self) -> Optional[int]:
+        """
+        Gets the index of the first trading period of the trade in the ticker data.
+        """
+        return self.trading_periods[0].index if self.trading_periods else None
+
+    @property
+    def exit_index(self) -> Optional[int]:
+        """
+        Gets the index of the last trading period of the trade in the ticker data.
+        """
+        return self.trading_periods[-1].index if self.trading_periods else None
+
     @property
     def exit_period_result(self) -> Optional[TradingPeriodResult]:
         """
@@ -189,10 +198,16 @@ class Trade:
     def add_trading_period(self, trading_period) -> None:
         """
         Adds a trading period to the trade.
+        Unless every trading period is kept, the new trading period
+         replaces the previous last trading period of the trade.
         :param trading_period: the TradingPeriod object to add.
         :return: None
         """
-        self.trading_periods.append(trading_period)
+        if self.keep_trading_periods or len(self.trading_periods) < 2:
+            self.trading_periods.append(trading_period)
+        else:
+            self.trading_periods[-1] = trading_period
+        self.trading_periods_count += 1
 
     def __repr__(self) -> str:
         """
@@ -205,5 +220,5 @@ class Trade:
             f"take_profit={self.take_profit}, "
             f"stop_loss={self.stop_loss}, "
             f"order_type={self.order_type}, "
-            f"trading_periods_count={len(self.trading_periods)})"
+            f"trading_periods_count={self.trading_periods_count})"
         )
@@ -0,0 +1,207 @@
+"""
+Trade Ledger entity for backtesting module.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .trade import Trade
+
+
+class TradeLedger:
+    """
+    Columnar record of the trades of a strategy.
+    Each column is a typed numpy array holding one element per trade,
+    so the trades of a backtest are kept without any per-trade or per-bar objects.
+    Optionally, the trading periods of the trades are recorded in flat columns,
+    holding one element per trading period.
+    """
+    COLUMNS = {
+        'order_type': np.int8,
+        'entry_index': np.int64,
+        'exit_index': np.int64,
+        'trading_periods': np.int64,
+        'entry_price': np.float64,
+        'exit_close': np.float64,
+        'exit_high': np.float64,
+        'exit_low': np.float64,
+        'trade_returns': np.float64,
+        'exit_reason': np.int8,
+        'trade_result': np.int8,
+        'starting_portfolio_amount': np.float64,
+        'entry_amount': np.float64,
+        'current_amount': np.float64,
+        'current_portfolio_amount': np.float64,
+    }
+    TRADING_PERIOD_COLUMNS = {
+        'period_returns': np.float64,
+        'period_result': np.int8,
+    }
+
+    def __init__(
+            self,
+            bar_dates: np.ndarray,
+            keep_trading_periods: bool = False,
+            capacity: int = 64
+    ):
+        """
+        Initializes an empty TradeLedger.
+        :param bar_dates: dates of the bars the trades are recorded on,
+         used to resolve the entry and exit indexes of the trades.
+        :param keep_trading_periods: whether the trading periods of the trades are recorded.
+        :param capacity: number of trades the columns are initially allocated for.
+        """
+        self.bar_dates = bar_dates
+        self.keep_trading_periods = keep_trading_periods
+        self.size = 0
+        self.trading_periods_size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()
+        }
+        self._trading_period_columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity if keep_trading_periods else 0, dtype=dtype)
+            for name, dtype in self.TRADING_PERIOD_COLUMNS.items()
+        }
+        self._trading_period_offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        """
+        Returns the number of trades in the ledger.
+        """
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Returns a view of a column of the ledger.
+        :param name: name of the column.
+        """
+        if name in self.TRADING_PERIOD_COLUMNS:
+            return self._trading_period_columns[name][:self.trading_periods_size]
+        return self._columns[name][:self.size]
+
+    def append(self, **values: Any) -> None:
+        """
+        Appends a single trade to the ledger.
+        :param values: value of every column for the trade.
+        """
+        self._reserve(self._columns, self.size, self.size + 1)
+        for name in self.COLUMNS:
+            self._columns[name][self.size] = values[name]
+        self.size += 1
+
+    def extend(self, **columns: np.ndarray) -> None:
+        """
+        Appends a batch of trades to the ledger.
+        :param columns: array of every column for the trades.
+        """
+        count = len(columns['entry_index'])
+        self._reserve(self._columns, self.size, self.size + count)
+        for name in self.COLUMNS:
+            self._columns[name][self.size:self.size + count] = columns[name]
+        self.size += count
+
+    def extend_trading_periods(self, **columns: np.ndarray) -> None:
+        """
+        Appends the trading periods of one or more trades to the ledger.
+        Trading periods are expected in the same order as their trades.
+        :param columns: array of every trading period column.
+        """
+        if not self.keep_trading_periods:
+            return
+        count = len(columns['period_returns'])
+        self._reserve(self._trading_period_columns, self.trading_periods_size, self.trading_periods_size + count)
+        for name in self.TRADING_PERIOD_COLUMNS:
+            self._trading_period_columns[name][
+                self.trading_periods_size:self.trading_periods_size + count
+            ] = columns[name]
+        self.trading_periods_size += count
+
+    def append_trade(self, trade: Trade) -> None:
+        """
+        Appends a finished Trade to the ledger.
+        :param trade: Trade object to be recorded.
+        """
+        self.append(
+            order_type=trade.order_type.code,
+            entry_index=trade.entry_index,
+            exit_index=trade.exit_index,
+            trading_periods=trade.trading_periods_count,
+            entry_price=trade.starting_period_open,
+            exit_close=trade.exit_period_close,
+            exit_high=trade.exit_period_high,
+            exit_low=trade.exit_period_low,
+            trade_returns=trade.trade_returns,
+            exit_reason=trade.exit_period_result.code,
+            trade_result=trade.trade_result.code,
+            starting_portfolio_amount=trade.starting_portfolio_amount,
+            entry_amount=trade.entry_amount,
+            current_amount=trade.current_amount,
+            current_portfolio_amount=trade.current_portfolio_amount,
+        )
+        self.extend_trading_periods(
+            period_returns=np.array(
+                [trading_period.trading_period_returns for trading_period in trade.trading_periods],
+                dtype=np.float64
+            ),
+            period_result=np.array(
+                [trading_period.result.code for trading_period in trade.trading_periods],
+                dtype=np.int8
+            ),
+        )
+
+    def entry_date(self, trade_index: int) -> Any:
+        """
+        Gets the date of the first trading period of a trade.
+        :param trade_index: index of the trade in the ledger.
+        """
+        return self.bar_dates[self['entry_index'][trade_index]]
+
+    def exit_date(self, trade_index: int) -> Any:
+        """
+        Gets the date of the last trading period of a trade.
+        :param trade_index: index of the trade in the ledger.
+        """
+        return self.bar_dates[self['exit_index'][trade_index]]
+
+    def trading_period_records(self, trade_index: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Gets the recorded trading periods of a trade.
+        :param trade_index: index of the trade in the ledger.
+        :return: dates, trade returns and result codes of the trading periods,
+         or None if trading periods are not recorded.
+        """
+        if not self.keep_trading_periods:
+            return None
+        if self._trading_period_offsets is None or len(self._trading_period_offsets) != self.size + 1:
+            self._trading_period_offsets = np.concatenate(([0], np.cumsum(self['trading_periods'])))
+        start = int(self._trading_period_offsets[trade_index])
+        stop = int(self._trading_period_offsets[trade_index + 1])
+        entry_index = int(self['entry_index'][trade_index])
+        return (
+            self.bar_dates[entry_index:entry_index + stop - start],
+            self['period_returns'][start:stop],
+            self['period_result'][start:stop],
+        )
+
+    @staticmethod
+    def _reserve(columns: Dict[str, np.ndarray], size: int, capacity: int) -> None:
+        """
+        Grows a set of columns, doubling their size until they fit the capacity.
+        :param columns: columns to grow, replaced in place.
+        :param size: number of elements in use in the columns.
+        :param capacity: number of elements the columns should fit.
+        """
+        current_capacity = len(next(iter(columns.values())))
+        if capacity <= current_capacity:
+            return
+        new_capacity = max(capacity, 2 * current_capacity)
+        for name, column in columns.items():
+            grown_column = np.empty(new_capacity, dtype=column.dtype)
+            grown_column[:size] = column[:size]
+            columns[name] = grown_column
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the TradeLedger instance.
+        """
+        return f"TradeLedger(trades={self.size})"
@@ -1,11 +1,10 @@
 """
 Trading Period Entity
 """
-import pandas as pd
-
 from backtester.domain.enums.order_type import OrderType
 from backtester.domain.enums.trading_period_result import TradingPeriodResult
 from backtester.domain.strategy.thresholds import Thresholds
+from backtester.domain.ticker.bar_array import BarArray
 
 
 class TradingPeriod:
@@ -18,7 +17,8 @@ class TradingPeriod:
             trade_returns: float,
             order_type: OrderType,
             thresholds: Thresholds,
-            trading_period_data: pd.Series,
+            bars: BarArray,
+            index: int,
             is_first_trading_period: bool
     ):
         """
@@ -26,31 +26,31 @@ class TradingPeriod:
         :param trade_returns: current returns from the trade.
         :param order_type: type of order for the trade (buy or sell).
         :param thresholds: thresholds for the trading period, including upper and lower limits.
-        :param trading_period_data: data for the trading period,
-         including date, signal, and price information.
+        :param bars: bars of the ticker data, including date, signal, and price information.
+        :param index: index of the bar of the trading period.
         :param is_first_trading_period: indicates if this is the first trading period
         """
         self.trade_returns = trade_returns
-        self.trading_period_data = trading_period_data
         self.upper_threshold = thresholds.upper
         self.lower_threshold = thresholds.lower
         self.order_type = order_type
         self.is_first_trading_period = is_first_trading_period
-        self.start_date = trading_period_data['date']
-        self.trading_period_signal: OrderType = trading_period_data['signal']
-        self.ticker_price_open = trading_period_data['open']
-        self.ticker_price_close = trading_period_data['close']
-        self.ticker_price_high = trading_period_data['high']
-        self.ticker_price_low = trading_period_data['low']
-        self.returns_on_low = 1 + trading_period_data[
+        self.index = index
+        self.start_date = bars.dates[index]
+        self.trading_period_signal = OrderType.from_code(int(bars['signal'][index]))
+        self.ticker_price_open = float(bars['open'][index])
+        self.ticker_price_close = float(bars['close'][index])
+        self.ticker_price_high = float(bars['high'][index])
+        self.ticker_price_low = float(bars['low'][index])
+        self.returns_on_low = 1 + float(bars[
             "returns_on_low_same_day" if is_first_trading_period else "returns_on_low"
-        ]
-        self.returns_on_high = 1 + trading_period_data[
+        ][index])
+        self.returns_on_high = 1 + float(bars[
             "returns_on_high_same_day" if is_first_trading_period else "returns_on_high"
-        ]
-        self.returns_on_close = 1 + trading_period_data[
+        ][index])
+        self.returns_on_close = 1 + float(bars[
             "returns_on_close_same_day" if is_first_trading_period else "returns_on_close"
-        ]
+        ][index])
 
     @property
     def result(self) -> TradingPeriodResult:
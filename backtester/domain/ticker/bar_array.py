@@ -0,0 +1,119 @@
+"""
+Bar Array Entity
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from .bar_dates import BarDates
+
+
+class BarArray:
+    """
+    Price data of a ticker as typed numpy columns, the data the services pass between stages.
+    Every bar takes its int64 date, the float64 open, high, low and close prices,
+     the float64 returns derived from them, and the int8 code of its signal,
+     instead of a row of python objects.
+    Dates are formatted and signal codes converted to order types only when they are presented.
+    Processed bars have no signals: the signals of a backtest are an overlay on the processed columns,
+     so the processed columns are shared, not copied, between the bar arrays of the stages and of the requests.
+    """
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+    RETURNS_COLUMNS = (
+        'returns_on_close_same_day',
+        'returns_on_close',
+        'returns_on_high_same_day',
+        'returns_on_low_same_day',
+        'returns_on_high',
+        'returns_on_low',
+    )
+    COLUMNS = {column: np.float64 for column in PRICE_COLUMNS + RETURNS_COLUMNS}
+
+    def __init__(self, dates: BarDates, columns: Dict[str, np.ndarray], signal: Optional[np.ndarray] = None):
+        """
+        Initializes a BarArray instance.
+        :param dates: dates of the bars.
+        :param columns: array of every column of COLUMNS, one element per bar.
+        :param signal: int8 order type code of the signal of every bar, None for processed bars.
+        """
+        self.dates = dates
+        self._columns = {
+            name: np.asarray(columns[name], dtype=dtype)
+            for name, dtype in self.COLUMNS.items()
+        }
+        self._signal = np.asarray(signal, dtype=np.int8) if signal is not None else None
+        # Content fingerprint of the price columns, set by the TickerService before the bars are shared
+        self.price_data_fingerprint: Optional[str] = None
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Returns a column of the bars, or their signals.
+        :param name: name of the column, or 'signal'.
+        """
+        if name == 'signal':
+            if self._signal is None:
+                raise KeyError("Processed bars have no signals")
+            return self._signal
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars.
+        """
+        return len(self.dates)
+
+    @property
+    def price_data(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the price columns indicators are computed on.
+        """
+        return {column: self._columns[column] for column in self.PRICE_COLUMNS}
+
+    def slice(self, first: int, last: int) -> "BarArray":
+        """
+        Creates bars over a range of these bars, sharing their columns.
+        :param first: index of the first bar of the range.
+        :param last: index past the last bar of the range.
+        :return: the BarArray of the range.
+        """
+        return BarArray(
+            dates=BarDates(self.dates.values[first:last], self.dates.timezone),
+            columns={name: column[first:last] for name, column in self._columns.items()},
+            signal=self._signal[first:last] if self._signal is not None else None
+        )
+
+    def with_signals(self, signal: np.ndarray) -> "BarArray":
+        """
+        Creates bars sharing every column of these bars, overlaid with signals.
+        :param signal: int8 order type code of the signal of every bar.
+        :return: the BarArray with the signals.
+        """
+        bars = BarArray(dates=self.dates, columns=self._columns, signal=signal)
+        bars.price_data_fingerprint = self.price_data_fingerprint
+        return bars
+
+    def freeze(self) -> "BarArray":
+        """
+        Makes the dates and columns of the bars read-only, so the bars can be shared between requests.
+        :return: these bars.
+        """
+        self.dates.values.flags.writeable = False
+        for column in self._columns.values():
+            column.flags.writeable = False
+        if self._signal is not None:
+            self._signal.flags.writeable = False
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the number of bytes of the columns, and of the signals.
+        """
+        signal_nbytes = self._signal.nbytes if self._signal is not None else 0
+        return self.dates.nbytes + sum(column.nbytes for column in self._columns.values()) + signal_nbytes
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the BarArray instance.
+        """
+        return f"BarArray(bars={len(self)}, timezone={self.dates.timezone})"
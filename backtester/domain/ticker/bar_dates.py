@@ -0,0 +1,106 @@
+"""
+Bar Dates Entity
+"""
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+
+
+class BarDates:
+    """
+    Dates of the bars of a ticker, held as int64 epoch nanoseconds,
+     and formatted as ISO strings only when they are presented.
+    The nanoseconds of timezone-aware dates are in UTC, and are formatted in their timezone.
+    Missing dates are held as NaT, and formatted as None.
+    """
+
+    def __init__(self, values: np.ndarray, timezone: Optional[str] = None):
+        """
+        Initializes a BarDates instance.
+        :param values: int64 epoch nanoseconds of the dates.
+        :param timezone: timezone of the dates, None for naive dates.
+        """
+        self.values = values
+        self.timezone = timezone
+
+    @classmethod
+    def from_series(cls, dates: pd.Series) -> "BarDates":
+        """
+        Creates the dates of a datetime column.
+        :param dates: datetime64 column, naive or timezone-aware.
+        :return: the BarDates of the column.
+        """
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is None:
+            return cls(dates.asi8)
+        return cls(dates.tz_convert('UTC').asi8, str(dates.tz))
+
+    def is_valid(self) -> np.ndarray:
+        """
+        Gets the bars with a date.
+        :return: boolean mask, False where the date is missing.
+        """
+        return self.values != NAT
+
+    def is_sorted(self) -> bool:
+        """
+        Checks every bar has a date, later than the date of the previous bar, so bars can be looked up by date.
+        """
+        return bool(self.is_valid().all() and (np.diff(self.values) > 0).all())
+
+    def to_index(self) -> pd.DatetimeIndex:
+        """
+        Converts the dates to a DatetimeIndex, in their timezone.
+        """
+        return self._to_index(self.values)
+
+    def isoformat(self, indexes: Union[int, slice, np.ndarray]) -> Union[Optional[str], List[Optional[str]]]:
+        """
+        Formats the dates of some bars as ISO strings.
+        :param indexes: index, slice or array of indexes of the bars.
+        :return: the ISO string of the date of each bar, None where the date is missing.
+        """
+        values = self.values[indexes]
+        if np.ndim(values) == 0:
+            return self.isoformat(np.array([indexes]))[0]
+        return [
+            date.isoformat() if pd.notnull(date) else None
+            for date in self._to_index(values)
+        ]
+
+    def _to_index(self, values: np.ndarray) -> pd.DatetimeIndex:
+        """
+        Converts epoch nanoseconds to a DatetimeIndex, in the timezone of the dates.
+        """
+        index = pd.DatetimeIndex(np.asarray(values, dtype=np.int64).view('datetime64[ns]'))
+        if self.timezone is None:
+            return index
+        return index.tz_localize('UTC').tz_convert(self.timezone)
+
+    def __getitem__(self, indexes: Union[int, slice, np.ndarray]) -> Union[Optional[str], List[Optional[str]]]:
+        """
+        Returns the ISO strings of the dates of some bars.
+        """
+        return self.isoformat(indexes)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars.
+        """
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the number of bytes of the dates.
+        """
+        return self.values.nbytes
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the BarDates instance.
+        """
+        return f"BarDates(bars={len(self.values)}, timezone={self.timezone})"
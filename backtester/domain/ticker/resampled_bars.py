@@ -0,0 +1,56 @@
+"""
+Resampled Bars Entity
+"""
+import weakref
+
+import numpy as np
+
+from .bar_array import BarArray
+from .ticker_history import TickerHistory
+
+
+class ResampledBars:
+    """
+    Bars of a coarser interval resampled from the bars of a ticker history,
+     with the index of the first bar of the history in every period.
+    Resampled bars are kept for as long as the history they were resampled from is the history of the series,
+     so they are resampled again once the history is refreshed.
+    """
+
+    def __init__(self, bars: BarArray, starts: np.ndarray, history: TickerHistory):
+        """
+        Initializes a ResampledBars instance.
+        :param bars: processed bars of every period, read-only.
+        :param starts: int64 index of the first bar of the history in every period,
+         followed by the number of bars of the history.
+        :param history: history the bars are resampled from.
+        """
+        self.bars = bars
+        self.starts = starts
+        self._history = weakref.ref(history)
+
+    def is_resampled_from(self, history: TickerHistory) -> bool:
+        """
+        Checks the bars are resampled from a history.
+        :param history: history of the series.
+        """
+        return self._history() is history
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars.
+        """
+        return len(self.bars)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the number of bytes of the bars, and of the index of their periods.
+        """
+        return self.bars.nbytes + self.starts.nbytes
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the ResampledBars instance.
+        """
+        return f"ResampledBars(bars={len(self.bars)}, timezone={self.bars.dates.timezone})"
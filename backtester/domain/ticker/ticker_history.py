@@ -0,0 +1,166 @@
+"""
+Ticker History Entity
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_array import BarArray
+from .bar_dates import BarDates
+
+
+class TickerHistory:
+    """
+    Processed bars of a ticker series, with the date range they cover.
+    The covered range can extend past the first and last bars,
+     when the provider returned no bars at its edges, e.g. over a weekend.
+    Bars are held in columns with room to grow, so new bars are appended in place,
+     and are only ever written past the bars of the histories sharing the columns.
+    Replacing revised bars writes to new columns instead,
+     so the bars already handed out never change.
+    """
+
+    def __init__(
+            self,
+            dates: np.ndarray,
+            timezone: Optional[str],
+            columns: Dict[str, np.ndarray],
+            size: int,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ):
+        """
+        Initializes a TickerHistory instance.
+        :param dates: int64 epoch nanoseconds of the dates, with room to grow.
+        :param timezone: timezone of the dates, None for naive dates.
+        :param columns: array of every column of BarArray.COLUMNS, with room to grow.
+        :param size: number of bars in use in the columns.
+        :param start: inclusive start of the covered range, as a naive timestamp.
+        :param end: exclusive end of the covered range, as a naive timestamp.
+        """
+        self._dates = dates
+        self.timezone = timezone
+        self._columns = columns
+        self.size = size
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_bars(cls, bars: BarArray, start: pd.Timestamp, end: pd.Timestamp) -> "TickerHistory":
+        """
+        Creates the history of the bars of a range.
+        :param bars: processed bars, sorted by date.
+        :param start: inclusive start of the covered range.
+        :param end: exclusive end of the covered range.
+        :return: the TickerHistory of the bars.
+        """
+        return cls(
+            dates=bars.dates.values,
+            timezone=bars.dates.timezone,
+            columns={name: bars[name] for name in BarArray.COLUMNS},
+            size=len(bars),
+            start=start,
+            end=end
+        )
+
+    @property
+    def bars(self) -> BarArray:
+        """
+        Gets the bars of the history, as read-only views of its columns.
+        """
+        dates = self._dates[:self.size]
+        dates.flags.writeable = False
+        columns = {}
+        for name, column in self._columns.items():
+            columns[name] = column[:self.size]
+            columns[name].flags.writeable = False
+        return BarArray(dates=BarDates(dates, self.timezone), columns=columns)
+
+    def get_range(self, start: pd.Timestamp, end: pd.Timestamp) -> Tuple[int, int]:
+        """
+        Gets the bars of a date range.
+        :param start: inclusive start of the range, as a naive timestamp.
+        :param end: exclusive end of the range, as a naive timestamp.
+        :return: index of the first bar of the range, and index past its last bar.
+        """
+        first, last = np.searchsorted(
+            self._dates[:self.size],
+            [self._to_value(start), self._to_value(end)]
+        )
+        return int(first), int(last)
+
+    def get_date(self, index: int) -> pd.Timestamp:
+        """
+        Gets the date of a bar, as a naive timestamp in the timezone of the dates.
+        :param index: index of the bar.
+        """
+        date = pd.Timestamp(int(self._dates[index]))
+        if self.timezone is None:
+            return date
+        return date.tz_localize('UTC').tz_convert(self.timezone).tz_localize(None)
+
+    def extend(self, bars: BarArray, index: int, end: pd.Timestamp) -> "TickerHistory":
+        """
+        Creates the history replacing the bars of this history from an index on,
+         writing the bars in place when they only follow the bars of this history.
+        :param bars: processed bars following the bar before the index, in the timezone of the history.
+        :param index: index of the first bar replaced, the size of the history when only appending.
+        :param end: exclusive end of the range newly covered.
+        :return: the extended TickerHistory, covering up to the later of both ends.
+        """
+        size = index + len(bars)
+        dates, columns = self._dates, self._columns
+        if index < self.size or size > len(dates):
+            # Revised bars, or bars not fitting, are written to new columns, keeping the bars before them
+            capacity = size if index < self.size else max(size, 2 * len(dates))
+            dates = self._grow(dates, index, capacity)
+            columns = {name: self._grow(column, index, capacity) for name, column in columns.items()}
+        if len(bars):
+            dates[index:size] = bars.dates.values
+            for name, column in columns.items():
+                column[index:size] = bars[name]
+        return TickerHistory(
+            dates=dates,
+            timezone=self.timezone,
+            columns=columns,
+            size=size,
+            start=self.start,
+            end=max(self.end, end)
+        )
+
+    @staticmethod
+    def _grow(column: np.ndarray, size: int, capacity: int) -> np.ndarray:
+        """
+        Copies the elements in use of a column to a new column of a capacity.
+        """
+        grown_column = np.empty(capacity, dtype=column.dtype)
+        grown_column[:size] = column[:size]
+        return grown_column
+
+    def _to_value(self, timestamp: pd.Timestamp) -> int:
+        """
+        Gets the epoch nanoseconds of a naive timestamp in the timezone of the dates.
+        """
+        if self.timezone is not None:
+            timestamp = timestamp.tz_localize(self.timezone)
+        return timestamp.value
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bars.
+        """
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the number of bytes of the columns, including their room to grow.
+        """
+        return self._dates.nbytes + sum(column.nbytes for column in self._columns.values())
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the TickerHistory instance.
+        """
+        return f"TickerHistory(bars={self.size}, start={self.start}, end={self.end}, timezone={self.timezone})"
@@ -0,0 +1,135 @@
+"""
+Bar Store, persisting the price data of ticker series as memory-mapped column files.
+"""
+import logging
+import os
+import shutil
+import uuid
+from typing import Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from backtester.infrastructure.ticker_cache import CachedSeries, TickerCache
+
+logger = logging.getLogger(__name__)
+
+
+class BarStore:
+    """
+    On-disk store of the price data of ticker series, one directory per ticker and interval,
+     holding a fixed-width column file per column: the dates as int64 nanoseconds and every price column as float64.
+    Column files are memory-mapped read-only, so opening a series costs the same whatever its length,
+     and only the pages of the bars actually read are loaded.
+    The price data of an opened series is a dataframe over the mapped columns, without a copy.
+    Every write creates a new generation directory and atomically repoints the series to it,
+     so readers never see a partially written series,
+     and series already opened keep their mapping of the previous generation.
+    """
+    COLUMNS = TickerCache.COLUMNS
+    EXTENSION = '.npy'
+    READ_ATTEMPTS = 2
+
+    def __init__(self, directory: str):
+        """
+        Initializes the store.
+        :param directory: directory holding the series, created on the first write.
+        """
+        self.directory = directory
+
+    def get_path(self, ticker: str, interval: str) -> str:
+        """
+        Gets the path of the link to the current generation of a series,
+         escaping the characters of the ticker that are not safe in a file name.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the path of the series.
+        """
+        return os.path.join(self.directory, quote(interval, safe=''), quote(ticker, safe=''))
+
+    def read(self, ticker: str, interval: str) -> Optional[CachedSeries]:
+        """
+        Opens a series, memory-mapping its columns.
+        A missing or unreadable series is a cache miss.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the series over read-only mapped columns, or None if it is not stored.
+        """
+        path = self.get_path(ticker, interval)
+        for _ in range(self.READ_ATTEMPTS):
+            try:
+                return self._read_generation(os.path.realpath(path))
+            except FileNotFoundError:
+                # The generation was replaced between resolving and opening it
+                if not os.path.lexists(path):
+                    return None
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable stored series %s", path, exc_info=True)
+                return None
+        return None
+
+    def write(self, ticker: str, interval: str, series: CachedSeries) -> None:
+        """
+        Writes a series to a new generation, atomically replacing the previous generation of the series.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :param series: the series to write, sorted by date.
+        """
+        path = self.get_path(ticker, interval)
+        parent = os.path.dirname(path)
+        generation = os.path.join(parent, f".{os.path.basename(path)}.{uuid.uuid4().hex}")
+        os.makedirs(generation)
+        link = generation + '.link'
+        try:
+            dates = pd.DatetimeIndex(series.data['date'])
+            timezone = str(dates.tz) if dates.tz is not None else ''
+            if timezone:
+                dates = dates.tz_convert('UTC')
+            self._save(generation, 'date', dates.asi8)
+            self._save(generation, 'range', np.array([series.start.value, series.end.value], dtype=np.int64))
+            self._save(generation, 'timezone', np.array(timezone))
+            for column in self.COLUMNS:
+                self._save(generation, column, series.data[column].to_numpy(dtype=np.float64))
+            os.symlink(os.path.basename(generation), link)
+            previous_generation = os.path.realpath(path) if os.path.lexists(path) else None
+            os.replace(link, path)
+        except BaseException:
+            shutil.rmtree(generation, ignore_errors=True)
+            if os.path.lexists(link):
+                os.unlink(link)
+            raise
+        if previous_generation is not None and previous_generation != generation:
+            shutil.rmtree(previous_generation, ignore_errors=True)
+        logger.debug("Wrote %s bars of %s %s to %s", len(dates), ticker, interval, generation)
+
+    def _read_generation(self, generation: str) -> CachedSeries:
+        """
+        Opens a generation of a series, memory-mapping its columns.
+        :param generation: directory of the generation.
+        :return: the series over read-only mapped columns.
+        """
+        timezone = str(self._load(generation, 'timezone', mmap_mode=None))
+        start, end = (
+            pd.Timestamp(bound, tz='UTC' if timezone else None)
+            for bound in self._load(generation, 'range', mmap_mode=None).tolist()
+        )
+        dates = self._load(generation, 'date').view('datetime64[ns]')
+        columns = {column: self._load(generation, column) for column in self.COLUMNS}
+        if timezone:
+            dates = pd.DatetimeIndex(dates).tz_localize('UTC').tz_convert(timezone)
+            start, end = start.tz_convert(timezone), end.tz_convert(timezone)
+        data = pd.DataFrame({'date': dates, **columns}, copy=False)
+        return CachedSeries(data=data, start=start, end=end)
+
+    def _load(self, generation: str, column: str, mmap_mode: Optional[str] = 'r') -> np.ndarray:
+        """
+        Memory-maps a column file of a generation, read-only, or reads it whole without a mmap_mode.
+        """
+        return np.load(os.path.join(generation, column + self.EXTENSION), mmap_mode=mmap_mode, allow_pickle=False)
+
+    def _save(self, generation: str, column: str, values: np.ndarray) -> None:
+        """
+        Writes a column file of a generation.
+        """
+        np.save(os.path.join(generation, column + self.EXTENSION), values, allow_pickle=False)
@@ -0,0 +1,56 @@
+"""
+Base Ticker Provider, the interface of the providers of ticker price data.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Protocol, Union
+
+import pandas as pd
+
+
+class BaseTickerProvider(Protocol):
+    """
+    Interface of the providers the price data of tickers is fetched from.
+    A provider returns the bars of a ticker in a date range,
+     as a dataframe with a date column and float64 open, high, low and close columns, sorted by date,
+     and raises TickerDataNotFound when the range holds no bars.
+    """
+
+    def fetch(
+            self,
+            ticker: str,
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> pd.DataFrame:
+        """
+        Fetches the price data of a ticker.
+        :param ticker: ticker symbol, e.g. "AAPL".
+        :param interval: interval of the bars, e.g. "1d".
+        :param start: inclusive start date.
+        :param end: exclusive end date.
+        :return: dataframe with the date, open, high, low and close of every bar of the range.
+        """
+        ...
+
+
+class BaseBatchTickerProvider(BaseTickerProvider, Protocol):
+    """
+    Interface of the providers fetching the price data of several tickers in a single call.
+    """
+
+    def fetch_batch(
+            self,
+            tickers: List[str],
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetches the price data of several tickers over a shared range.
+        :param tickers: ticker symbols.
+        :param interval: interval of the bars.
+        :param start: inclusive start date.
+        :param end: exclusive end date.
+        :return: dataframe of every ticker with bars in the range, tickers without bars being left out.
+        """
+        ...
@@ -0,0 +1,121 @@
+"""
+Bulk Ticker Fetcher, fetching the price data of many tickers concurrently.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Union
+
+import pandas as pd
+from fastapi import HTTPException
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound, TickerProviderError
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.infrastructure.base_ticker_provider import BaseTickerProvider
+
+logger = logging.getLogger(__name__)
+
+
+class TickerFetchResult(NamedTuple):
+    """
+    Price data of a ticker fetched in bulk, or the error its fetch failed with.
+    The price data is the fetched dataframe, and the processed bars once the TickerService has processed it.
+    """
+    data: Optional[Union[pd.DataFrame, BarArray]] = None
+    error: Optional[HTTPException] = None
+
+
+class BulkTickerFetcher:
+    """
+    Fetches the price data of many tickers over a shared range,
+     so multi-ticker workloads pay the latency of the provider once per round of calls rather than once per ticker.
+    Providers with a fetch_batch method are called with batches of batch_size tickers,
+     the others once per ticker.
+    Calls run on a thread pool of max_workers threads, kept for the lifetime of the fetcher,
+     so providers keeping a session per thread reuse their connections across bulk fetches,
+     and providers serving one ticker per call, such as yfinance, still have their calls overlap.
+    A failed call only fails the tickers it fetched.
+    """
+
+    def __init__(self, ticker_provider: BaseTickerProvider, max_workers: int = 8, batch_size: int = 20):
+        """
+        Initializes the fetcher.
+        :param ticker_provider: provider the price data is fetched from.
+        :param max_workers: maximum number of concurrent calls to the provider.
+        :param batch_size: maximum number of tickers fetched by a single call to a batching provider.
+        """
+        self.ticker_provider = ticker_provider
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ticker-fetch')
+
+    def fetch(
+            self,
+            tickers: List[str],
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> Dict[str, TickerFetchResult]:
+        """
+        Fetches the price data of many tickers.
+        :param tickers: ticker symbols, fetched once each.
+        :param interval: interval of the bars, e.g. "1d".
+        :param start: inclusive start date, shared by every ticker.
+        :param end: exclusive end date, shared by every ticker.
+        :return: the price data or the error of every ticker, in the order of the tickers.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if hasattr(self.ticker_provider, 'fetch_batch'):
+            batches = [tickers[index:index + self.batch_size] for index in range(0, len(tickers), self.batch_size)]
+        else:
+            batches = [[ticker] for ticker in tickers]
+        futures = [
+            self._executor.submit(self._fetch_batch, batch, interval, start, end)
+            for batch in batches
+        ]
+        results: Dict[str, TickerFetchResult] = {}
+        for future in futures:
+            results.update(future.result())
+        failed = sum(result.error is not None for result in results.values())
+        logger.info(
+            "Fetched %s tickers in %s calls, %s failed",
+            len(tickers), len(batches), failed
+        )
+        return {ticker: results[ticker] for ticker in tickers}
+
+    def _fetch_batch(
+            self,
+            tickers: List[str],
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> Dict[str, TickerFetchResult]:
+        """
+        Fetches a batch of tickers in a single call to the provider, catching its errors.
+        :return: the price data or the error of every ticker of the batch.
+        """
+        try:
+            if len(tickers) == 1 and not hasattr(self.ticker_provider, 'fetch_batch'):
+                data = {tickers[0]: self.ticker_provider.fetch(
+                    ticker=tickers[0], interval=interval, start=start, end=end
+                )}
+            else:
+                data = self.ticker_provider.fetch_batch(tickers=tickers, interval=interval, start=start, end=end)
+        except HTTPException as error:
+            return {ticker: TickerFetchResult(error=error) for ticker in tickers}
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Fetching %s failed", tickers, exc_info=True)
+            return {
+                ticker: TickerFetchResult(error=TickerProviderError(ticker=ticker, reason=str(error)))
+                for ticker in tickers
+            }
+        return {
+            ticker: TickerFetchResult(data=data[ticker]) if ticker in data and not data[ticker].empty
+            else TickerFetchResult(error=TickerDataNotFound(ticker=ticker))
+            for ticker in tickers
+        }
+
+    def shutdown(self) -> None:
+        """
+        Shuts the thread pool down, waiting for the running calls.
+        """
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,265 @@
+"""
+Cached Ticker Provider, serving ticker price data from an on-disk cache.
+"""
+import logging
+import threading
+import weakref
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound
+from backtester.infrastructure.bar_store import BarStore
+from backtester.infrastructure.base_ticker_provider import BaseTickerProvider
+from backtester.infrastructure.ticker_cache import CachedSeries, TickerCache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedTickerProvider:
+    """
+    Ticker provider serving any date range of a series from a TickerCache,
+     and fetching from the upstream provider only the ranges the cache does not cover yet.
+    A request starting before the cached range fetches the missing head,
+     a request ending after it fetches the missing tail,
+     and both are merged into the cached series, which always covers a single contiguous range.
+    Only the part of a range before the current day is recorded as covered,
+     so bars still being formed are fetched again by the next request.
+    The missing tail also fetches the last revision_bars cached bars again,
+     and the cached bars from the start of the tail on are replaced by the fetched ones,
+     so bars the provider revised, or removed, are refreshed.
+    The bars of a range are a view of the cached series, memory-mapped when the cache is a BarStore.
+    """
+
+    def __init__(
+            self,
+            ticker_provider: BaseTickerProvider,
+            ticker_cache: Union[BarStore, TickerCache],
+            revision_bars: int = 0
+    ):
+        """
+        Initializes the provider.
+        :param ticker_provider: upstream provider, fetching the ranges missing from the cache.
+        :param ticker_cache: on-disk cache of the series, memory-mapped or compressed.
+        :param revision_bars: number of cached bars before the missing tail fetched again with it.
+        """
+        self.ticker_provider = ticker_provider
+        self.ticker_cache = ticker_cache
+        self.revision_bars = revision_bars
+        self._locks: "weakref.WeakValueDictionary[Tuple[str, str], threading.Lock]" = weakref.WeakValueDictionary()
+        self._locks_lock = threading.Lock()
+
+    def fetch(
+            self,
+            ticker: str,
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> pd.DataFrame:
+        """
+        Fetches the price data of a ticker, from the cache where it covers the range.
+        An open range is fetched from the upstream provider, and not cached.
+        :param ticker: ticker symbol, e.g. "AAPL".
+        :param interval: interval of the bars, e.g. "1d".
+        :param start: inclusive start date.
+        :param end: exclusive end date.
+        :return: dataframe with the date, open, high, low and close of every bar of the range.
+        """
+        if start is None or end is None:
+            return self.ticker_provider.fetch(ticker=ticker, interval=interval, start=start, end=end)
+        with self._lock(ticker, interval):
+            series = self._update_series(ticker, interval, pd.Timestamp(start), pd.Timestamp(end))
+        df = self._slice(series.data, pd.Timestamp(start), pd.Timestamp(end))
+        if df.empty:
+            logger.error("No data found for ticker: %s", ticker)
+            raise TickerDataNotFound(ticker=ticker)
+        return df
+
+    def _slice(self, data: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """
+        Gets the bars of a range of a series, as a dataframe over the columns of the series, without a copy.
+        :param data: price data of the series, sorted by date.
+        :param start: inclusive start of the range.
+        :param end: exclusive end of the range.
+        :return: the bars of the range, indexed from 0.
+        """
+        dates = pd.DatetimeIndex(data['date'])
+        first, last = dates.searchsorted(
+            [self._localize(start, data['date']), self._localize(end, data['date'])]
+        )
+        df = data.iloc[first:last].copy(deep=False)
+        df.index = pd.RangeIndex(len(df))
+        return df
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        """
+        Gets the lock of a series, so concurrent requests do not fetch the same missing range twice.
+        Locks are only kept while a request holds or waits for them.
+        """
+        with self._locks_lock:
+            lock = self._locks.get((ticker, interval))
+            if lock is None:
+                lock = self._locks[(ticker, interval)] = threading.Lock()
+            return lock
+
+    def _update_series(
+            self,
+            ticker: str,
+            interval: str,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> CachedSeries:
+        """
+        Gets the cached series of a ticker, extended to cover the requested range.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :param start: inclusive start of the requested range.
+        :param end: exclusive end of the requested range.
+        :return: the series, covering at least the requested range before the current day.
+        """
+        series = self.ticker_cache.read(ticker, interval)
+        if series is None:
+            data = self._fetch_range(ticker, interval, start, end)
+            if data.empty:
+                logger.error("No data found for ticker: %s", ticker)
+                raise TickerDataNotFound(ticker=ticker)
+            series = CachedSeries(
+                data=data,
+                start=self._localize(start, data['date']),
+                end=self._localize(self._get_covered_end(start, end), data['date'])
+            )
+            self.ticker_cache.write(ticker, interval, series)
+            logger.info("Cached %s bars of %s %s", len(data), ticker, interval)
+            return series
+
+        missing_ranges = self._get_missing_ranges(series, start, end)
+        if not missing_ranges:
+            logger.debug("Serving %s %s from the cache", ticker, interval)
+            return series
+        fetched_data = [
+            self._fetch_range(ticker, interval, missing_start, missing_end)
+            for missing_start, missing_end in missing_ranges
+        ]
+        series = self._merge(series, missing_ranges, fetched_data, start, self._get_covered_end(start, end))
+        self.ticker_cache.write(ticker, interval, series)
+        logger.info(
+            "Fetched %s new bars of %s %s, for the missing ranges %s",
+            sum(len(data) for data in fetched_data), ticker, interval, missing_ranges
+        )
+        return series
+
+    def _get_missing_ranges(
+            self,
+            series: CachedSeries,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Gets the ranges to fetch for a series to cover the requested range.
+        A range disjoint from the cached one also fetches the gap between them,
+         so the series stays contiguous.
+        :param series: the cached series.
+        :param start: inclusive start of the requested range.
+        :param end: exclusive end of the requested range.
+        :return: the missing head and tail ranges, as naive timestamps.
+        """
+        cached_start, cached_end = self._naive(series.start), self._naive(series.end)
+        missing_ranges = []
+        if start < cached_start:
+            missing_ranges.append((start, cached_start))
+        if end > cached_end:
+            missing_ranges.append((min(self._get_revision_start(series), cached_end), end))
+        return missing_ranges
+
+    def _get_revision_start(self, series: CachedSeries) -> pd.Timestamp:
+        """
+        Gets the date of the first of the last revision_bars bars of the covered range of a series,
+         as a naive timestamp, or the end of the range without such bars.
+        """
+        dates = pd.DatetimeIndex(series.data['date'])
+        first = dates.searchsorted(series.end) - self.revision_bars
+        if self.revision_bars == 0 or first >= len(dates):
+            return self._naive(series.end)
+        return self._naive(dates[max(first, 0)])
+
+    def _fetch_range(
+            self,
+            ticker: str,
+            interval: str,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Fetches a range from the upstream provider.
+        A range without bars, e.g. a weekend, is an empty dataframe.
+        """
+        try:
+            return self.ticker_provider.fetch(
+                ticker=ticker,
+                interval=interval,
+                start=start.to_pydatetime(),
+                end=end.to_pydatetime()
+            )
+        except TickerDataNotFound:
+            logger.debug("No bars of %s %s between %s and %s", ticker, interval, start, end)
+            return pd.DataFrame(columns=['date', *TickerCache.COLUMNS])
+
+    def _merge(
+            self,
+            series: CachedSeries,
+            missing_ranges: List[Tuple[pd.Timestamp, pd.Timestamp]],
+            fetched_data: List[pd.DataFrame],
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> CachedSeries:
+        """
+        Merges the fetched ranges into a cached series.
+        A bar fetched again replaces the cached one,
+         and the cached bars after the start of a fetched tail are dropped, unless the tail has no bars.
+        :param series: the cached series.
+        :param missing_ranges: the missing head and tail ranges.
+        :param fetched_data: the bars of the missing ranges.
+        :param start: inclusive start of the range newly covered.
+        :param end: exclusive end of the range newly covered.
+        :return: the merged series.
+        """
+        data = series.data
+        tail_start, _ = missing_ranges[-1]
+        if tail_start >= self._naive(series.start) and not fetched_data[-1].empty:
+            data = data[data['date'] < self._localize(tail_start, data['date'])]
+        data = pd.concat(
+            [data, *(df for df in fetched_data if not df.empty)],
+            ignore_index=True
+        )
+        data = data.drop_duplicates(subset='date', keep='last').sort_values('date', ignore_index=True)
+        dates = data['date']
+        return CachedSeries(
+            data=data,
+            start=min(series.start, self._localize(start, dates)),
+            end=max(series.end, self._localize(end, dates))
+        )
+
+    @staticmethod
+    def _get_covered_end(start: pd.Timestamp, end: pd.Timestamp) -> pd.Timestamp:
+        """
+        Gets the end of the part of a range whose bars are final, before the current day.
+        """
+        return max(start, min(end, pd.Timestamp.now().normalize()))
+
+    @staticmethod
+    def _naive(timestamp: pd.Timestamp) -> pd.Timestamp:
+        """
+        Gets the wall time of a timestamp, dropping its timezone.
+        """
+        return timestamp.tz_localize(None) if timestamp.tz is not None else timestamp
+
+    @staticmethod
+    def _localize(timestamp: pd.Timestamp, dates: pd.Series) -> pd.Timestamp:
+        """
+        Gets a naive timestamp in the timezone of the dates of a series, so they can be compared.
+        """
+        timezone = getattr(dates.dt, 'tz', None) if len(dates) else None
+        if timezone is None or timestamp.tz is not None:
+            return timestamp
+        return timestamp.tz_localize(timezone)
@@ -0,0 +1,212 @@
+"""
+Directory Ticker Provider, reading ticker price data from local CSV or Parquet files.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound, TickerProviderError
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is pinned in requirements.txt
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryTickerProvider:
+    """
+    Ticker provider reading pre-downloaded price data from a directory, one file per ticker,
+     so backtests need no network and pay no per-call overhead of a remote provider.
+    The file of a ticker is looked up as <directory>/<interval>/<ticker>.<extension>,
+     then as <directory>/<ticker>.<extension>, Parquet files taking precedence over CSV files.
+    Only the date, open, high, low and close columns are read, whatever the case of their names.
+    Files that cannot be read, or lack one of these columns, fail with a TickerProviderError.
+    The date range is pushed down to the reader:
+     Parquet row groups outside the range are skipped,
+     and CSV files sorted by date are read in chunks, stopping at the first chunk past the range.
+    """
+    EXTENSIONS = ('.parquet', '.csv')
+    DATE_COLUMNS = ('date', 'datetime', 'timestamp', 'time')
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+    CSV_CHUNK_SIZE = 100_000
+
+    def __init__(self, directory: str):
+        """
+        Initializes the provider.
+        :param directory: directory holding the files of the tickers.
+        """
+        self.directory = directory
+
+    def fetch(
+            self,
+            ticker: str,
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> pd.DataFrame:
+        """
+        Reads the price data of a ticker from its file.
+        :param ticker: ticker symbol, naming the file.
+        :param interval: interval of the bars, naming the subdirectory of the file if it exists.
+        :param start: inclusive start date, None reading from the first bar.
+        :param end: exclusive end date, None reading up to the last bar.
+        :return: dataframe with the date, open, high, low and close of every bar of the range.
+        """
+        path = self.get_path(ticker, interval)
+        if path is None:
+            logger.error("No file found for ticker: %s", ticker)
+            raise TickerDataNotFound(ticker=ticker)
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        try:
+            if path.endswith('.parquet'):
+                df = self._read_parquet(path, start, end)
+            else:
+                df = self._read_csv(path, start, end)
+        except (ImportError, OSError, TypeError, ValueError) as error:
+            logger.error("Reading %s failed", path, exc_info=True)
+            raise TickerProviderError(ticker=ticker, reason=str(error)) from error
+        if df.empty:
+            logger.error("No data found for ticker: %s", ticker)
+            raise TickerDataNotFound(ticker=ticker)
+        logger.debug("Read %s bars of %s from %s", len(df), ticker, path)
+        return df
+
+    def get_path(self, ticker: str, interval: str) -> Optional[str]:
+        """
+        Gets the path of the file of a ticker.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the path of the file, or None if the ticker has no file.
+        """
+        for directory in (os.path.join(self.directory, interval), self.directory):
+            for extension in self.EXTENSIONS:
+                path = os.path.join(directory, ticker + extension)
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    def _get_columns(self, names: List[str]) -> Dict[str, str]:
+        """
+        Maps the date and price columns to the names of the columns of a file.
+        :param names: names of the columns of the file.
+        :return: name of the column of the file, by column of the price data.
+        """
+        names_by_lowercase = {name.strip().lower(): name for name in names}
+        date_column = next(
+            (names_by_lowercase[column] for column in self.DATE_COLUMNS if column in names_by_lowercase),
+            None
+        )
+        missing_columns = [column for column in self.PRICE_COLUMNS if column not in names_by_lowercase]
+        if date_column is None or missing_columns:
+            raise ValueError(
+                f"Price data files need a date column and {', '.join(self.PRICE_COLUMNS)} columns, got {names}"
+            )
+        return {
+            'date': date_column,
+            **{column: names_by_lowercase[column] for column in self.PRICE_COLUMNS}
+        }
+
+    def _read_parquet(
+            self,
+            path: str,
+            start: Optional[pd.Timestamp],
+            end: Optional[pd.Timestamp]
+    ) -> pd.DataFrame:
+        """
+        Reads the bars of a range from a Parquet file, filtering its row groups on the date column.
+        """
+        if pq is None:
+            raise ImportError(f"Reading {path} requires pyarrow")
+        schema = pq.read_schema(path)
+        columns = self._get_columns(schema.names)
+        timezone = getattr(schema.field(columns['date']).type, 'tz', None)
+        filters = []
+        if start is not None:
+            filters.append((columns['date'], '>=', self._localize(start, timezone)))
+        if end is not None:
+            filters.append((columns['date'], '<', self._localize(end, timezone)))
+        df = pq.read_table(path, columns=list(columns.values()), filters=filters or None).to_pandas()
+        df = self._normalize(df, columns)
+        if not df['date'].is_monotonic_increasing:
+            df = df.sort_values('date', ignore_index=True)
+        return df
+
+    def _read_csv(
+            self,
+            path: str,
+            start: Optional[pd.Timestamp],
+            end: Optional[pd.Timestamp]
+    ) -> pd.DataFrame:
+        """
+        Reads the bars of a range from a CSV file, chunk by chunk.
+        Once every date read so far is sorted, the first chunk ending past the range is the last one read.
+        """
+        columns = self._get_columns(list(pd.read_csv(path, nrows=0).columns))
+        chunks = []
+        is_sorted = True
+        previous_date = None
+        for chunk in pd.read_csv(
+                path,
+                usecols=list(columns.values()),
+                chunksize=self.CSV_CHUNK_SIZE,
+        ):
+            if chunk.empty:
+                continue
+            chunk = self._normalize(chunk, columns)
+            dates = chunk['date']
+            is_sorted = is_sorted and dates.is_monotonic_increasing and \
+                (previous_date is None or dates.iloc[0] >= previous_date)
+            previous_date = dates.iloc[-1]
+            chunks.append(chunk[self._get_range_mask(dates, start, end)])
+            if is_sorted and end is not None and previous_date >= self._localize(end, dates.dt.tz):
+                break
+        if not chunks:
+            return pd.DataFrame(columns=['date', *self.PRICE_COLUMNS])
+        df = pd.concat(chunks, ignore_index=True)
+        if not is_sorted:
+            df = df.sort_values('date', ignore_index=True)
+        return df
+
+    def _normalize(self, df: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        """
+        Renames the columns of a file to the columns of the price data, and converts them to their types.
+        """
+        df = df.rename(columns={name: column for column, name in columns.items()})[list(columns)]
+        dates = pd.to_datetime(df['date'])
+        if dates.dtype == object:
+            # Dates with mixed UTC offsets, e.g. across daylight saving time changes
+            dates = pd.to_datetime(df['date'], utc=True)
+        df['date'] = dates
+        df[list(self.PRICE_COLUMNS)] = df[list(self.PRICE_COLUMNS)].astype('float64')
+        return df
+
+    @staticmethod
+    def _get_range_mask(
+            dates: pd.Series,
+            start: Optional[pd.Timestamp],
+            end: Optional[pd.Timestamp]
+    ) -> pd.Series:
+        """
+        Gets the bars of a chunk in the range.
+        """
+        mask = pd.Series(True, index=dates.index)
+        if start is not None:
+            mask &= dates >= DirectoryTickerProvider._localize(start, dates.dt.tz)
+        if end is not None:
+            mask &= dates < DirectoryTickerProvider._localize(end, dates.dt.tz)
+        return mask
+
+    @staticmethod
+    def _localize(timestamp: pd.Timestamp, timezone) -> pd.Timestamp:
+        """
+        Gets a naive timestamp in the timezone of the dates of a file, so they can be compared.
+        """
+        if timezone is None or timestamp.tz is not None:
+            return timestamp
+        return timestamp.tz_localize(timezone)
@@ -0,0 +1,95 @@
+"""
+Shared Bar Array, handing the processed price data of a ticker to other processes through shared memory.
+"""
+import logging
+import weakref
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.domain.ticker.bar_dates import BarDates
+
+logger = logging.getLogger(__name__)
+
+
+class SharedBarArrayHandle(NamedTuple):
+    """
+    Picklable reference to a SharedBarArray, sent to the processes reading it instead of the bars.
+    """
+    name: str
+    bars: int
+    timezone: Optional[str]
+    price_data_fingerprint: Optional[str]
+
+
+class SharedBarArray:
+    """
+    Copy of the dates and columns of a BarArray in a shared memory block, one row of 8-byte values per column.
+    The process creating the block owns it, and releases it when it is done with it or when it is collected.
+    The processes reading the block copy the bars out of it once, and close it right away,
+     so the block only has to live until every reader has loaded it.
+    """
+    ROWS = ('date',) + tuple(BarArray.COLUMNS)
+
+    def __init__(self, bars: BarArray):
+        """
+        Copies bars to a new shared memory block.
+        :param bars: processed bars, without signals.
+        """
+        self._shared_memory = shared_memory.SharedMemory(create=True, size=max(len(self.ROWS) * len(bars) * 8, 1))
+        self.handle = SharedBarArrayHandle(
+            name=self._shared_memory.name,
+            bars=len(bars),
+            timezone=bars.dates.timezone,
+            price_data_fingerprint=bars.price_data_fingerprint
+        )
+        values = self._get_values(self._shared_memory, len(bars))
+        values[0] = bars.dates.values
+        for row, column in enumerate(BarArray.COLUMNS, start=1):
+            values[row] = bars[column].view(np.int64)
+        del values
+        self._finalizer = weakref.finalize(self, self._release, self._shared_memory)
+        logger.debug("Shared %s bars in %s", len(bars), self.handle.name)
+
+    @classmethod
+    def load(cls, handle: SharedBarArrayHandle) -> BarArray:
+        """
+        Copies the bars of a shared memory block, closing the block.
+        :param handle: handle of the block, as created by the owning process.
+        :return: the frozen BarArray, owning its columns.
+        """
+        block = shared_memory.SharedMemory(name=handle.name)
+        try:
+            values = cls._get_values(block, handle.bars).copy()
+        finally:
+            block.close()
+        bars = BarArray(
+            dates=BarDates(values[0], handle.timezone),
+            columns={column: values[row].view(np.float64) for row, column in enumerate(BarArray.COLUMNS, start=1)}
+        )
+        bars.price_data_fingerprint = handle.price_data_fingerprint
+        return bars.freeze()
+
+    def unlink(self) -> None:
+        """
+        Releases the shared memory block, readers not having loaded it yet failing to find it.
+        """
+        self._finalizer()
+
+    @classmethod
+    def _get_values(cls, block: shared_memory.SharedMemory, bars: int) -> np.ndarray:
+        """
+        Gets the rows of a shared memory block, as int64 values.
+        """
+        return np.ndarray((len(cls.ROWS), bars), dtype=np.int64, buffer=block.buf)
+
+    @staticmethod
+    def _release(block: shared_memory.SharedMemory) -> None:
+        """
+        Closes and removes a shared memory block.
+        """
+        block.close()
+        block.unlink()
+        logger.debug("Released shared bars %s", block.name)
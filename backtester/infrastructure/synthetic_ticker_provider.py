@@ -0,0 +1,80 @@
+"""
+Synthetic Ticker Provider, generating price data offline.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound
+
+logger = logging.getLogger(__name__)
+
+
+class SyntheticTickerProvider:
+    """
+    Stand-in for the TickerProvider that needs no network,
+     generating a deterministic random walk of prices for every ticker.
+    The walk of a ticker is seeded by its symbol and starts at a fixed epoch,
+     so every range of a ticker returns the same bars, whatever range was fetched before.
+    """
+    EPOCH = pd.Timestamp('1980-01-01')
+    FREQUENCIES = {
+        '1d': 'B',
+        '1wk': 'W-MON',
+        '1mo': 'MS',
+    }
+    DRIFT = 0.0003
+    VOLATILITY = 0.015
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def fetch(
+            ticker: str,
+            interval: str,
+            start: Optional[Union[str, datetime]],
+            end: Optional[Union[str, datetime]]
+    ) -> pd.DataFrame:
+        """
+        Generates the price data of a ticker.
+        :param ticker: ticker symbol, seeding the random walk.
+        :param interval: interval of the bars, one of FREQUENCIES.
+        :param start: inclusive start date, defaulting to the epoch.
+        :param end: exclusive end date, defaulting to now.
+        :return: dataframe with the date, open, high, low and close of every bar of the range.
+        """
+        frequency = SyntheticTickerProvider.FREQUENCIES.get(interval)
+        start = pd.Timestamp(start) if start is not None else SyntheticTickerProvider.EPOCH
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+        if frequency is None or end <= SyntheticTickerProvider.EPOCH:
+            logger.error("No data found for ticker: %s", ticker)
+            raise TickerDataNotFound(ticker=ticker)
+
+        dates = pd.date_range(SyntheticTickerProvider.EPOCH, end, freq=frequency, inclusive='left')
+        seed = int.from_bytes(hashlib.sha256(f"{ticker}:{interval}".encode()).digest()[:8], 'little')
+        shocks = np.random.default_rng(seed).standard_normal((len(dates), 4))
+        close = 100 * np.exp(np.cumsum(
+            SyntheticTickerProvider.DRIFT + SyntheticTickerProvider.VOLATILITY * shocks[:, 0]
+        ))
+        previous_close = np.concatenate(([100.0], close[:-1]))
+        open_ = previous_close * np.exp(SyntheticTickerProvider.VOLATILITY / 3 * shocks[:, 1])
+        high = np.maximum(open_, close) * np.exp(SyntheticTickerProvider.VOLATILITY / 3 * np.abs(shocks[:, 2]))
+        low = np.minimum(open_, close) * np.exp(-SyntheticTickerProvider.VOLATILITY / 3 * np.abs(shocks[:, 3]))
+
+        in_range = dates >= start
+        df = pd.DataFrame({
+            'date': dates[in_range],
+            'open': open_[in_range],
+            'high': high[in_range],
+            'low': low[in_range],
+            'close': close[in_range],
+        })
+        if df.empty:
+            logger.error("No data found for ticker: %s", ticker)
+            raise TickerDataNotFound(ticker=ticker)
+        return df
@@ -0,0 +1,116 @@
+"""
+Ticker Cache, persisting the price data of ticker series on disk.
+"""
+import logging
+import os
+import tempfile
+import zipfile
+from typing import NamedTuple, Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSeries(NamedTuple):
+    """
+    Price data of a ticker series, with the date range it covers.
+    The covered range can extend past the first and last bars,
+     when the provider returned no bars at its edges, e.g. over a weekend.
+    """
+    data: pd.DataFrame
+    start: pd.Timestamp
+    end: pd.Timestamp
+
+
+class TickerCache:
+    """
+    On-disk store of the price data of ticker series, one file per ticker and interval.
+    Each file holds the dates as int64 nanoseconds and every price column as float64,
+     compressed column by column, along with the covered date range.
+    Files are written to a temporary file and renamed over the previous one,
+     so readers never see a partially written series.
+    """
+    COLUMNS = ('open', 'high', 'low', 'close')
+    EXTENSION = '.npz'
+
+    def __init__(self, directory: str):
+        """
+        Initializes the cache.
+        :param directory: directory holding the series, created on the first write.
+        """
+        self.directory = directory
+
+    def get_path(self, ticker: str, interval: str) -> str:
+        """
+        Gets the path of the file of a series, escaping the characters of the ticker
+         that are not safe in a file name.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the path of the file.
+        """
+        return os.path.join(self.directory, quote(interval, safe=''), quote(ticker, safe='') + self.EXTENSION)
+
+    def read(self, ticker: str, interval: str) -> Optional[CachedSeries]:
+        """
+        Reads a series from disk.
+        A missing or unreadable file is a cache miss.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :return: the cached series, or None if it is not cached.
+        """
+        path = self.get_path(ticker, interval)
+        try:
+            with np.load(path, allow_pickle=False) as columns:
+                timezone = str(columns['timezone'])
+                dates = pd.to_datetime(columns['date'], utc=bool(timezone))
+                start, end = (pd.Timestamp(bound, tz='UTC' if timezone else None) for bound in columns['range'])
+                data = pd.DataFrame({column: columns[column] for column in self.COLUMNS})
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            logger.warning("Ignoring unreadable cached series %s", path, exc_info=True)
+            return None
+        if timezone:
+            dates, start, end = (value.tz_convert(timezone) for value in (dates, start, end))
+        data.insert(0, 'date', dates)
+        return CachedSeries(data=data, start=start, end=end)
+
+    def write(self, ticker: str, interval: str, series: CachedSeries) -> None:
+        """
+        Writes a series to disk, atomically replacing the previous file of the series.
+        :param ticker: ticker symbol.
+        :param interval: interval of the bars.
+        :param series: the series to write, sorted by date.
+        """
+        path = self.get_path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        dates = pd.DatetimeIndex(series.data['date'])
+        timezone = str(dates.tz) if dates.tz is not None else ''
+        if timezone:
+            dates = dates.tz_convert('UTC')
+        temporary_file = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path),
+            prefix='.' + os.path.basename(path),
+            suffix='.tmp',
+            delete=False
+        )
+        try:
+            with temporary_file:
+                np.savez_compressed(
+                    temporary_file,
+                    date=dates.asi8,
+                    range=np.array([series.start.value, series.end.value], dtype=np.int64),
+                    timezone=np.array(timezone),
+                    **{
+                        column: series.data[column].to_numpy(dtype=np.float64)
+                        for column in self.COLUMNS
+                    }
+                )
+            os.replace(temporary_file.name, path)
+        except BaseException:
+            os.unlink(temporary_file.name)
+            raise
+        logger.debug("Wrote %s bars of %s %s to %s", len(dates), ticker, interval, path)
@@ -0,0 +1,74 @@
+"""
+Benchmark of the comparison stage of a cross rule on a long series,
+ comparing the None-filled lists indicators used to produce, wrapped in a Series by every tile,
+ with the float64 arrays they produce now, compared and shifted as the RuleExecutor does.
+
+Run from the root of the repository:
+    python -m benchmarks.comparison_stage --bars 1000000
+"""
+import argparse
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+from backtester.application.rule_executor import RuleExecutor
+from backtester.application.talib_converter import TalibConverter
+from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
+
+
+def time_best(function: Callable[[], np.ndarray], repeat: int) -> Tuple[float, np.ndarray]:
+    """
+    Runs a function several times.
+    :return: the best time of the runs, in seconds, and the result of the last run.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=1_000_000, help="number of bars of the series")
+    parser.add_argument('--repeat', type=int, default=5, help="number of runs of every stage, the best one counting")
+    args = parser.parse_args()
+
+    close = 1000 + np.cumsum(np.random.default_rng(0).normal(0, 1, args.bars))
+    fast, slow = talib.SMA(close, timeperiod=7), talib.SMA(close, timeperiod=21)
+
+    def convert() -> Tuple[pd.Series, pd.Series]:
+        return tuple(pd.Series(TalibConverter.convert_np_nan_to_none(mask)) for mask in (fast, slow))
+
+    fast_series, slow_series = convert()
+
+    def compare_series() -> np.ndarray:
+        return np.asarray(RuleComparisonMethod.CROSSES_ABOVE.apply(
+            (fast_series, fast_series.shift()),
+            (slow_series, slow_series.shift())
+        ), dtype=bool)
+
+    current, previous = np.empty(args.bars, dtype=bool), np.empty(args.bars, dtype=bool)
+
+    def compare_arrays() -> np.ndarray:
+        previous_fast, previous_slow = RuleExecutor._shift(fast, None), RuleExecutor._shift(slow, None)
+        RuleExecutor._compare(RuleComparisonMethod.IS_ABOVE, [fast, slow], current, None)
+        RuleExecutor._compare(RuleComparisonMethod.IS_ABOVE, [previous_slow, previous_fast], previous, None)
+        return current & previous
+
+    conversion_time, _ = time_best(convert, min(args.repeat, 3))
+    series_time, series_signals = time_best(compare_series, args.repeat)
+    array_time, array_signals = time_best(compare_arrays, args.repeat)
+
+    print(f"{args.bars} bars, SMA 7 crosses above SMA 21, best of {args.repeat} runs")
+    print(f"  list masks:    {series_time * 1e3:8.1f} ms comparing, after {conversion_time * 1e3:.0f} ms converting")
+    print(f"  float64 masks: {array_time * 1e3:8.1f} ms comparing, {series_time / array_time:.1f}x faster")
+    print(f"  signals identical: {np.array_equal(series_signals, array_signals)}, {int(array_signals.sum())} signals")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Shared fixtures of the tests.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.application.ticker_data_processor import TickerDataProcessor
+
+BACKTESTING_REQUEST = {
+    "ticker_request": {"ticker": "MSFT", "start_date": "2000-01-01", "end_date": "2010-01-01", "interval": "1d"},
+    "portfolio_management": {
+        "starting_amount": 10000,
+        "trade_size": {"value": 0.2, "type": "DYNAMIC"},
+        "trade_targets": {"take_profit": 0.2, "stop_loss": -0.1}
+    },
+    "trading_system_rules": {
+        "BUY": {"order_type_rule_id": "1", "group_rules": {
+            "1": {"group_rule_id": "1", "rules": {"1": {
+                "rule_id": "1",
+                "first_property": {"type": "INDICATOR", "name": "MA", "parameters": {"timeperiod": 7}},
+                "comparison": {"value": "CROSSES_ABOVE"},
+                "second_property": {"type": "INDICATOR", "name": "MA", "parameters": {"timeperiod": 21}}
+            }}},
+            "2": {"group_rule_id": "2", "rules": {"2": {
+                "rule_id": "2",
+                "first_property": {"type": "INDICATOR", "name": "RSI", "parameters": {"timeperiod": 7}},
+                "comparison": {"value": "IS_ABOVE"},
+                "second_property": {"type": "VALUE", "name": "value", "parameters": {"value": 20}}
+            }}}
+        }},
+        "SELL": {"order_type_rule_id": "2", "group_rules": {
+            "3": {"group_rule_id": "3", "rules": {"3": {
+                "rule_id": "3",
+                "first_property": {"type": "INDICATOR", "name": "MA", "parameters": {"timeperiod": 7}},
+                "comparison": {"value": "CROSSES_BELOW"},
+                "second_property": {"type": "INDICATOR", "name": "MA", "parameters": {"timeperiod": 21}}
+            }}},
+            "4": {"group_rule_id": "4", "rules": {"4": {
+                "rule_id": "4",
+                "first_property": {"type": "INDICATOR", "name": "RSI", "parameters": {"timeperiod": 7}},
+                "comparison": {"value": "IS_BELOW"},
+                "second_property": {"type": "VALUE", "name": "value", "parameters": {"value": 80}}
+            }}}
+        }}
+    }
+}
+
+
+@pytest.fixture
+def backtesting_request_body() -> dict:
+    return copy.deepcopy(BACKTESTING_REQUEST)
+
+
+def _make_price_data(bars: int = 500, seed: int = 0, start: str = '2000-01-03', freq: str = 'B') -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(rng.normal(0, 0.005, bars))
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=bars, freq=freq),
+        'open': open_,
+        'high': np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.005, bars))),
+        'low': np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.005, bars))),
+        'close': close,
+    })
+
+
+@pytest.fixture
+def make_price_data():
+    """
+    Random walk price data of a ticker, with valid OHLC bars.
+    """
+    return _make_price_data
+
+
+@pytest.fixture
+def ticker_data():
+    """
+    Processed ticker data of 500 daily bars.
+    """
+    return TickerDataProcessor.to_bar_array(_make_price_data()).freeze()
@@ -0,0 +1,76 @@
+"""
+Differential tests of the iterative and vectorized backtest engines.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.api.dependencies import init_strategy_service, init_trade_service, init_vectorized_trade_engine
+from backtester.api.requests.portfolio_management import PortfolioManagement
+from backtester.application.backtester import Backtester
+from backtester.application.signal_service import SignalService
+from backtester.application.ticker_data_processor import TickerDataProcessor
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.trade_detail import TradeDetail
+from backtester.domain.signals.signal_events import SignalEvents
+
+BARS = 500
+
+
+def make_ticker_data(seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, BARS)))
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(rng.normal(0, 0.005, BARS))
+    return TickerDataProcessor.to_bar_array(pd.DataFrame({
+        'date': pd.bdate_range('2000-01-03', periods=BARS),
+        'open': open_,
+        'high': np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.005, BARS))),
+        'low': np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.005, BARS))),
+        'close': close,
+    }))
+
+
+def make_signal_events(seed: int, signal_on_last_bar: bool):
+    rng = np.random.default_rng(seed)
+    sell = rng.random(BARS) < 0.03
+    buy = (rng.random(BARS) < 0.03) & ~sell
+    if signal_on_last_bar:
+        buy[-1], sell[-1] = True, False
+    return {
+        OrderType.BUY: SignalEvents.from_mask(buy),
+        OrderType.SELL: SignalEvents.from_mask(sell),
+    }
+
+
+def make_backtester():
+    return Backtester(
+        ticker_service=None,
+        signal_service=None,
+        strategy_service=init_strategy_service(),
+        trade_service=init_trade_service(),
+        vectorized_trade_engine=init_vectorized_trade_engine()
+    )
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('signal_on_last_bar', [False, True])
+@pytest.mark.parametrize('trade_detail', list(TradeDetail))
+@pytest.mark.parametrize('trade_targets, trade_size', [
+    ({'take_profit': 0.2, 'stop_loss': -0.1}, {'value': 0.2, 'type': 'DYNAMIC'}),
+    ({'take_profit': 0.02, 'stop_loss': -0.01}, {'value': 500, 'type': 'STATIC'}),
+    ({'take_profit': 5.0, 'stop_loss': -0.9}, {'value': 1.0, 'type': 'DYNAMIC'}),
+])
+def test_engines_produce_the_same_results(seed, signal_on_last_bar, trade_detail, trade_targets, trade_size):
+    signal_events = make_signal_events(seed, signal_on_last_bar)
+    ticker_data = SignalService.assign_signals(make_ticker_data(seed), signal_events)
+    portfolio_management = PortfolioManagement(
+        starting_amount=10000,
+        trade_size=trade_size,
+        trade_targets=trade_targets
+    )
+    backtester = make_backtester()
+
+    iterative = backtester._run_backtest(ticker_data, signal_events, portfolio_management, trade_detail)
+    vectorized = backtester._run_vectorized_backtest(ticker_data, signal_events, portfolio_management, trade_detail)
+
+    assert iterative.dict() == vectorized.dict()
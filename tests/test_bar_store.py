@@ -0,0 +1,85 @@
+"""
+Tests of the memory-mapped bar store.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.infrastructure.bar_store import BarStore
+from backtester.infrastructure.cached_ticker_provider import CachedTickerProvider
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+from backtester.infrastructure.ticker_cache import CachedSeries
+
+
+def make_series(price_data, timezone=None):
+    if timezone is not None:
+        price_data = price_data.assign(date=price_data['date'].dt.tz_localize(timezone))
+    dates = price_data['date']
+    return CachedSeries(data=price_data, start=dates.iloc[0], end=dates.iloc[-1] + pd.Timedelta(days=3))
+
+
+def list_generations(bar_store, ticker, interval):
+    parent = os.path.dirname(bar_store.get_path(ticker, interval))
+    return sorted(name for name in os.listdir(parent) if name.startswith('.'))
+
+
+@pytest.mark.parametrize('timezone', [None, 'America/New_York'])
+def test_round_trip_keeps_bars_range_and_timezone(tmp_path, make_price_data, timezone):
+    bar_store = BarStore(str(tmp_path))
+    series = make_series(make_price_data(), timezone)
+
+    bar_store.write('MSFT', '1d', series)
+    stored_series = bar_store.read('MSFT', '1d')
+
+    pd.testing.assert_frame_equal(stored_series.data, series.data)
+    assert stored_series.start == series.start
+    assert stored_series.end == series.end
+
+
+def test_columns_are_read_only_memory_maps(tmp_path, make_price_data):
+    bar_store = BarStore(str(tmp_path))
+    bar_store.write('MSFT', '1d', make_series(make_price_data()))
+
+    data = bar_store.read('MSFT', '1d').data
+
+    for column in BarStore.COLUMNS:
+        values = data[column].to_numpy()
+        assert isinstance(values.base, np.memmap) or isinstance(values, np.memmap)
+        assert not values.flags.writeable
+
+
+def test_rewrite_keeps_opened_series_and_removes_previous_generation(tmp_path, make_price_data):
+    bar_store = BarStore(str(tmp_path))
+    first_series = make_series(make_price_data(seed=0))
+    second_series = make_series(make_price_data(bars=600, seed=1))
+    bar_store.write('MSFT', '1d', first_series)
+    opened_series = bar_store.read('MSFT', '1d')
+
+    bar_store.write('MSFT', '1d', second_series)
+
+    pd.testing.assert_frame_equal(opened_series.data, first_series.data)
+    pd.testing.assert_frame_equal(bar_store.read('MSFT', '1d').data, second_series.data)
+    assert len(list_generations(bar_store, 'MSFT', '1d')) == 1
+
+
+def test_missing_and_unreadable_series_are_misses(tmp_path, make_price_data):
+    bar_store = BarStore(str(tmp_path))
+    bar_store.write('MSFT', '1d', make_series(make_price_data()))
+    generation = os.path.realpath(bar_store.get_path('MSFT', '1d'))
+    with open(os.path.join(generation, 'close' + BarStore.EXTENSION), 'wb') as file:
+        file.write(b'not a numpy file')
+
+    assert bar_store.read('AAPL', '1d') is None
+    assert bar_store.read('MSFT', '1d') is None
+
+
+def test_provider_serves_memory_mapped_ranges(tmp_path):
+    cached_ticker_provider = CachedTickerProvider(SyntheticTickerProvider(), BarStore(str(tmp_path)))
+    cached_ticker_provider.fetch('A', '1d', '2001-01-01', '2003-01-01')
+
+    df = cached_ticker_provider.fetch('A', '1d', '2001-06-01', '2002-06-01')
+
+    pd.testing.assert_frame_equal(df, SyntheticTickerProvider.fetch('A', '1d', '2001-06-01', '2002-06-01'))
+    assert not df['close'].to_numpy().flags.writeable
@@ -0,0 +1,155 @@
+"""
+Tests of multi-ticker fetches against local stand-in providers.
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound, TickerProviderError
+from backtester.api.requests.ticker_request import TickerRequest
+from backtester.application.ticker_data_cache import TickerDataCache
+from backtester.application.ticker_service import TickerService
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.infrastructure.bulk_ticker_fetcher import BulkTickerFetcher
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+
+START, END = '2001-01-01', '2003-01-01'
+
+
+class StandInProvider:
+    """
+    Serves the synthetic price data of every ticker but UNKNOWN after a delay, failing for BROKEN.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def _record(self, tickers):
+        with self._lock:
+            self.calls.append(list(tickers))
+            self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if 'BROKEN' in tickers:
+            raise ConnectionError('connection reset')
+
+    def fetch(self, ticker, interval, start, end):
+        self._record([ticker])
+        if ticker == 'UNKNOWN':
+            raise TickerDataNotFound(ticker=ticker)
+        return SyntheticTickerProvider.fetch(ticker, interval, start, end)
+
+
+class StandInBatchProvider(StandInProvider):
+    """
+    Stand-in provider serving several tickers per call, leaving out the tickers without data.
+    """
+
+    def fetch_batch(self, tickers, interval, start, end):
+        self._record(tickers)
+        return {
+            ticker: SyntheticTickerProvider.fetch(ticker, interval, start, end)
+            for ticker in tickers if ticker != 'UNKNOWN'
+        }
+
+
+@pytest.fixture
+def bulk_ticker_fetchers():
+    bulk_ticker_fetchers = []
+
+    def make_bulk_ticker_fetcher(ticker_provider, **kwargs):
+        bulk_ticker_fetchers.append(BulkTickerFetcher(ticker_provider=ticker_provider, **kwargs))
+        return bulk_ticker_fetchers[-1]
+
+    yield make_bulk_ticker_fetcher
+    for bulk_ticker_fetcher in bulk_ticker_fetchers:
+        bulk_ticker_fetcher.shutdown()
+
+
+def test_batching_provider_is_called_with_batches(bulk_ticker_fetchers):
+    ticker_provider = StandInBatchProvider()
+    tickers = [f'T{index}' for index in range(12)]
+
+    results = bulk_ticker_fetchers(ticker_provider, batch_size=5).fetch(tickers + ['T0'], '1d', START, END)
+
+    assert list(results) == tickers
+    assert sorted(map(len, ticker_provider.calls)) == [2, 5, 5]
+    for ticker, result in results.items():
+        assert result.error is None
+        assert result.data.equals(SyntheticTickerProvider.fetch(ticker, '1d', START, END))
+
+
+def test_failed_batch_only_fails_its_tickers(bulk_ticker_fetchers):
+    ticker_provider = StandInBatchProvider()
+    tickers = ['A', 'B', 'BROKEN', 'C', 'UNKNOWN', 'D']
+
+    results = bulk_ticker_fetchers(ticker_provider, batch_size=3).fetch(tickers, '1d', START, END)
+
+    for ticker in ('A', 'B', 'BROKEN'):
+        assert isinstance(results[ticker].error, TickerProviderError)
+        assert results[ticker].error.status_code == 502
+    assert isinstance(results['UNKNOWN'].error, TickerDataNotFound)
+    for ticker in ('C', 'D'):
+        assert results[ticker].error is None
+
+
+def test_single_ticker_provider_calls_overlap(bulk_ticker_fetchers):
+    ticker_provider = StandInProvider(delay=0.3)
+    tickers = [f'T{index}' for index in range(8)] + ['UNKNOWN', 'BROKEN']
+
+    start_time = time.perf_counter()
+    results = bulk_ticker_fetchers(ticker_provider, max_workers=10).fetch(tickers, '1d', START, END)
+    elapsed = time.perf_counter() - start_time
+
+    assert elapsed < len(tickers) * ticker_provider.delay / 2
+    assert len(ticker_provider.threads) > 1
+    assert sorted(map(tuple, ticker_provider.calls)) == sorted((ticker,) for ticker in tickers)
+    assert isinstance(results['UNKNOWN'].error, TickerDataNotFound)
+    assert isinstance(results['BROKEN'].error, TickerProviderError)
+
+
+@pytest.mark.parametrize('interval', [TickerInterval.DAILY, TickerInterval.WEEKLY])
+@pytest.mark.parametrize('provider_class', [StandInProvider, StandInBatchProvider])
+def test_ticker_service_fetches_tickers_in_bulk(interval, provider_class, bulk_ticker_fetchers):
+    ticker_provider = provider_class()
+    ticker_service = TickerService(
+        ticker_provider=ticker_provider,
+        ticker_data_cache=TickerDataCache(max_bytes=2 ** 24),
+        bulk_ticker_fetcher=bulk_ticker_fetchers(ticker_provider, batch_size=2)
+    )
+    tickers = ['A', 'UNKNOWN', 'B', 'C']
+
+    results = ticker_service.fetch_tickers_data(tickers, interval, START, END)
+
+    assert list(results) == tickers
+    assert isinstance(results['UNKNOWN'].error, TickerDataNotFound)
+    single_ticker_service = TickerService(ticker_provider=SyntheticTickerProvider())
+    for ticker in ('A', 'B', 'C'):
+        expected = single_ticker_service.fetch_ticker_data(
+            TickerRequest(ticker=ticker, interval=interval, start_date=START, end_date=END)
+        )
+        np.testing.assert_array_equal(results[ticker].data.dates.values, expected.dates.values)
+        for column in expected.COLUMNS:
+            np.testing.assert_array_equal(results[ticker].data[column], expected[column])
+        assert not results[ticker].data['close'].flags.writeable
+
+    calls = len(ticker_provider.calls)
+    cached_results = ticker_service.fetch_tickers_data(['C', 'A', 'B'], interval, START, END)
+
+    assert len(ticker_provider.calls) == calls
+    for ticker, result in cached_results.items():
+        assert result.data is results[ticker].data
+
+
+def test_ticker_service_fetches_one_at_a_time_without_a_bulk_fetcher():
+    ticker_service = TickerService(ticker_provider=StandInProvider())
+
+    results = ticker_service.fetch_tickers_data(['A', 'BROKEN', 'UNKNOWN'], TickerInterval.DAILY, START, END)
+
+    assert results['A'].error is None
+    assert isinstance(results['UNKNOWN'].error, TickerDataNotFound)
+    assert isinstance(results['BROKEN'].error, TickerProviderError)
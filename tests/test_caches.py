@@ -0,0 +1,245 @@
+"""
+Tests of the byte-limited caches and of the counters the metrics endpoint reports.
+"""
+import gc
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backtester.api.dependencies import (
+    init_indicator_cache,
+    init_signal_cache,
+    init_ticker_data_cache,
+    init_ticker_history_cache,
+    init_ticker_single_flight
+)
+from backtester.api.requests.ticker_request import TickerRequest
+from backtester.app.factory import create_app
+from backtester.application.byte_limited_cache import ByteLimitedCache
+from backtester.application.indicator_cache import IndicatorCache
+from backtester.application.signal_cache import SignalCache
+from backtester.application.single_flight import SingleFlight
+from backtester.application.ticker_data_cache import TickerDataCache
+from backtester.application.ticker_history_cache import TickerHistoryCache
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.domain.signals.signal_bitset import SignalBitset
+from backtester.domain.ticker.ticker_history import TickerHistory
+
+
+def make_value(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_evicts_least_recently_used_values_beyond_byte_budget():
+    cache = ByteLimitedCache(max_bytes=300)
+    for key in 'abc':
+        cache.put(key, make_value(100))
+
+    cache.put('d', make_value(100))
+
+    assert cache.get('a') is None
+    assert all(cache.get(key) is not None for key in 'bcd')
+    assert cache.stats['evictions'] == 1
+    assert cache.stats['bytes'] == 300
+
+
+def test_get_marks_value_as_most_recently_used():
+    cache = ByteLimitedCache(max_bytes=300)
+    for key in 'abc':
+        cache.put(key, make_value(100))
+
+    cache.get('a')
+    cache.put('d', make_value(100))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+
+def test_replacing_value_accounts_for_its_bytes_once():
+    cache = ByteLimitedCache(max_bytes=300)
+    cache.put('a', make_value(100))
+    cache.put('a', make_value(200))
+
+    assert cache.stats['entries'] == 1
+    assert cache.stats['bytes'] == 200
+    assert cache.stats['evictions'] == 0
+
+
+def test_values_larger_than_budget_are_not_cached():
+    cache = ByteLimitedCache(max_bytes=100)
+    cache.put('a', make_value(50))
+    value = make_value(101)
+
+    assert cache.put('b', value) is value
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats['evictions'] == 0
+
+
+def test_zero_budget_disables_cache():
+    cache = ByteLimitedCache(max_bytes=0)
+    cache.put('a', make_value(1))
+
+    assert cache.get('a') is None
+    assert cache.stats['entries'] == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = ByteLimitedCache(max_bytes=100)
+    cache.get('a')
+    cache.put('a', make_value(10))
+    cache.get('a')
+    cache.get('a')
+    cache.clear()
+
+    assert cache.stats == {
+        "hits": 2, "misses": 1, "evictions": 0, "entries": 0, "bytes": 0, "max_bytes": 100
+    }
+
+
+def test_indicator_cache_makes_masks_read_only_and_normalizes_parameters(ticker_data):
+    cache = IndicatorCache(max_bytes=10 ** 6)
+    fingerprint = IndicatorCache.fingerprint(ticker_data.price_data)
+    mask = np.ones(len(ticker_data), dtype=bool)
+
+    cache.put(IndicatorCache.make_key(fingerprint, 'SMA', {'timeperiod': 14.0, 'matype': None}), mask)
+
+    assert cache.get(IndicatorCache.make_key(fingerprint, 'SMA', {'timeperiod': 14})) is mask
+    assert not mask.flags.writeable
+    assert cache.stats['bytes'] == mask.nbytes
+
+
+def test_signal_cache_makes_signals_read_only(ticker_data):
+    cache = SignalCache(max_bytes=10 ** 6)
+    fingerprint = IndicatorCache.fingerprint(ticker_data.price_data)
+    signals = SignalBitset.from_mask(np.arange(len(ticker_data)) % 3 == 0)
+    key = SignalCache.make_key(fingerprint, ('rule', 'close', '>', 'open'))
+
+    cache.put(key, signals)
+
+    assert cache.get(key) is signals
+    assert not signals.words.flags.writeable
+    assert cache.stats['bytes'] == signals.nbytes
+
+
+def test_ticker_data_cache_freezes_bars_and_evicts_by_their_bytes(ticker_data):
+    cache = TickerDataCache(max_bytes=ticker_data.nbytes)
+    first = TickerRequest(ticker='A', interval=TickerInterval.DAILY, start_date='2000-01-01', end_date='2002-01-01')
+    second = TickerRequest(ticker='B', interval=TickerInterval.DAILY, start_date='2000-01-01', end_date='2002-01-01')
+
+    cache.put(TickerDataCache.make_key(first), ticker_data)
+    cache.put(TickerDataCache.make_key(second), ticker_data)
+
+    assert cache.get(TickerDataCache.make_key(first)) is None
+    assert not cache.get(TickerDataCache.make_key(second))['close'].flags.writeable
+    assert cache.stats['evictions'] == 1
+
+
+def test_ticker_history_cache_evicts_histories_by_their_bytes(ticker_data):
+    start, end = pd.Timestamp('2000-01-01'), pd.Timestamp('2002-01-01')
+    history = TickerHistory.from_bars(ticker_data, start, end)
+    cache = TickerHistoryCache(max_bytes=history.nbytes)
+
+    cache.put(TickerHistoryCache.make_key('A', '1d'), history)
+    cache.put(TickerHistoryCache.make_key('B', '1d'), TickerHistory.from_bars(ticker_data, start, end))
+
+    assert cache.get(TickerHistoryCache.make_key('A', '1d')) is None
+    assert cache.get(TickerHistoryCache.make_key('B', '1d')) is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_ticker_history_locks_are_shared_while_held_and_dropped_once_released():
+    cache = TickerHistoryCache(max_bytes=100)
+    key = TickerHistoryCache.make_key('A', '1d')
+
+    with cache.lock(key):
+        assert cache.lock(key) is cache.lock(key)
+        assert cache.lock(key) is not cache.lock(TickerHistoryCache.make_key('B', '1d'))
+    gc.collect()
+
+    assert len(cache._locks) == 0
+
+
+def test_ticker_history_locks_serialize_requests_on_the_same_series():
+    cache = TickerHistoryCache(max_bytes=100)
+    key = TickerHistoryCache.make_key('A', '1d')
+    inside, overlaps = [0], []
+    counter_lock = threading.Lock()
+
+    def refresh():
+        with cache.lock(key):
+            with counter_lock:
+                inside[0] += 1
+                overlaps.append(inside[0])
+            threading.Event().wait(0.01)
+            with counter_lock:
+                inside[0] -= 1
+
+    threads = [threading.Thread(target=refresh) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(overlaps) == 1
+
+
+def provide(instance):
+    return lambda: instance
+
+
+@pytest.fixture
+def metrics_client():
+    caches = {
+        init_indicator_cache: IndicatorCache(max_bytes=10 ** 6),
+        init_signal_cache: SignalCache(max_bytes=10 ** 6),
+        init_ticker_history_cache: TickerHistoryCache(max_bytes=10 ** 6),
+        init_ticker_data_cache: TickerDataCache(max_bytes=10 ** 6),
+        init_ticker_single_flight: SingleFlight(),
+    }
+    app = create_app()
+    for dependency, instance in caches.items():
+        app.dependency_overrides[dependency] = provide(instance)
+    return TestClient(app), caches
+
+
+def get_metrics(client):
+    response = client.get('/api/v1/metrics')
+    assert response.status_code == 200
+    return response.json()['data']
+
+
+def test_metrics_report_counters_of_every_cache(metrics_client, ticker_data):
+    client, caches = metrics_client
+    indicator_cache = caches[init_indicator_cache]
+    signal_cache = caches[init_signal_cache]
+    ticker_history_cache = caches[init_ticker_history_cache]
+    ticker_data_cache = caches[init_ticker_data_cache]
+    before = get_metrics(client)
+
+    indicator_cache.put(('fingerprint', 'SMA', ()), np.ones(8, dtype=bool))
+    indicator_cache.get(('fingerprint', 'SMA', ()))
+    signal_cache.get(('fingerprint', 'rule'))
+    ticker_history_cache.put(('A', '1d'), TickerHistory.from_bars(
+        ticker_data, pd.Timestamp('2000-01-01'), pd.Timestamp('2002-01-01')
+    ))
+    ticker_data_cache.put(('A', '1d', None, None), ticker_data)
+    ticker_data_cache.get(('A', '1d', None, None))
+    ticker_data_cache.get(('B', '1d', None, None))
+    after = get_metrics(client)
+
+    assert set(after) == {
+        'indicator_cache', 'signal_cache', 'ticker_history_cache', 'ticker_data_cache', 'ticker_fetches'
+    }
+    assert all(before[name]['entries'] == 0 for name in ('indicator_cache', 'ticker_data_cache'))
+    assert after['indicator_cache']['hits'] == 1
+    assert after['indicator_cache']['bytes'] == 8
+    assert after['signal_cache']['misses'] == 1
+    assert after['ticker_history_cache']['entries'] == 1
+    assert after['ticker_data_cache'] == {
+        "hits": 1, "misses": 1, "evictions": 0, "entries": 1,
+        "bytes": ticker_data.nbytes, "max_bytes": 10 ** 6
+    }
@@ -0,0 +1,77 @@
+"""
+Tests of the ticker provider reading price data files from a directory.
+"""
+import pandas as pd
+import pytest
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound, TickerProviderError
+from backtester.infrastructure.directory_ticker_provider import DirectoryTickerProvider
+
+COLUMNS = ['date', 'open', 'high', 'low', 'close']
+
+
+def write(df, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.parquet':
+        df.to_parquet(path, index=False, row_group_size=100)
+    else:
+        df.to_csv(path, index=False)
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet'])
+def test_reads_range_of_file(tmp_path, make_price_data, extension):
+    price_data = make_price_data()
+    write(price_data.rename(columns={'date': 'Date', 'close': 'Close'}).assign(volume=1), tmp_path / f'MSFT{extension}')
+    start, end = pd.Timestamp('2000-03-01'), pd.Timestamp('2000-06-01')
+
+    df = DirectoryTickerProvider(str(tmp_path)).fetch('MSFT', '1d', start, end)
+
+    expected = price_data[(price_data['date'] >= start) & (price_data['date'] < end)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+    assert list(df.columns) == COLUMNS
+
+
+def test_csv_read_in_chunks_matches_whole_file(tmp_path, make_price_data, monkeypatch):
+    price_data = make_price_data(bars=1000)
+    write(price_data, tmp_path / 'MSFT.csv')
+    monkeypatch.setattr(DirectoryTickerProvider, 'CSV_CHUNK_SIZE', 64)
+
+    df = DirectoryTickerProvider(str(tmp_path)).fetch('MSFT', '1d', '2001-01-01', '2002-01-01')
+
+    expected = price_data[(price_data['date'] >= '2001-01-01') & (price_data['date'] < '2002-01-01')]
+    pd.testing.assert_frame_equal(df, expected.reset_index(drop=True), check_dtype=False)
+
+
+def test_interval_directory_and_parquet_take_precedence(tmp_path, make_price_data):
+    write(make_price_data(seed=0), tmp_path / 'MSFT.csv')
+    write(make_price_data(seed=1), tmp_path / '1wk' / 'MSFT.csv')
+    write(make_price_data(seed=2), tmp_path / '1wk' / 'MSFT.parquet')
+    ticker_provider = DirectoryTickerProvider(str(tmp_path))
+
+    assert ticker_provider.get_path('MSFT', '1d') == str(tmp_path / 'MSFT.csv')
+    assert ticker_provider.get_path('MSFT', '1wk') == str(tmp_path / '1wk' / 'MSFT.parquet')
+
+
+def test_missing_file_and_empty_range_raise_not_found(tmp_path, make_price_data):
+    write(make_price_data(), tmp_path / 'MSFT.csv')
+    ticker_provider = DirectoryTickerProvider(str(tmp_path))
+
+    with pytest.raises(TickerDataNotFound):
+        ticker_provider.fetch('AAPL', '1d', None, None)
+    with pytest.raises(TickerDataNotFound):
+        ticker_provider.fetch('MSFT', '1d', '2020-01-01', '2021-01-01')
+
+
+@pytest.mark.parametrize('name, content', [
+    ('MSFT.csv', 'date,open,high,low\n2000-01-03,1,2,0.5\n'),
+    ('MSFT.csv', 'date,open,high,low,close\n2000-01-03,1,2,0.5,high\n'),
+    ('MSFT.csv', 'date,open,high,low,close\nnot a date,1,2,0.5,1.5\n'),
+    ('MSFT.parquet', 'not a parquet file'),
+])
+def test_malformed_file_raises_provider_error(tmp_path, name, content):
+    (tmp_path / name).write_text(content)
+
+    with pytest.raises(TickerProviderError) as error:
+        DirectoryTickerProvider(str(tmp_path)).fetch('MSFT', '1d', None, None)
+
+    assert error.value.status_code == 502
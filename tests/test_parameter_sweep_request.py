@@ -0,0 +1,53 @@
+"""
+Tests of the validation of parameter sweep requests.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from backtester.api.requests.parameter_sweep_request import ParameterRange, ParameterSweepRequest
+from backtester.app.config import get_settings
+from backtester.app.factory import create_app
+
+OVERSIZED_RANGE = {
+    "rule_id": "1", "rule_property": "first_property", "parameter": "timeperiod", "start": 0, "stop": 10 ** 12
+}
+
+
+def test_range_is_expanded():
+    parameter_range = ParameterRange(
+        rule_id="1", rule_property="first_property", parameter="timeperiod", start=5, stop=20, step=5
+    )
+    assert parameter_range.values == [5, 10, 15, 20]
+
+
+def test_oversized_range_is_rejected_before_expansion():
+    with pytest.raises(ValidationError, match="above the maximum"):
+        ParameterRange(**OVERSIZED_RANGE)
+
+
+def test_range_at_maximum_is_accepted():
+    max_combinations = get_settings().sweep_max_combinations
+    parameter_range = ParameterRange(**{**OVERSIZED_RANGE, "start": 1, "stop": max_combinations})
+    assert len(parameter_range.values) == max_combinations
+
+
+def test_sweep_combinations(backtesting_request_body):
+    parameter_sweep_request = ParameterSweepRequest(
+        backtesting_request=backtesting_request_body,
+        parameter_grid=[
+            {"rule_id": "1", "rule_property": "first_property", "parameter": "timeperiod", "values": [5, 7]},
+            {"rule_id": "2", "rule_property": "second_property", "parameter": "value", "start": 20, "stop": 40,
+             "step": 10},
+        ]
+    )
+    assert parameter_sweep_request.combinations == 6
+
+
+def test_oversized_range_gets_validation_error(backtesting_request_body):
+    client = TestClient(create_app())
+    response = client.post("/api/v1/trading-systems/sweep", json={
+        "backtesting_request": backtesting_request_body,
+        "parameter_grid": [OVERSIZED_RANGE],
+    })
+    assert response.status_code == 422
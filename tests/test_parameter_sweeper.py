@@ -0,0 +1,72 @@
+"""
+Tests of parameter sweeps on a process pool.
+"""
+import json
+
+import pytest
+
+from backtester.api.requests.parameter_sweep_request import ParameterSweepRequest
+from backtester.app.config import Settings
+from backtester.application import sweep_worker
+from backtester.application.parameter_sweeper import ParameterSweeper
+from backtester.application.sweep_executor import SweepExecutor
+from backtester.infrastructure.shared_bar_array import SharedBarArray, SharedBarArrayHandle
+
+
+class StubTickerService:
+    def __init__(self, ticker_data):
+        self.ticker_data = ticker_data
+
+    def fetch_ticker_data(self, ticker_request):
+        return self.ticker_data
+
+
+class RecordingSweepExecutor(SweepExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = []
+
+    def submit(self, function, *args):
+        self.submitted.append(args)
+        return super().submit(function, *args)
+
+
+@pytest.fixture(scope='module')
+def sweep_executor():
+    sweep_executor = RecordingSweepExecutor(workers=2, start_method='spawn')
+    yield sweep_executor
+    sweep_executor.shutdown()
+
+
+def test_sweep_matches_backtests(backtesting_request_body, ticker_data, sweep_executor):
+    parameter_sweep_request = ParameterSweepRequest(
+        backtesting_request=backtesting_request_body,
+        parameter_grid=[
+            {"rule_id": "1", "rule_property": "first_property", "parameter": "timeperiod", "values": [5, 7, 9]},
+            {"rule_id": "4", "rule_property": "second_property", "parameter": "value", "values": [70, 80]},
+        ]
+    )
+    parameter_sweeper = ParameterSweeper(
+        ticker_service=StubTickerService(ticker_data),
+        sweep_executor=sweep_executor,
+        settings=Settings(sweep_chunk_size=2)
+    )
+
+    results = sorted(
+        parameter_sweeper.sweep(parameter_sweep_request=parameter_sweep_request),
+        key=lambda result: result['combination']
+    )
+
+    assert [result['combination'] for result in results] == list(range(6))
+    backtester = sweep_worker._init_backtester()
+    for result, (parameters, backtesting_request) in zip(results, parameter_sweep_request.expand()):
+        assert result['parameters'] == parameters
+        expected = backtester.backtest_ticker_data(ticker_data=ticker_data, backtesting_request=backtesting_request)
+        assert json.dumps(result['data'], default=str) == json.dumps(expected.dict(), default=str)
+
+    handles = {args[0] for args in sweep_executor.submitted}
+    assert len(handles) == 1
+    handle, = handles
+    assert isinstance(handle, SharedBarArrayHandle)
+    with pytest.raises(FileNotFoundError):
+        SharedBarArray.load(handle)
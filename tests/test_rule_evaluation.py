@@ -0,0 +1,305 @@
+"""
+Tests of the compiled evaluation of trading system rules against a direct per-rule numpy evaluation.
+"""
+import itertools
+
+import numpy as np
+import pytest
+import talib
+
+from backtester.api.requests.backtesting_request import BacktestingRequest
+from backtester.api.requests.portfolio_management import PortfolioManagement
+from backtester.api.requests.trading_system import TradingSystemRules
+from backtester.application.backtester import Backtester
+from backtester.application.indicator_cache import IndicatorCache
+from backtester.application.indicator_service import IndicatorService
+from backtester.application.indicator_validator_service import IndicatorValidatorService
+from backtester.application.rule_compiler import RuleCompiler
+from backtester.application.rule_executor import RuleExecutor
+from backtester.application.rule_planner import RulePlanner
+from backtester.application.signal_cache import SignalCache
+from backtester.application.signal_service import SignalService
+from backtester.application.strategy_service import StrategyService
+from backtester.application.trade_service import TradeService
+from backtester.application.vectorized_trade_engine import VectorizedTradeEngine
+from backtester.domain.enums.order_type import OrderType
+from backtester.domain.enums.rule_comparison_method import RuleComparisonMethod
+from backtester.domain.enums.rule_opcode import RuleOpcode
+from backtester.domain.indicators.indicator import Indicator
+from backtester.domain.signals.indicator_registry import IndicatorRegistry
+
+INDICATORS = {'MA': talib.SMA, 'EMA': talib.EMA, 'RSI': talib.RSI}
+TIMEPERIODS = [3, 7, 14]
+
+
+def make_signal_service(signal_cache=None, indicator_cache=None):
+    return SignalService(
+        indicator_service=IndicatorService(
+            indicator_validator_service=IndicatorValidatorService(),
+            registry=Indicator.registry,
+            indicator_cache=indicator_cache
+        ),
+        indicator_registry=IndicatorRegistry(),
+        signal_cache=signal_cache
+    )
+
+
+def make_rule(rule_id, first, second, comparison):
+    return {
+        'rule_id': rule_id,
+        'first_property': first,
+        'comparison': {'value': comparison},
+        'second_property': second
+    }
+
+
+def indicator(name, timeperiod):
+    return {'type': 'INDICATOR', 'name': name, 'parameters': {'timeperiod': timeperiod}}
+
+
+def value(number):
+    return {'type': 'VALUE', 'name': 'value', 'parameters': {'value': number}}
+
+
+def make_properties(rng):
+    """
+    Random properties on the same scale, an oscillator against an oscillator or a level,
+     an average against an average or a price.
+    """
+    first_name = str(rng.choice(list(INDICATORS)))
+    names, values = (['RSI'], [30, 50, 70]) if first_name == 'RSI' else (['MA', 'EMA'], [90, 100, 110])
+    first = indicator(first_name, int(rng.choice(TIMEPERIODS)))
+    if rng.random() < 0.3:
+        return first, value(int(rng.choice(values)))
+    return first, indicator(str(rng.choice(names)), int(rng.choice(TIMEPERIODS)))
+
+
+def make_trading_system_rules(seed):
+    """
+    Random rules over a small pool of indicators, so rules, comparisons and operands repeat.
+    """
+    rng = np.random.default_rng(seed)
+    ids = itertools.count(1)
+    trading_system_rules = {}
+    for order_type in ('BUY', 'SELL'):
+        group_rules = {}
+        for _ in range(rng.integers(1, 4)):
+            group_rule_id = str(next(ids))
+            rules = {}
+            for _ in range(rng.integers(1, 5)):
+                rule_id = str(next(ids))
+                comparison = str(rng.choice([method.value for method in RuleComparisonMethod]))
+                rules[rule_id] = make_rule(rule_id, *make_properties(rng), comparison=comparison)
+            group_rules[group_rule_id] = {'group_rule_id': group_rule_id, 'rules': rules}
+        trading_system_rules[order_type] = {'order_type_rule_id': str(next(ids)), 'group_rules': group_rules}
+    return TradingSystemRules.parse_obj(trading_system_rules)
+
+
+def evaluate_property(rule_property, close):
+    if rule_property.type == 'VALUE':
+        return np.full(len(close), float(rule_property.parameters.value))
+    return INDICATORS[rule_property.name](close, timeperiod=rule_property.parameters.timeperiod)
+
+
+def evaluate_rules(trading_system_rules, ticker_data):
+    """
+    Evaluates every rule on its own with RuleComparisonMethod.apply,
+     OR-ing the rules of each group rule and AND-ing the group rules of each order type.
+    """
+    close = np.array(ticker_data['close'])
+    signals = {}
+    for order_type, order_type_rules in trading_system_rules.__root__.items():
+        order_type_signals = np.ones(len(close), dtype=bool)
+        for group_rule in order_type_rules.group_rules.values():
+            group_signals = np.zeros(len(close), dtype=bool)
+            for rule in group_rule.rules.values():
+                first, second = (
+                    evaluate_property(rule_property, close)
+                    for rule_property in (rule.first_property, rule.second_property)
+                )
+                with np.errstate(invalid='ignore'):
+                    group_signals |= rule.comparison.value.apply(
+                        (first, np.concatenate(([np.nan], first[:-1]))),
+                        (second, np.concatenate(([np.nan], second[:-1])))
+                    )
+            order_type_signals &= group_signals
+        signals[order_type] = order_type_signals
+    return signals
+
+
+def evaluate_signal_events(trading_system_rules, ticker_data):
+    """
+    Evaluates the rules, a sell signal overriding a buy signal on the same bar.
+    """
+    signals = evaluate_rules(trading_system_rules, ticker_data)
+    signals[OrderType.BUY] = signals[OrderType.BUY] & ~signals[OrderType.SELL]
+    return signals
+
+
+def get_indicator_masks(signal_service, ticker_data):
+    signal_service.calculate_indicators(ticker_data)
+    return {
+        tile_id: indicator_.mask for tile_id, indicator_ in signal_service.indicator_registry.indicators.items()
+    }
+
+
+def execute(trading_system_rule, indicator_masks, bars, planned=True):
+    signals = RuleExecutor.execute(
+        program=RuleCompiler.compile(trading_system_rule, indicator_masks=indicator_masks if planned else None),
+        indicator_masks=indicator_masks,
+        bars=bars
+    )
+    return {order_type: signals[order_type].to_mask() for order_type in signals}
+
+
+def get_signals(signal_service, trading_system_rules, ticker_data):
+    signal_events = signal_service.get_signal_events(
+        ticker_data=ticker_data,
+        trading_system_rule=signal_service.process_trading_system_rules(trading_system_rules)
+    )
+    return {order_type: events.to_mask() for order_type, events in signal_events.items()}
+
+
+def assert_signals_equal(signals, expected):
+    for order_type in (OrderType.BUY, OrderType.SELL):
+        np.testing.assert_array_equal(signals[order_type], expected[order_type], err_msg=order_type.name)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_executed_signals_match_per_rule_evaluation(seed, ticker_data):
+    trading_system_rules = make_trading_system_rules(seed)
+    signal_service = make_signal_service()
+    trading_system_rule = signal_service.process_trading_system_rules(trading_system_rules)
+    indicator_masks = get_indicator_masks(signal_service, ticker_data)
+
+    signals = execute(trading_system_rule, indicator_masks, len(ticker_data))
+
+    assert_signals_equal(signals, evaluate_rules(trading_system_rules, ticker_data))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_signal_events_match_per_rule_evaluation(seed, ticker_data):
+    trading_system_rules = make_trading_system_rules(seed)
+
+    signals = get_signals(make_signal_service(), trading_system_rules, ticker_data)
+
+    assert_signals_equal(signals, evaluate_signal_events(trading_system_rules, ticker_data))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_cached_signals_match_per_rule_evaluation(seed, ticker_data):
+    """
+    Runs trading systems sharing subtrees through the same caches,
+     so later runs load some of their subtrees and compute the others.
+    """
+    signal_cache = SignalCache(max_bytes=2 ** 24)
+    indicator_cache = IndicatorCache(max_bytes=2 ** 24)
+    for trading_system_rules in (make_trading_system_rules(seed), make_trading_system_rules(seed + 1000)) * 2:
+        signals = get_signals(make_signal_service(signal_cache, indicator_cache), trading_system_rules, ticker_data)
+
+        assert_signals_equal(signals, evaluate_signal_events(trading_system_rules, ticker_data))
+    assert signal_cache.stats['hits'] > 0
+
+
+def test_duplicate_comparisons_are_computed_once(ticker_data):
+    """
+    The four rules compare the same two moving averages, swapped or not,
+     so the program loads each average once, shifts each once, and compares them once per timestep.
+    """
+    fast, slow = indicator('MA', 3), indicator('MA', 14)
+    trading_system_rules = TradingSystemRules.parse_obj({
+        'BUY': {'order_type_rule_id': '1', 'group_rules': {
+            '1': {'group_rule_id': '1', 'rules': {'1': make_rule('1', fast, slow, 'CROSSES_ABOVE')}},
+            '2': {'group_rule_id': '2', 'rules': {'2': make_rule('2', slow, fast, 'IS_BELOW')}},
+        }},
+        'SELL': {'order_type_rule_id': '2', 'group_rules': {
+            '3': {'group_rule_id': '3', 'rules': {
+                '3': make_rule('3', slow, fast, 'CROSSES_BELOW'),
+                '4': make_rule('4', fast, slow, 'IS_ABOVE'),
+            }},
+        }},
+    })
+    signal_service = make_signal_service()
+    trading_system_rule = signal_service.process_trading_system_rules(trading_system_rules)
+    indicator_masks = get_indicator_masks(signal_service, ticker_data)
+
+    program = RuleCompiler.compile(trading_system_rule, indicator_masks=indicator_masks)
+
+    opcodes = [instruction.opcode for instruction in program.instructions]
+    assert opcodes.count(RuleOpcode.LOAD_INDICATOR) == 2
+    assert opcodes.count(RuleOpcode.SHIFT) == 2
+    assert opcodes.count(RuleOpcode.COMPARE) == 2
+    assert program.eliminated_operations > 0
+    assert_signals_equal(
+        execute(trading_system_rule, indicator_masks, len(ticker_data)),
+        evaluate_rules(trading_system_rules, ticker_data)
+    )
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_planned_order_does_not_change_the_signals(seed, ticker_data):
+    signal_service = make_signal_service()
+    trading_system_rule = signal_service.process_trading_system_rules(make_trading_system_rules(seed))
+    indicator_masks = get_indicator_masks(signal_service, ticker_data)
+
+    planned, declared = (
+        execute(trading_system_rule, indicator_masks, len(ticker_data), planned=planned)
+        for planned in (True, False)
+    )
+
+    assert_signals_equal(planned, declared)
+
+
+def test_selective_group_rules_are_planned_first(ticker_data):
+    trading_system_rules = TradingSystemRules.parse_obj({
+        'BUY': {'order_type_rule_id': '1', 'group_rules': {
+            '1': {'group_rule_id': '1', 'rules': {'1': make_rule('1', indicator('RSI', 7), value(1), 'IS_ABOVE')}},
+            '2': {'group_rule_id': '2', 'rules': {'2': make_rule('2', indicator('RSI', 7), value(90), 'IS_ABOVE')}},
+        }},
+        'SELL': {'order_type_rule_id': '2', 'group_rules': {
+            '3': {'group_rule_id': '3', 'rules': {'3': make_rule('3', indicator('RSI', 7), value(10), 'IS_BELOW')}},
+        }},
+    })
+    signal_service = make_signal_service()
+    trading_system_rule = signal_service.process_trading_system_rules(trading_system_rules)
+    indicator_masks = get_indicator_masks(signal_service, ticker_data)
+    compiler = RuleCompiler()
+
+    plans = RulePlanner.order(
+        plans=[compiler._plan_group_rule(group_rule) for group_rule in trading_system_rule.buy_rules.group_rules],
+        indicator_masks=indicator_masks
+    )
+
+    assert [plan.group_rule.group_rule_id for plan in plans] == ['2', '1']
+
+
+def test_portfolio_only_change_is_served_from_the_signal_cache(backtesting_request_body, ticker_data):
+    signal_cache = SignalCache(max_bytes=2 ** 24)
+    indicator_cache = IndicatorCache(max_bytes=2 ** 24)
+
+    def backtest(portfolio_management):
+        backtesting_request = BacktestingRequest.parse_obj(
+            {**backtesting_request_body, 'portfolio_management': portfolio_management}
+        )
+        return Backtester(
+            ticker_service=None,
+            signal_service=make_signal_service(signal_cache, indicator_cache),
+            strategy_service=StrategyService(),
+            trade_service=TradeService(),
+            vectorized_trade_engine=VectorizedTradeEngine()
+        ).backtest_ticker_data(ticker_data=ticker_data, backtesting_request=backtesting_request)
+
+    backtest(backtesting_request_body['portfolio_management'])
+    stats = signal_cache.stats
+    indicator_stats = indicator_cache.stats
+    changed_portfolio_management = PortfolioManagement(
+        starting_amount=5000,
+        trade_size={'value': 100, 'type': 'STATIC'},
+        trade_targets={'take_profit': 0.05, 'stop_loss': -0.05}
+    ).dict()
+
+    backtest(changed_portfolio_management)
+
+    assert signal_cache.stats['entries'] == stats['entries']
+    assert signal_cache.stats['hits'] > stats['hits']
+    assert indicator_cache.stats == indicator_stats
@@ -0,0 +1,45 @@
+"""
+Tests of the ticker data shared with the sweep workers.
+"""
+import pickle
+
+import numpy as np
+import pytest
+
+from backtester.domain.ticker.bar_array import BarArray
+from backtester.infrastructure.shared_bar_array import SharedBarArray
+
+
+def test_round_trip(ticker_data):
+    ticker_data.price_data_fingerprint = 'fingerprint'
+    shared_ticker_data = SharedBarArray(ticker_data)
+    try:
+        loaded = SharedBarArray.load(shared_ticker_data.handle)
+    finally:
+        shared_ticker_data.unlink()
+
+    assert len(loaded) == len(ticker_data)
+    assert loaded.dates.timezone == ticker_data.dates.timezone
+    np.testing.assert_array_equal(loaded.dates.values, ticker_data.dates.values)
+    for column in BarArray.COLUMNS:
+        np.testing.assert_array_equal(loaded[column], ticker_data[column])
+        assert not loaded[column].flags.writeable
+    assert loaded.price_data_fingerprint == 'fingerprint'
+
+
+def test_loaded_bars_outlive_the_block(ticker_data):
+    shared_ticker_data = SharedBarArray(ticker_data)
+    loaded = SharedBarArray.load(shared_ticker_data.handle)
+    shared_ticker_data.unlink()
+
+    np.testing.assert_array_equal(loaded['close'], ticker_data['close'])
+    with pytest.raises(FileNotFoundError):
+        SharedBarArray.load(shared_ticker_data.handle)
+
+
+def test_handle_is_small(ticker_data):
+    shared_ticker_data = SharedBarArray(ticker_data)
+    try:
+        assert len(pickle.dumps(shared_ticker_data.handle)) < 200
+    finally:
+        shared_ticker_data.unlink()
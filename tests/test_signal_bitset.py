@@ -0,0 +1,88 @@
+"""
+Tests of packed signal bitsets against boolean masks.
+"""
+import numpy as np
+import pytest
+
+from backtester.domain.signals.signal_bitset import SignalBitset
+
+LENGTHS = [0, 1, 7, 63, 64, 65, 127, 128, 129, 1000]
+
+
+def make_masks(seed, bars):
+    rng = np.random.default_rng(seed)
+    return rng.random(bars) < rng.random(), rng.random(bars) < rng.random()
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('bars', LENGTHS)
+def test_pack_round_trip(seed, bars):
+    mask, _ = make_masks(seed, bars)
+
+    bitset = SignalBitset.from_mask(mask)
+
+    assert len(bitset.words) == -(-bars // 64)
+    np.testing.assert_array_equal(bitset.to_mask(), mask)
+    assert len(bitset) == bars
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('bars', LENGTHS)
+def test_operators_match_numpy(seed, bars):
+    first, second = make_masks(seed, bars)
+    first_bitset, second_bitset = SignalBitset.from_mask(first), SignalBitset.from_mask(second)
+
+    np.testing.assert_array_equal((first_bitset & second_bitset).to_mask(), first & second)
+    np.testing.assert_array_equal((first_bitset | second_bitset).to_mask(), first | second)
+    np.testing.assert_array_equal((~first_bitset).to_mask(), ~first)
+
+
+@pytest.mark.parametrize('bars', LENGTHS)
+def test_invert_keeps_the_last_partial_word_clear(bars):
+    inverted = ~SignalBitset.zeros(bars)
+
+    assert inverted.count() == bars
+    assert inverted == SignalBitset.from_mask(np.ones(bars, dtype=bool))
+    tail_bits = bars % 64
+    if tail_bits:
+        assert int(inverted.words[-1]) >> tail_bits == 0
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('bars', LENGTHS)
+def test_count_positions_and_iteration_match_numpy(seed, bars):
+    mask, _ = make_masks(seed, bars)
+
+    bitset = SignalBitset.from_mask(mask)
+
+    assert bitset.count() == int(mask.sum())
+    np.testing.assert_array_equal(bitset.positions(), np.flatnonzero(mask))
+    assert list(bitset) == np.flatnonzero(mask).tolist()
+
+
+def test_count_of_full_words():
+    bitset = SignalBitset(np.array([np.iinfo(np.uint64).max, 0, 1 << 63], dtype='<u8'), 192)
+
+    assert bitset.count() == 65
+    assert bitset.positions().tolist() == list(range(64)) + [191]
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('bars', [1, 63, 64, 65, 1000])
+def test_take_matches_numpy(seed, bars):
+    mask, _ = make_masks(seed, bars)
+    positions = np.random.default_rng(seed).integers(0, bars, 50)
+
+    taken = SignalBitset.from_mask(mask).take(positions)
+
+    np.testing.assert_array_equal(taken, mask[positions])
+
+
+def test_pack_overwrites_the_bits():
+    rng = np.random.default_rng(0)
+    bitset = SignalBitset.from_mask(rng.random(130) < 0.5)
+    mask = rng.random(130) < 0.5
+
+    bitset.pack(mask)
+
+    np.testing.assert_array_equal(bitset.to_mask(), mask)
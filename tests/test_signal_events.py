@@ -0,0 +1,50 @@
+"""
+Tests of sparse signal events against numpy references.
+"""
+import numpy as np
+import pytest
+
+from backtester.domain.signals.signal_bitset import SignalBitset
+from backtester.domain.signals.signal_events import SignalEvents
+
+
+def make_mask(rng, bars, density):
+    return rng.random(bars) < density
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('bars', [0, 1, 63, 64, 65, 1000])
+def test_difference_matches_numpy(seed, bars):
+    rng = np.random.default_rng(seed)
+    first = make_mask(rng, bars, rng.random())
+    second = make_mask(rng, bars, rng.random())
+
+    difference = SignalEvents.from_mask(first) - SignalEvents.from_mask(second)
+
+    np.testing.assert_array_equal(difference.to_mask(), first & ~second)
+    np.testing.assert_array_equal(difference.positions(), np.flatnonzero(first & ~second))
+    assert difference.positions().dtype == np.int32
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('bars', [0, 1, 63, 64, 65, 1000])
+def test_from_bitset_matches_mask(seed, bars):
+    rng = np.random.default_rng(seed)
+    mask = make_mask(rng, bars, rng.random())
+
+    events = SignalEvents.from_bitset(SignalBitset.from_mask(mask))
+
+    assert events == SignalEvents.from_mask(mask)
+    np.testing.assert_array_equal(events.to_mask(), mask)
+
+
+def test_length_and_iteration_are_over_the_events():
+    mask = np.zeros(100, dtype=bool)
+    mask[[3, 17, 99]] = True
+
+    events = SignalEvents.from_mask(mask)
+
+    assert len(events) == 3
+    assert events.length == 100
+    assert list(events) == [3, 17, 99]
+    assert set().union(events, SignalEvents.from_mask(np.roll(mask, 1))) == {0, 3, 4, 17, 18, 99}
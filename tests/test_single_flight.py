@@ -0,0 +1,121 @@
+"""
+Tests of the coalescing of concurrent identical calls.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backtester.api.requests.ticker_request import TickerRequest
+from backtester.application.single_flight import SingleFlight
+from backtester.application.ticker_service import TickerService
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(single_flight, key, function):
+    """
+    Runs the call from CALLERS threads, letting it finish once every other caller waits for it.
+    """
+    release = threading.Event()
+
+    def call():
+        release.wait()
+        return function()
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(single_flight.run, key, call) for _ in range(CALLERS)]
+        wait_for(lambda: single_flight.stats['coalesced'] == CALLERS - 1)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_identical_calls_run_once_and_share_result():
+    single_flight = SingleFlight()
+    calls = []
+
+    results = run_concurrently(single_flight, 'key', lambda: calls.append(1) or object())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats == {"executions": 1, "coalesced": CALLERS - 1, "in_flight": 0}
+
+
+def test_concurrent_identical_calls_share_error():
+    single_flight = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ConnectionError('connection reset')
+
+    errors = run_concurrently(single_flight, 'key', fail)
+
+    assert len(calls) == 1
+    assert isinstance(errors[0], ConnectionError)
+    assert all(error is errors[0] for error in errors)
+    assert single_flight.stats['in_flight'] == 0
+
+
+def test_calls_are_not_cached_once_finished():
+    single_flight = SingleFlight()
+    calls = []
+
+    single_flight.run('key', lambda: calls.append(1))
+    with pytest.raises(ValueError):
+        single_flight.run('key', lambda: calls.append(1) or int('not a number'))
+    single_flight.run('key', lambda: calls.append(1))
+
+    assert len(calls) == 3
+    assert single_flight.stats == {"executions": 3, "coalesced": 0, "in_flight": 0}
+
+
+def test_calls_of_different_keys_run_concurrently():
+    single_flight = SingleFlight()
+    barrier = threading.Barrier(2, timeout=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(single_flight.run, key, barrier.wait) for key in ('A', 'B')]
+        results = sorted(future.result() for future in futures)
+
+    assert results == [0, 1]
+    assert single_flight.stats['coalesced'] == 0
+
+
+class SlowProvider:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def fetch(self, ticker, interval, start, end):
+        self.calls += 1
+        self.release.wait(5)
+        return SyntheticTickerProvider.fetch(ticker, interval, start, end)
+
+
+def test_ticker_service_coalesces_concurrent_identical_requests():
+    ticker_provider = SlowProvider()
+    single_flight = SingleFlight()
+    ticker_service = TickerService(ticker_provider=ticker_provider, single_flight=single_flight)
+    ticker_request = TickerRequest(
+        ticker='A', interval=TickerInterval.DAILY, start_date='2001-01-01', end_date='2003-01-01'
+    )
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(ticker_service.fetch_ticker_data, ticker_request) for _ in range(CALLERS)]
+        wait_for(lambda: single_flight.stats['coalesced'] == CALLERS - 1)
+        ticker_provider.release.set()
+        results = [future.result() for future in futures]
+
+    assert ticker_provider.calls == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,136 @@
+"""
+Tests of the on-disk ticker cache and of the provider fetching only the ranges it does not cover.
+"""
+import gc
+import os
+
+import pandas as pd
+import pytest
+
+from backtester.api.exceptions.ticker_provider_exceptions import TickerDataNotFound
+from backtester.infrastructure.cached_ticker_provider import CachedTickerProvider
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+from backtester.infrastructure.ticker_cache import CachedSeries, TickerCache
+
+
+class RecordingProvider:
+    """
+    Synthetic provider recording the ranges it is asked for.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, ticker, interval, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return SyntheticTickerProvider.fetch(ticker, interval, start, end)
+
+
+def make_series(price_data, timezone=None):
+    if timezone is not None:
+        price_data = price_data.assign(date=price_data['date'].dt.tz_localize(timezone))
+    dates = price_data['date']
+    return CachedSeries(data=price_data, start=dates.iloc[0], end=dates.iloc[-1] + pd.Timedelta(days=3))
+
+
+@pytest.mark.parametrize('timezone', [None, 'America/New_York'])
+def test_round_trip_keeps_bars_range_and_timezone(tmp_path, make_price_data, timezone):
+    ticker_cache = TickerCache(str(tmp_path))
+    series = make_series(make_price_data(), timezone)
+
+    ticker_cache.write('MSFT', '1d', series)
+    cached_series = ticker_cache.read('MSFT', '1d')
+
+    pd.testing.assert_frame_equal(cached_series.data, series.data)
+    assert cached_series.start == series.start
+    assert cached_series.end == series.end
+    assert cached_series.data['date'].dt.tz == series.data['date'].dt.tz
+
+
+def test_rewrite_replaces_series_without_leftover_files(tmp_path, make_price_data):
+    ticker_cache = TickerCache(str(tmp_path))
+    ticker_cache.write('MSFT', '1d', make_series(make_price_data(seed=0)))
+    series = make_series(make_price_data(seed=1))
+
+    ticker_cache.write('MSFT', '1d', series)
+
+    pd.testing.assert_frame_equal(ticker_cache.read('MSFT', '1d').data, series.data)
+    assert os.listdir(os.path.dirname(ticker_cache.get_path('MSFT', '1d'))) == ['MSFT' + TickerCache.EXTENSION]
+
+
+def test_unsafe_tickers_stay_in_cache_directory(tmp_path, make_price_data):
+    ticker_cache = TickerCache(str(tmp_path))
+    series = make_series(make_price_data())
+
+    for ticker in ('BRK/B', '../ESCAPE', '^GSPC'):
+        ticker_cache.write(ticker, '1d', series)
+        assert os.path.dirname(ticker_cache.get_path(ticker, '1d')) == os.path.join(str(tmp_path), '1d')
+        assert ticker_cache.read(ticker, '1d') is not None
+
+
+def test_missing_and_unreadable_series_are_misses(tmp_path):
+    ticker_cache = TickerCache(str(tmp_path))
+    path = ticker_cache.get_path('MSFT', '1d')
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as file:
+        file.write(b'not a zip file')
+
+    assert ticker_cache.read('AAPL', '1d') is None
+    assert ticker_cache.read('MSFT', '1d') is None
+
+
+def test_provider_fetches_only_missing_head_and_tail(tmp_path):
+    ticker_provider = RecordingProvider()
+    cached_ticker_provider = CachedTickerProvider(ticker_provider, TickerCache(str(tmp_path)))
+
+    cached_ticker_provider.fetch('A', '1d', '2002-01-01', '2003-01-01')
+    cached_ticker_provider.fetch('A', '1d', '2002-03-01', '2002-06-01')
+    cached_ticker_provider.fetch('A', '1d', '2001-01-01', '2004-01-01')
+    df = cached_ticker_provider.fetch('A', '1d', '2001-06-01', '2003-06-01')
+
+    assert ticker_provider.calls == [
+        (pd.Timestamp('2002-01-01'), pd.Timestamp('2003-01-01')),
+        (pd.Timestamp('2001-01-01'), pd.Timestamp('2002-01-01')),
+        (pd.Timestamp('2003-01-01'), pd.Timestamp('2004-01-01')),
+    ]
+    pd.testing.assert_frame_equal(df, SyntheticTickerProvider.fetch('A', '1d', '2001-06-01', '2003-06-01'))
+
+
+def test_provider_serves_cached_series_across_instances(tmp_path):
+    CachedTickerProvider(RecordingProvider(), TickerCache(str(tmp_path))).fetch('A', '1d', '2002-01-01', '2003-01-01')
+    ticker_provider = RecordingProvider()
+
+    df = CachedTickerProvider(ticker_provider, TickerCache(str(tmp_path))).fetch('A', '1d', '2002-02-01', '2002-12-01')
+
+    assert ticker_provider.calls == []
+    pd.testing.assert_frame_equal(df, SyntheticTickerProvider.fetch('A', '1d', '2002-02-01', '2002-12-01'))
+
+
+def test_provider_does_not_cover_days_still_being_formed(tmp_path):
+    ticker_provider = RecordingProvider()
+    cached_ticker_provider = CachedTickerProvider(ticker_provider, TickerCache(str(tmp_path)))
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=30)
+    end = pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+
+    cached_ticker_provider.fetch('A', '1d', start, end)
+    cached_ticker_provider.fetch('A', '1d', start, end)
+
+    assert len(ticker_provider.calls) == 2
+    assert cached_ticker_provider.ticker_cache.read('A', '1d').end == pd.Timestamp.now().normalize()
+
+
+def test_range_without_bars_raises_not_found(tmp_path):
+    cached_ticker_provider = CachedTickerProvider(RecordingProvider(), TickerCache(str(tmp_path)))
+    cached_ticker_provider.fetch('A', '1d', '2002-01-01', '2003-01-01')
+
+    with pytest.raises(TickerDataNotFound):
+        cached_ticker_provider.fetch('A', '1d', '2002-06-01', '2002-06-02')
+
+
+def test_provider_drops_series_locks_once_released(tmp_path):
+    cached_ticker_provider = CachedTickerProvider(RecordingProvider(), TickerCache(str(tmp_path)))
+
+    cached_ticker_provider.fetch('A', '1d', '2002-01-01', '2003-01-01')
+    gc.collect()
+
+    assert len(cached_ticker_provider._locks) == 0
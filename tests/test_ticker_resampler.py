@@ -0,0 +1,98 @@
+"""
+Tests of the resampling of processed bars to coarser intervals against pandas.
+"""
+import numpy as np
+import pytest
+
+from backtester.application.ticker_data_processor import TickerDataProcessor
+from backtester.application.ticker_resampler import TickerResampler
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.domain.ticker.resampled_bars import ResampledBars
+from backtester.domain.ticker.ticker_history import TickerHistory
+
+RULES = {
+    TickerInterval.FIVE_MINUTES: '5min',
+    TickerInterval.HOURLY: '60min',
+    TickerInterval.FIVE_DAYS: '5D',
+    TickerInterval.WEEKLY: 'W-MON',
+    TickerInterval.MONTHLY: 'MS',
+    TickerInterval.QUARTERLY: 'QS',
+}
+DAILY_INTERVALS = [TickerInterval.FIVE_DAYS, TickerInterval.WEEKLY, TickerInterval.MONTHLY, TickerInterval.QUARTERLY]
+MINUTE_INTERVALS = [TickerInterval.FIVE_MINUTES, TickerInterval.HOURLY]
+
+
+def make_base_price_data(make_price_data, interval, timezone=None):
+    if interval in MINUTE_INTERVALS:
+        price_data = make_price_data(bars=3000, start='2020-03-06 09:31', freq='min')
+        # Trading hours only, with gaps between sessions
+        price_data = price_data[price_data['date'].dt.hour.between(9, 15)].reset_index(drop=True)
+    else:
+        price_data = make_price_data(bars=800)
+    if timezone is not None:
+        price_data = price_data.assign(date=price_data['date'].dt.tz_localize(timezone))
+    return price_data
+
+
+def resample_with_pandas(price_data, interval):
+    """
+    Resamples price data on the local time of its dates, each period dated by its first bar.
+    """
+    local_dates = price_data['date'].dt.tz_localize(None) if price_data['date'].dt.tz is not None \
+        else price_data['date']
+    resampler = price_data.assign(first_date=price_data['date'], date=local_dates).resample(
+        RULES[interval], on='date', closed='left', label='left', origin='epoch'
+    )
+    resampled = resampler.agg({'first_date': 'first', 'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'})
+    resampled = resampled.dropna().rename(columns={'first_date': 'date'})
+    return resampled.reset_index(drop=True)
+
+
+def assert_bars_equal(bars, expected_bars):
+    np.testing.assert_array_equal(bars.dates.values, expected_bars.dates.values)
+    assert bars.dates.timezone == expected_bars.dates.timezone
+    for column in expected_bars.COLUMNS:
+        np.testing.assert_allclose(bars[column], expected_bars[column], rtol=1e-12, err_msg=column)
+
+
+@pytest.mark.parametrize('interval', DAILY_INTERVALS + MINUTE_INTERVALS)
+@pytest.mark.parametrize('timezone', [None, 'America/New_York'])
+def test_resampled_bars_match_pandas(make_price_data, interval, timezone):
+    price_data = make_base_price_data(make_price_data, interval, timezone)
+
+    bars, starts = TickerResampler.resample(TickerDataProcessor.to_bar_array(price_data), interval)
+
+    assert_bars_equal(bars, TickerDataProcessor.to_bar_array(resample_with_pandas(price_data, interval)))
+    assert starts[0] == 0 and starts[-1] == len(price_data)
+    assert len(starts) == len(bars) + 1
+
+
+def test_unsorted_bars_are_sorted_before_resampling(make_price_data):
+    price_data = make_price_data(bars=300)
+    shuffled_data = price_data.sample(frac=1, random_state=0).reset_index(drop=True)
+
+    bars, _ = TickerResampler.resample(TickerDataProcessor.to_bar_array(shuffled_data), TickerInterval.WEEKLY)
+
+    expected_bars, _ = TickerResampler.resample(TickerDataProcessor.to_bar_array(price_data), TickerInterval.WEEKLY)
+    assert_bars_equal(bars, expected_bars)
+
+
+@pytest.mark.parametrize('interval', [TickerInterval.WEEKLY, TickerInterval.MONTHLY])
+def test_slice_bars_matches_resampling_the_range(make_price_data, interval):
+    price_data = make_price_data(bars=400)
+    bars = TickerDataProcessor.to_bar_array(price_data)
+    history = TickerHistory.from_bars(bars, price_data['date'].iloc[0], price_data['date'].iloc[-1])
+    resampled_bars = ResampledBars(*TickerResampler.resample(bars, interval), history)
+    starts = resampled_bars.starts
+    edges = sorted({
+        0, 1, int(starts[3]), int(starts[3]) - 1, int(starts[3]) + 1, int(starts[7]), int(starts[7]) + 2,
+        len(bars) - 1, len(bars)
+    })
+
+    for first in edges:
+        for last in edges:
+            if first >= last:
+                continue
+            sliced_bars = TickerResampler.slice_bars(resampled_bars, bars, first, last)
+            expected_bars, _ = TickerResampler.resample(TickerDataProcessor.slice_bars(bars, first, last), interval)
+            assert_bars_equal(sliced_bars, expected_bars)
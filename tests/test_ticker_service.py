@@ -0,0 +1,176 @@
+"""
+Tests of the processed bars the TickerService serves from its caches, and of their incremental refresh.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.api.requests.ticker_request import TickerRequest
+from backtester.application.indicator_cache import IndicatorCache
+from backtester.application.indicator_service import IndicatorService
+from backtester.application.indicator_validator_service import IndicatorValidatorService
+from backtester.application.signal_service import SignalService
+from backtester.application.ticker_data_cache import TickerDataCache
+from backtester.application.ticker_data_processor import TickerDataProcessor
+from backtester.application.ticker_history_cache import TickerHistoryCache
+from backtester.application.ticker_service import TickerService
+from backtester.domain.enums.ticker_interval import TickerInterval
+from backtester.domain.indicators.indicator import Indicator
+from backtester.domain.signals.indicator_registry import IndicatorRegistry
+from backtester.infrastructure.synthetic_ticker_provider import SyntheticTickerProvider
+
+START, END = '2001-01-01', '2003-01-01'
+
+
+class RevisingProvider:
+    """
+    Synthetic provider whose bars can be revised, removed or moved to a timezone, recording the ranges it is asked for.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.revisions = {}
+        self.removed = set()
+        self.timezone = None
+
+    def fetch(self, ticker, interval, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        df = SyntheticTickerProvider.fetch(ticker, interval, start, end)
+        df = df[~df['date'].isin(self.removed)].reset_index(drop=True)
+        for date, factor in self.revisions.items():
+            df.loc[df['date'] == date, ['open', 'high', 'low', 'close']] *= factor
+        if self.timezone is not None:
+            df['date'] = df['date'].dt.tz_localize(self.timezone)
+        return df
+
+
+def make_ticker_service(ticker_provider=None, **kwargs):
+    return TickerService(ticker_provider=ticker_provider or SyntheticTickerProvider(), **kwargs)
+
+
+def make_signal_service():
+    return SignalService(
+        indicator_service=IndicatorService(
+            indicator_validator_service=IndicatorValidatorService(),
+            registry=Indicator.registry,
+            indicator_cache=IndicatorCache(max_bytes=2 ** 24)
+        ),
+        indicator_registry=IndicatorRegistry()
+    )
+
+
+@pytest.mark.parametrize('interval', [TickerInterval.DAILY, TickerInterval.WEEKLY])
+@pytest.mark.parametrize('history', [False, True])
+def test_served_bars_carry_their_fingerprint(interval, history):
+    ticker_service = make_ticker_service(
+        ticker_data_cache=TickerDataCache(max_bytes=2 ** 24),
+        ticker_history_cache=TickerHistoryCache(max_bytes=2 ** 24) if history else None
+    )
+    ticker_request = TickerRequest(ticker='A', interval=interval, start_date=START, end_date=END)
+
+    ticker_data = ticker_service.fetch_ticker_data(ticker_request)
+
+    assert ticker_data.price_data_fingerprint == IndicatorCache.fingerprint(ticker_data.price_data)
+    assert ticker_service.fetch_ticker_data(ticker_request) is ticker_data
+
+
+def test_signal_service_does_not_write_fingerprint_onto_bars(ticker_data):
+    assert ticker_data.price_data_fingerprint is None
+
+    fingerprint = make_signal_service().get_price_data_fingerprint(ticker_data)
+
+    assert fingerprint == IndicatorCache.fingerprint(ticker_data.price_data)
+    assert ticker_data.price_data_fingerprint is None
+
+
+def test_signal_service_reads_fingerprint_of_served_bars():
+    ticker_data = make_ticker_service().fetch_ticker_data(
+        TickerRequest(ticker='A', interval=TickerInterval.DAILY, start_date=START, end_date=END)
+    )
+    ticker_data.price_data_fingerprint = 'served'
+
+    assert make_signal_service().get_price_data_fingerprint(ticker_data) == 'served'
+
+
+def fetch_bars(ticker_service, start, end):
+    return ticker_service.fetch_ticker_data(
+        TickerRequest(ticker='A', interval=TickerInterval.DAILY, start_date=start, end_date=end)
+    )
+
+
+def assert_bars_equal(bars, expected_bars):
+    np.testing.assert_array_equal(bars.dates.values, expected_bars.dates.values)
+    assert bars.dates.timezone == expected_bars.dates.timezone
+    for column in expected_bars.COLUMNS:
+        np.testing.assert_allclose(bars[column], expected_bars[column], rtol=1e-12, err_msg=column)
+
+
+def make_history_service(ticker_provider):
+    return make_ticker_service(
+        ticker_provider,
+        ticker_history_cache=TickerHistoryCache(max_bytes=2 ** 24),
+        revision_bars=5
+    )
+
+
+def test_refresh_fetches_only_tail_and_matches_full_fetch():
+    ticker_provider = RevisingProvider()
+    ticker_service = make_history_service(ticker_provider)
+    fetch_bars(ticker_service, '2001-01-01', '2002-01-01')
+
+    bars = fetch_bars(ticker_service, '2001-01-01', '2002-06-01')
+
+    last_bars = SyntheticTickerProvider.fetch('A', '1d', '2001-01-01', '2002-01-01')['date'].iloc[-5:]
+    assert ticker_provider.calls[-1] == (last_bars.iloc[0], pd.Timestamp('2002-06-01'))
+    assert_bars_equal(bars, fetch_bars(make_ticker_service(), '2001-01-01', '2002-06-01'))
+
+
+@pytest.mark.parametrize('revise', ['prices', 'removal'])
+def test_revision_in_overlap_matches_full_refetch(revise):
+    ticker_provider = RevisingProvider()
+    ticker_service = make_history_service(ticker_provider)
+    history_bars = fetch_bars(ticker_service, '2001-01-01', '2002-01-01')
+    last_dates = SyntheticTickerProvider.fetch('A', '1d', '2001-01-01', '2002-01-01')['date'].iloc[-5:]
+    revised_date = last_dates.iloc[-3]
+    if revise == 'prices':
+        ticker_provider.revisions[revised_date] = 1.01
+    else:
+        ticker_provider.removed.add(revised_date)
+
+    bars = fetch_bars(ticker_service, '2001-01-01', '2002-06-01')
+
+    assert ticker_provider.calls[-1] == (last_dates.iloc[0], pd.Timestamp('2002-06-01'))
+    expected_bars = fetch_bars(make_ticker_service(ticker_provider), '2001-01-01', '2002-06-01')
+    assert_bars_equal(bars, expected_bars)
+    unrevised = len(history_bars) - 3
+    np.testing.assert_array_equal(bars['close'][:unrevised], history_bars['close'][:unrevised])
+
+
+def test_refresh_in_other_timezone_refetches_whole_range():
+    ticker_provider = RevisingProvider()
+    ticker_service = make_history_service(ticker_provider)
+    fetch_bars(ticker_service, '2001-01-01', '2002-01-01')
+    ticker_provider.timezone = 'America/New_York'
+
+    bars = fetch_bars(ticker_service, '2001-01-01', '2002-06-01')
+
+    assert ticker_provider.calls[-1] == (pd.Timestamp('2001-01-01'), pd.Timestamp('2002-06-01'))
+    assert bars.dates.timezone == 'America/New_York'
+    assert_bars_equal(bars, fetch_bars(make_ticker_service(ticker_provider), '2001-01-01', '2002-06-01'))
+
+
+def test_revised_index_is_first_changed_bar(ticker_data):
+    first = len(ticker_data) - 5
+    fetched_df = pd.DataFrame({
+        'date': pd.DatetimeIndex(ticker_data.dates.values[first:]),
+        **{column: ticker_data[column][first:] for column in ticker_data.PRICE_COLUMNS}
+    })
+
+    revised_df = fetched_df.copy()
+    revised_df.loc[2, 'high'] += 1.0
+
+    unchanged_bars = TickerDataProcessor.to_bar_array(fetched_df)
+    revised_bars = TickerDataProcessor.to_bar_array(revised_df)
+
+    assert TickerDataProcessor.get_revised_index(ticker_data, first, unchanged_bars) == len(ticker_data)
+    assert TickerDataProcessor.get_revised_index(ticker_data, first, revised_bars) == first + 2